@@ -1,12 +1,15 @@
 from fastapi import Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from backend.modules.auth.jwt import decode_token
+from backend.modules.auth.token_cache import verify_token
 
 _bearer = HTTPBearer()
 
 
-def require_user(
+async def require_user(
     credentials: HTTPAuthorizationCredentials = Security(_bearer),
 ) -> dict:
-    return decode_token(credentials.credentials)
+    # Token decoding is CPU-only and short; running it on the event loop keeps
+    # async routes from borrowing a threadpool slot just for authentication.
+    # Repeat requests with the same token skip decoding (see token_cache).
+    return verify_token(credentials.credentials)
@@ -1,8 +1,11 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends
 
 from backend.api.auth.deps import require_user
 from backend.api.auth.schemas import (
     AuthResponse,
+    AvailabilityResponse,
     ChangePasswordRequest,
     ChangeUsernameRequest,
     LoginRequest,
@@ -10,6 +13,7 @@ from backend.api.auth.schemas import (
     SignupRequest,
     UserOut,
 )
+from backend.modules.auth import check
 from backend.modules.auth.change import change_password, change_username
 from backend.modules.auth.jwt import create_token
 from backend.modules.auth.login import login as login_user
@@ -25,6 +29,15 @@ def signup(payload: SignupRequest) -> AuthResponse:
     return AuthResponse(token=token, user=UserOut(**user))
 
 
+@router.get("/availability", response_model=AvailabilityResponse)
+def availability(email: Optional[str] = None, username: Optional[str] = None) -> AvailabilityResponse:
+    """Live signup-form validation; only the values given are probed."""
+    return AvailabilityResponse(
+        email_taken=check.is_email_taken(email) if email else None,
+        username_taken=check.is_username_taken(username) if username else None,
+    )
+
+
 @router.post("/login", response_model=AuthResponse)
 def login(payload: LoginRequest) -> AuthResponse:
     user = login_user(payload.email, payload.password)
@@ -54,7 +67,7 @@ def change_username_route(
 
 
 @router.get("/me", response_model=UserOut)
-def get_current_user(user: dict = Depends(require_user)) -> UserOut:
+async def get_current_user(user: dict = Depends(require_user)) -> UserOut:
     """Get current user information from JWT token."""
     return UserOut(
         id=None,  # JWT doesn't contain user ID
@@ -37,3 +37,8 @@ class AuthResponse(BaseModel):
 
 class OkResponse(BaseModel):
     ok: bool
+
+
+class AvailabilityResponse(BaseModel):
+    email_taken: Optional[bool] = None
+    username_taken: Optional[bool] = None
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends
 from backend.api.auth.deps import require_user
 from backend.api.conversation.schemas import CommentItem, CommentListResponse
 from backend.errors import BusinessError
-from backend.modules.conversation.manager import list_comments
+from backend.modules.conversation.manager import list_comments_async
 
 router = APIRouter(prefix="/api/conversation", tags=["conversation"])
 
@@ -21,10 +21,10 @@ def _format_created_at(value: object) -> str:
 
 
 @router.get("/{work_id}", response_model=CommentListResponse)
-def list_comments_route(
+async def list_comments_route(
     work_id: str, user: dict = Depends(require_user)
 ) -> CommentListResponse:
-    comments = list_comments(work_id, user["email"]) or []
+    comments = await list_comments_async(work_id, user["email"]) or []
     items = [
         CommentItem(
             id=comment.get("id", ""),
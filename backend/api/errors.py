@@ -9,4 +9,5 @@ async def business_error_handler(
 ) -> JSONResponse:
     status_code = business_error_to_status(exc.code)
     payload = {"code": exc.code, "message": exc.message}
-    return JSONResponse(status_code=status_code, content=payload)
+    headers = {"Retry-After": "1"} if status_code == 429 else None
+    return JSONResponse(status_code=status_code, content=payload, headers=headers)
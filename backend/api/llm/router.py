@@ -1,10 +1,14 @@
+from typing import Iterator
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from backend.api.auth.deps import require_user
+from backend.api.sse import Event, event_stream
 from backend.api.llm.schemas import CommentRequest, CommentResponse
 from backend.errors import BusinessError
 from backend.modules.conversation.manager import add_comment
-from backend.modules.llm_gateway.client import generate_comment
+from backend.modules.llm_gateway.client import generate_comment, stream_comment
 
 router = APIRouter(prefix="/api/llm", tags=["llm"])
 
@@ -18,3 +22,25 @@ def create_comment_route(
     comment = generate_comment(payload.text_snapshot)
     add_comment(payload.work_id, user["email"], comment)
     return CommentResponse(comment=comment)
+
+
+@router.post("/comment/stream")
+def stream_comment_route(
+    payload: CommentRequest, user: dict = Depends(require_user)
+) -> StreamingResponse:
+    """Stream the comment as delta events, then done once it is saved."""
+    if not payload.text_snapshot.strip():
+        raise BusinessError("validation_failed", "text_snapshot required")
+
+    def events() -> Iterator[Event]:
+        parts = []
+        for delta in stream_comment(payload.text_snapshot):
+            parts.append(delta)
+            yield "delta", {"text": delta}
+        comment = "".join(parts)
+        if not comment:
+            raise BusinessError("llm_failed", "invalid llm response")
+        add_comment(payload.work_id, user["email"], comment)
+        yield "done", {"comment": comment}
+
+    return event_stream(events())
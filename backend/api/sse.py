@@ -0,0 +1,51 @@
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, Tuple, Union
+
+from fastapi.responses import StreamingResponse
+
+from backend.errors import BusinessError
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+def format_event(event: str, data: Dict[str, Any]) -> str:
+    """Serialize one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _encode(events: Iterable[Event]) -> Iterator[str]:
+    try:
+        for event, data in events:
+            yield format_event(event, data)
+    except BusinessError as exc:
+        # Headers are already sent; report failures in-band.
+        yield format_event("error", {"code": exc.code, "message": exc.message})
+    except Exception as exc:
+        print(f"[SSE ERROR] {type(exc).__name__}: {exc}")
+        yield format_event("error", {"code": "internal_error", "message": "stream failed"})
+
+
+async def _encode_async(events: AsyncIterable[Event]) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            yield format_event(event, data)
+    except BusinessError as exc:
+        yield format_event("error", {"code": exc.code, "message": exc.message})
+    except Exception as exc:
+        print(f"[SSE ERROR] {type(exc).__name__}: {exc}")
+        yield format_event("error", {"code": "internal_error", "message": "stream failed"})
+
+
+def event_stream(events: Union[Iterable[Event], AsyncIterable[Event]]) -> StreamingResponse:
+    """
+    Wrap (event, data) pairs in a text/event-stream response.
+
+    Sync iterables run on the threadpool; async ones stay on the event loop,
+    which suits long-lived streams that mostly wait.
+    """
+    body = _encode_async(events) if hasattr(events, "__aiter__") else _encode(events)
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,10 +1,18 @@
+import asyncio
 from datetime import datetime
+from itertools import chain
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from backend.api.auth.deps import require_user
+from backend.api.sse import event_stream
 from backend.api.work.schemas import (
+    AnalysisStatusResponse,
+    LockHeartbeatRequest,
+    LockHeartbeatResponse,
     OkResponse,
+    ReleaseWorkRequest,
     RenameWorkRequest,
     RenameWorkResponse,
     RevertRequest,
@@ -18,21 +26,34 @@ from backend.api.work.schemas import (
     WorkGetResponse,
     WorkListItem,
     WorkListResponse,
+    WorkPatchRequest,
+    WorkPatchResponse,
+    WorkStatsResponse,
     WorkSubmitRequest,
     WorkSubmitResponse,
     WorkUpdateRequest,
     WorkUpdateResponse,
 )
+from backend.config import WORK_LOCK_EXPIRE_SECONDS
 from backend.errors import BusinessError
-from backend.modules.work import version_manager
+from backend.modules.work import autosave, version_manager
 from backend.modules.work.manager import (
-    create_work,
-    delete_work,
-    get_work,
-    list_works,
-    submit_work,
-    update_work,
+    create_work_async,
+    delete_work_async,
+    get_analysis_status,
+    get_work_async,
+    heartbeat_work,
+    list_works_page_async,
+    patch_work_async,
+    release_work,
+    revert_work_async,
+    submit_work_async,
+    submit_work_stream_async,
+    update_work_async,
+    verify_work_owner_async,
+    watch_work_lock_async,
 )
+from backend.storage.async_db import execute_query_async
 from backend.storage.text_analysis import repo as analysis_repo
 from backend.storage.work_retrieve import repo as work_retrieve_repo
 
@@ -50,14 +71,18 @@ def _format_updated_at(value: object) -> str:
 
 
 @router.post("/create", response_model=WorkCreateResponse)
-def create_work_route(user: dict = Depends(require_user)) -> WorkCreateResponse:
-    work_id = create_work(user["email"])
+async def create_work_route(user: dict = Depends(require_user)) -> WorkCreateResponse:
+    work_id = await create_work_async(user["email"])
     return WorkCreateResponse(work_id=work_id or "")
 
 
 @router.get("/list", response_model=WorkListResponse)
-def list_works_route(user: dict = Depends(require_user)) -> WorkListResponse:
-    works = list_works(user["email"]) or []
+async def list_works_route(
+    user: dict = Depends(require_user),
+    cursor: str = None,
+    limit: int = None,
+) -> WorkListResponse:
+    works, next_cursor = await list_works_page_async(user["email"], cursor, limit)
     items = [
         WorkListItem(
             work_id=work.get("id", ""),
@@ -68,36 +93,46 @@ def list_works_route(user: dict = Depends(require_user)) -> WorkListResponse:
         )
         for work in works
     ]
-    return WorkListResponse(items=items)
+    return WorkListResponse(items=items, next_cursor=next_cursor)
+
+
+@router.get("/stats", response_model=WorkStatsResponse)
+async def get_work_stats_route(user: dict = Depends(require_user)) -> WorkStatsResponse:
+    """Get the user's total word count and project count in one read."""
+    query = work_retrieve_repo.get_user_stats(user["email"])
+    stats = await execute_query_async(query) or {}
+
+    return WorkStatsResponse(
+        total_word_count=stats.get("total_word_count") or 0,
+        total_project_count=stats.get("project_count") or 0,
+    )
 
 
 @router.get("/total_word_count", response_model=TotalWordCountResponse)
-def get_total_word_count_route(user: dict = Depends(require_user)) -> TotalWordCountResponse:
+async def get_total_word_count_route(user: dict = Depends(require_user)) -> TotalWordCountResponse:
     """Get total word count across all user's works."""
-    from backend.storage.db import execute_query
-
     query = work_retrieve_repo.get_total_word_count(user["email"])
-    result = execute_query(query)
-    total = result.get("total_word_count", 0) if result else 0
+    total = await execute_query_async(query) or 0
 
     return TotalWordCountResponse(total_word_count=total)
 
 
 @router.get("/total_project_count", response_model=TotalProjectCountResponse)
-def get_total_project_count_route(user: dict = Depends(require_user)) -> TotalProjectCountResponse:
+async def get_total_project_count_route(user: dict = Depends(require_user)) -> TotalProjectCountResponse:
     """Get total number of projects (works) for the user."""
-    from backend.storage.db import execute_query
-
     query = work_retrieve_repo.get_total_project_count(user["email"])
-    result = execute_query(query)
-    total = result.get("total_project_count", 0) if result else 0
+    total = await execute_query_async(query) or 0
 
     return TotalProjectCountResponse(total_project_count=total)
 
 
 @router.get("/{work_id}", response_model=WorkGetResponse)
-def get_work_route(work_id: str, user: dict = Depends(require_user)) -> WorkGetResponse:
-    work = get_work(work_id, user["email"])
+async def get_work_route(work_id: str, user: dict = Depends(require_user)) -> WorkGetResponse:
+    # Show auto-saved content the flusher has not written yet; the buffer is
+    # sync (Redis by default), so read it off the event loop
+    work = await asyncio.to_thread(
+        autosave.apply_pending, await get_work_async(work_id, user["email"])
+    )
 
     # Parse rubric from JSON string if present
     rubric = None
@@ -122,20 +157,65 @@ def get_work_route(work_id: str, user: dict = Depends(require_user)) -> WorkGetR
 
 
 @router.post("/{work_id}/update", response_model=WorkUpdateResponse)
-def update_work_route(
+async def update_work_route(
     work_id: str, payload: WorkUpdateRequest, user: dict = Depends(require_user)
 ) -> WorkUpdateResponse:
-    result = update_work(
+    result = await update_work_async(
         work_id, user["email"], payload.content, payload.device_id, payload.auto_save, payload.essay_prompt
     )
     return WorkUpdateResponse(ok=result["ok"], version=result.get("version"))
 
 
+@router.post("/{work_id}/patch", response_model=WorkPatchResponse)
+async def patch_work_route(
+    work_id: str, payload: WorkPatchRequest, user: dict = Depends(require_user)
+) -> WorkPatchResponse:
+    """Auto-save by range replacements; 409 conflict means resend the full content."""
+    result = await patch_work_async(
+        work_id,
+        user["email"],
+        payload.device_id,
+        payload.base_hash,
+        [{"start": op.start, "end": op.end, "text": op.text} for op in payload.ops],
+        payload.essay_prompt,
+    )
+    return WorkPatchResponse(**result)
+
+
+@router.post("/{work_id}/release", response_model=OkResponse)
+def release_work_route(
+    work_id: str, payload: ReleaseWorkRequest, user: dict = Depends(require_user)
+) -> OkResponse:
+    """Persist buffered auto-saves and release the editing lock."""
+    release_work(work_id, user["email"], payload.device_id)
+    return OkResponse(ok=True)
+
+
+@router.post("/{work_id}/heartbeat", response_model=LockHeartbeatResponse)
+def heartbeat_work_route(
+    work_id: str, payload: LockHeartbeatRequest, user: dict = Depends(require_user)
+) -> LockHeartbeatResponse:
+    """Acquire or renew the editing lock without saving anything."""
+    held = heartbeat_work(work_id, user["email"], payload.device_id)
+    return LockHeartbeatResponse(held=held, expires_in=WORK_LOCK_EXPIRE_SECONDS if held else 0)
+
+
+@router.get("/{work_id}/lock/events")
+async def watch_work_lock_route(work_id: str, user: dict = Depends(require_user)) -> StreamingResponse:
+    """
+    Stream lock-holder changes as server-sent events.
+
+    Events: lock ({"holder": device_id or null}); the first is the current
+    holder. The stream closes after a few minutes; clients reconnect.
+    """
+    return event_stream(await watch_work_lock_async(work_id, user["email"]))
+
+
 @router.post("/{work_id}/submit", response_model=WorkSubmitResponse)
-def submit_work_route(
+async def submit_work_route(
     work_id: str, payload: WorkSubmitRequest, user: dict = Depends(require_user)
 ) -> WorkSubmitResponse:
-    result = submit_work(
+    result = await submit_work_async(
         work_id,
         user["email"],
         payload.content,
@@ -147,54 +227,79 @@ def submit_work_route(
         ok=result["ok"],
         version=result["version"],
         analysis_id=result.get("analysis_id"),
+        analysis_status=result["analysis_status"],
     )
 
 
+@router.post("/{work_id}/submit/stream")
+async def submit_work_stream_route(
+    work_id: str, payload: WorkSubmitRequest, user: dict = Depends(require_user)
+) -> StreamingResponse:
+    """
+    Submit and stream the analysis as server-sent events.
+
+    Events: submitted, fao_delta, sentence_comment, then done or error.
+    """
+    result, events = await submit_work_stream_async(
+        work_id,
+        user["email"],
+        payload.content,
+        payload.device_id,
+        payload.fao_reflection,
+        payload.suggestion_actions,
+    )
+    return event_stream(chain([("submitted", {"version": result["version"]})], events))
+
+
 @router.post("/{work_id}/rename", response_model=RenameWorkResponse)
-def rename_work_route(
+async def rename_work_route(
     work_id: str, payload: RenameWorkRequest, user: dict = Depends(require_user)
 ) -> RenameWorkResponse:
     """Rename a work."""
-    from backend.storage.db import execute_query
     from backend.storage.work import repo as work_repo
 
     # Verify ownership
-    _ = get_work(work_id, user["email"])
+    await verify_work_owner_async(work_id, user["email"])
 
     # Update title
     query = work_repo.update_title(work_id, user["email"], payload.title)
-    execute_query(query)
+    await execute_query_async(query)
 
     return RenameWorkResponse(ok=True)
 
 
 @router.delete("/{work_id}", response_model=OkResponse)
-def delete_work_route(work_id: str, user: dict = Depends(require_user)) -> OkResponse:
-    delete_work(work_id, user["email"])
+async def delete_work_route(work_id: str, user: dict = Depends(require_user)) -> OkResponse:
+    await delete_work_async(work_id, user["email"])
     return OkResponse(ok=True)
 
 
 @router.get("/{work_id}/versions", response_model=VersionListResponse)
-def get_versions_route(
+async def get_versions_route(
     work_id: str,
     user: dict = Depends(require_user),
     type: str = "all",
     parent: int = None,
+    cursor: str = None,
+    limit: int = None,
 ) -> VersionListResponse:
     # Verify ownership
-    _ = get_work(work_id, user["email"])
+    await verify_work_owner_async(work_id, user["email"])
 
     # Get current version
-    current_version = version_manager.get_current_version_number(work_id)
+    current_version = await version_manager.get_current_version_number_async(work_id)
 
-    # Get version list
+    # Get one page of the version list
     version_type = None if type == "all" else type
-    versions = version_manager.get_version_list(work_id, version_type, parent)
+    versions, next_cursor = await version_manager.get_version_page_async(
+        work_id, version_type, parent, cursor, limit
+    )
 
     items = [
         VersionListItem(
             version_number=v.get("version_number", 0),
-            content_preview=v.get("content_preview", ""),
+            content_preview=v.get("content_preview") or "",
+            word_count=v.get("word_count"),
             is_submitted=v.get("is_submitted", False),
             change_type=v.get("change_type", ""),
             created_at=_format_updated_at(v.get("created_at")),
@@ -202,26 +307,26 @@ def get_versions_route(
         for v in versions
     ]
 
-    return VersionListResponse(current_version=current_version, versions=items)
+    return VersionListResponse(
+        current_version=current_version, versions=items, next_cursor=next_cursor
+    )
 
 
 @router.get("/{work_id}/versions/{version_number}", response_model=VersionDetailResponse)
-def get_version_detail_route(
+async def get_version_detail_route(
     work_id: str, version_number: int, user: dict = Depends(require_user)
 ) -> VersionDetailResponse:
     # Verify ownership
-    _ = get_work(work_id, user["email"])
+    await verify_work_owner_async(work_id, user["email"])
 
     # Get version detail
-    version = version_manager.get_version_detail(work_id, version_number)
+    version = await version_manager.get_version_detail_async(work_id, version_number)
 
     # Get analysis if submitted
     analysis = None
     if version.get("is_submitted"):
-        from backend.storage.db import execute_query
-
         analysis_query = analysis_repo.get_analysis_by_version(work_id, version_number)
-        analysis_result = execute_query(analysis_query)
+        analysis_result = await execute_query_async(analysis_query)
         if analysis_result:
             analysis = {
                 "analysis_id": analysis_result.get("id"),
@@ -242,14 +347,22 @@ def get_version_detail_route(
     )
 
 
+@router.get(
+    "/{work_id}/versions/{version_number}/analysis_status",
+    response_model=AnalysisStatusResponse,
+)
+def get_analysis_status_route(
+    work_id: str, version_number: int, user: dict = Depends(require_user)
+) -> AnalysisStatusResponse:
+    status = get_analysis_status(work_id, user["email"], version_number)
+    return AnalysisStatusResponse(**status)
+
+
 @router.post("/{work_id}/revert", response_model=RevertResponse)
-def revert_work_route(
+async def revert_work_route(
     work_id: str, payload: RevertRequest, user: dict = Depends(require_user)
 ) -> RevertResponse:
-    # Verify ownership
-    _ = get_work(work_id, user["email"])
-
-    new_version = version_manager.revert_to_version(
+    new_version = await revert_work_async(
         work_id, user["email"], payload.target_version, payload.device_id
     )
 
@@ -34,6 +34,9 @@ class WorkListResponse(BaseModel):
     """Response containing list of user's works."""
 
     items: List[WorkListItem] = Field(..., description="List of works")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page; null on the last page"
+    )
 
 
 class WorkGetResponse(BaseModel):
@@ -68,6 +71,35 @@ class WorkUpdateRequest(BaseModel):
     essay_prompt: Optional[str] = Field(None, description="Essay prompt/requirements (optional)")
 
 
+class TextPatchOp(BaseModel):
+    """Replace content[start:end] (Unicode code points) with text."""
+
+    start: int = Field(..., ge=0, description="Start offset of the replaced range")
+    end: int = Field(..., ge=0, description="End offset (exclusive) of the replaced range")
+    text: str = Field("", description="Replacement text")
+
+
+class WorkPatchRequest(BaseModel):
+    """Request to auto-save by patching the latest content."""
+
+    device_id: str = Field(..., description="Device ID for session locking")
+    base_hash: str = Field(
+        ..., description="SHA-256 hex of the content the operations were made against"
+    )
+    ops: List[TextPatchOp] = Field(
+        ..., description="Operations applied in order, each against the previous result"
+    )
+    essay_prompt: Optional[str] = Field(None, description="Essay prompt/requirements (optional)")
+
+
+class WorkPatchResponse(BaseModel):
+    """Response after patching work content."""
+
+    ok: bool = Field(..., description="Success indicator")
+    content_hash: str = Field(..., description="SHA-256 hex of the patched content")
+    word_count: int = Field(..., description="Word count of the patched content")
+
+
 class WorkUpdateResponse(BaseModel):
     """Response after updating work."""
 
@@ -106,10 +138,30 @@ class WorkSubmitResponse(BaseModel):
     ok: bool = Field(..., description="Success indicator")
     version: int = Field(..., description="Version number of submitted version")
     analysis_id: Optional[str] = Field(
-        None, description="Unique identifier for the AI analysis result"
+        None,
+        description="Unique identifier for the AI analysis result "
+        "(null while the analysis is still queued or running)",
+    )
+    analysis_status: str = Field(
+        "queued",
+        description="Analysis job state: 'queued', 'running', 'done' or 'failed'. "
+        "Poll /versions/{version}/analysis_status until done.",
     )
 
 
+class AnalysisStatusResponse(BaseModel):
+    """Progress of the AI analysis for a submitted version."""
+
+    status: str = Field(
+        ..., description="Analysis job state: 'queued', 'running', 'done' or 'failed'"
+    )
+    analysis_id: Optional[str] = Field(
+        None, description="Analysis identifier once status is 'done'"
+    )
+    attempts: int = Field(0, description="Number of generation attempts so far")
+    error: Optional[str] = Field(None, description="Last error message, if any")
+
+
 # ============================================================================
 # Version Management Schemas
 # ============================================================================
@@ -122,6 +174,9 @@ class VersionListItem(BaseModel):
     content_preview: str = Field(
         ..., description="First 100 characters of content"
     )
+    word_count: Optional[int] = Field(
+        None, description="Word count of this version's content"
+    )
     is_submitted: bool = Field(
         ..., description="True if submitted version, false if draft"
     )
@@ -137,6 +192,9 @@ class VersionListResponse(BaseModel):
 
     current_version: int = Field(..., description="Current version number of the work")
     versions: List[VersionListItem] = Field(..., description="List of versions")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page; null on the last page"
+    )
 
 
 class VersionDetailResponse(BaseModel):
@@ -168,6 +226,25 @@ class RevertRequest(BaseModel):
     device_id: str = Field(..., description="Device ID for session locking")
 
 
+class ReleaseWorkRequest(BaseModel):
+    """Request to release a work when the editor closes."""
+
+    device_id: str = Field(..., description="Device ID holding the session lock")
+
+
+class LockHeartbeatRequest(BaseModel):
+    """Request to acquire or renew the editing lock."""
+
+    device_id: str = Field(..., description="Device ID of the editor")
+
+
+class LockHeartbeatResponse(BaseModel):
+    """Lock state after a heartbeat."""
+
+    held: bool = Field(..., description="True if this device holds the lock")
+    expires_in: int = Field(..., description="Seconds until the lock expires without another heartbeat")
+
+
 class RevertResponse(BaseModel):
     """Response after reverting to a previous version."""
 
@@ -201,6 +278,13 @@ class TotalProjectCountResponse(BaseModel):
     total_project_count: int = Field(..., description="Total number of projects (works)")
 
 
+class WorkStatsResponse(BaseModel):
+    """Dashboard totals for the user."""
+
+    total_word_count: int = Field(..., description="Total word count across all user's works")
+    total_project_count: int = Field(..., description="Total number of projects (works)")
+
+
 class RenameWorkRequest(BaseModel):
     """Request to rename a work."""
 
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request cost of require_user with and without the token cache.
+
+Simulates a small set of active users whose editors send many requests with
+the same token, and times a full jwt decode against token_cache.verify_token
+for the same request stream. Only the signature/claims work is measured,
+not HTTP parsing.
+
+Usage: python backend/benchmarks/auth_overhead.py [requests] [users]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir.parent))
+
+import _env  # noqa: F401  (seeds the env backend.config requires)
+
+from backend.modules.auth import token_cache
+from backend.modules.auth.jwt import create_token, decode_token
+
+
+def _time_per_call_us(verify, stream) -> float:
+    start = time.perf_counter()
+    for token in stream:
+        verify(token)
+    return (time.perf_counter() - start) * 1e6 / len(stream)
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    tokens = [create_token(f"user{n}@example.com", f"user{n}") for n in range(users)]
+    rng = random.Random(7)
+    stream = [rng.choice(tokens) for _ in range(requests)]
+
+    token_cache.clear()
+    uncached_us = _time_per_call_us(decode_token, stream)
+    cached_us = _time_per_call_us(token_cache.verify_token, stream)
+    stats = token_cache.get_stats()
+
+    print(f"requests: {requests:,}  distinct tokens: {users}")
+    print(f"{'jwt.decode every request':30}{uncached_us:>10.1f} us/request")
+    print(f"{'token_cache.verify_token':30}{cached_us:>10.1f} us/request")
+    print(f"speedup: {uncached_us / cached_us:.1f}x  hit rate: {stats['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
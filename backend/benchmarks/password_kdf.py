@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Calibration: pick password KDF parameters for a target verify latency.
+
+Times one PBKDF2-SHA256 and scrypt derivation per candidate on this machine
+and prints the strongest settings whose verify stays under the target, as
+env lines for backend.config. Run it on the deployment hardware; login
+upgrades existing hashes to the new parameters as users sign in.
+
+Usage: python backend/benchmarks/password_kdf.py [target_ms]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir.parent))
+
+import _env  # noqa: F401  (seeds the env backend.config requires)
+
+from backend.modules.auth import passwords
+
+_SALT = b"calibration-salt"
+_PASSWORD = "correct horse battery staple"
+
+
+def _ms(algorithm, params, repeats: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        passwords.derive(algorithm, params, _PASSWORD, _SALT)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def calibrate_pbkdf2(target_ms: float):
+    probe = 50_000
+    per_iteration = _ms(passwords.PBKDF2, {"i": probe}) / probe
+    # Round down to a 10k step so the setting is easy to read and compare.
+    iterations = max(int(target_ms / per_iteration) // 10_000 * 10_000, 10_000)
+    return {"i": iterations}, _ms(passwords.PBKDF2, {"i": iterations})
+
+
+def calibrate_scrypt(target_ms: float):
+    chosen = None
+    for log_n in range(12, 21):
+        params = {"n": 2 ** log_n, "r": 8, "p": 1}
+        elapsed = _ms(passwords.SCRYPT, params, repeats=1)
+        if elapsed > target_ms:
+            break
+        chosen = (params, elapsed)
+    return chosen
+
+
+def main() -> None:
+    target_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 250.0
+    current = passwords.current_params(passwords.PBKDF2)
+    print(f"target verify latency: {target_ms:.0f} ms")
+    print(f"current pbkdf2 {current}: {_ms(passwords.PBKDF2, current):.1f} ms")
+
+    pbkdf2_params, pbkdf2_ms = calibrate_pbkdf2(target_ms)
+    print(f"pbkdf2_sha256 {pbkdf2_params}: {pbkdf2_ms:.1f} ms")
+    scrypt = calibrate_scrypt(target_ms)
+    if scrypt is None:
+        print("scrypt: even n=4096 exceeds the target")
+    else:
+        scrypt_params, scrypt_ms = scrypt
+        memory_mib = 128 * scrypt_params["n"] * scrypt_params["r"] / 2 ** 20
+        print(f"scrypt {scrypt_params}: {scrypt_ms:.1f} ms, ~{memory_mib:.0f} MiB per hash")
+
+    print("\n# memory-hard (preferred when PASSWORD_HASH_WORKERS x memory fits)")
+    if scrypt is not None:
+        print("PASSWORD_HASH_ALGORITHM=scrypt")
+        print(f"PASSWORD_SCRYPT_N={scrypt[0]['n']}")
+        print(f"PASSWORD_SCRYPT_R={scrypt[0]['r']}")
+        print(f"PASSWORD_SCRYPT_P={scrypt[0]['p']}")
+    print("# or")
+    print("PASSWORD_HASH_ALGORITHM=pbkdf2_sha256")
+    print(f"PASSWORD_PBKDF2_ITERATIONS={pbkdf2_params['i']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-copy vs snapshot+delta storage for work_versions content.
+
+Simulates an auto-saving student (small edits between saves, a submission
+every SAVES_PER_SUBMISSION saves) and compares bytes stored and the cost of
+reading any version back under both schemes. zlib is used as a stand-in
+for TOAST compression.
+
+Usage: python backend/benchmarks/version_storage.py [saves] [essay_words]
+"""
+
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+from statistics import mean
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir.parent))
+
+import _env  # noqa: F401  (seeds the env backend.config requires)
+from backend.modules.work import version_delta
+
+SAVES_PER_SUBMISSION = 25
+_WORDS = (
+    "the argument essay evidence however therefore student writing clear "
+    "thesis paragraph claim reason example because although which shows that "
+    "history policy research data society culture change impact result"
+).split()
+
+
+def _simulate(saves: int, essay_words: int, seed: int = 7):
+    rng = random.Random(seed)
+    words = [rng.choice(_WORDS) for _ in range(essay_words)]
+    for position in range(18, len(words), 18):
+        words[position] += "."  # roughly 18-word sentences
+    versions = []
+    for number in range(1, saves + 1):
+        for _ in range(rng.randint(1, 6)):
+            position = rng.randrange(len(words))
+            edit = rng.random()
+            if edit < 0.4:
+                words[position] = rng.choice(_WORDS)
+            elif edit < 0.8:
+                words.insert(position, rng.choice(_WORDS))
+            elif len(words) > 10:
+                del words[position]
+        if rng.random() < 0.3:
+            words.extend(rng.choice(_WORDS) for _ in range(rng.randint(5, 20)))
+            words[-1] += "."
+        text = " ".join(words) + "."
+        versions.append((number, text, number % SAVES_PER_SUBMISSION == 0))
+    return versions
+
+
+def _store_with_deltas(versions):
+    rows = {}
+    snapshot = None
+    for number, text, is_submitted in versions:
+        fields = version_delta.plan_storage(text, snapshot, is_submitted)
+        rows[number] = fields
+        if fields["storage_kind"] == "full":
+            snapshot = {"version_number": number, "content": text, "delta_count": 0}
+        else:
+            snapshot["delta_count"] += 1
+    return rows
+
+
+def _read_delta_row(rows, number):
+    row = rows[number]
+    if row["storage_kind"] == "full":
+        return row["content"]
+    base = rows[row["base_version"]]["content"]
+    return version_delta.apply_delta(base, row["content_delta"])
+
+
+def main() -> None:
+    saves = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    essay_words = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+    versions = _simulate(saves, essay_words)
+
+    start = time.perf_counter()
+    rows = _store_with_deltas(versions)
+    write_ms = (time.perf_counter() - start) * 1000 / len(versions)
+
+    full_bytes = sum(len(text.encode()) for _, text, _ in versions)
+    full_toast = sum(len(zlib.compress(text.encode())) for _, text, _ in versions)
+    stored = [row["content"] or row["content_delta"] for row in rows.values()]
+    delta_bytes = sum(len(value.encode()) for value in stored)
+    delta_toast = sum(
+        len(zlib.compress(value.encode())) if len(value) > 2000 else len(value.encode())
+        for value in stored
+    )
+    snapshots = sum(1 for row in rows.values() if row["storage_kind"] == "full")
+
+    read_bytes_full = []
+    read_bytes_delta = []
+    rebuild_us = []
+    for number, text, _ in versions:
+        start = time.perf_counter()
+        rebuilt = _read_delta_row(rows, number)
+        rebuild_us.append((time.perf_counter() - start) * 1e6)
+        assert rebuilt == text, f"version {number} did not round-trip"
+        row = rows[number]
+        read_bytes_full.append(len(text.encode()))
+        read_bytes_delta.append(
+            len(text.encode()) if row["storage_kind"] == "full"
+            else len(rows[row["base_version"]]["content"].encode()) + len(row["content_delta"].encode())
+        )
+
+    print(f"versions: {len(versions)}  essay: ~{essay_words} words  snapshots: {snapshots}")
+    print(f"{'':24}{'full copy':>14}{'snapshot+delta':>16}")
+    print(f"{'stored bytes':24}{full_bytes:>14,}{delta_bytes:>16,}")
+    print(f"{'stored bytes (zlib)':24}{full_toast:>14,}{delta_toast:>16,}")
+    print(f"{'avg bytes read/version':24}{mean(read_bytes_full):>14,.0f}{mean(read_bytes_delta):>16,.0f}")
+    print(f"rebuild cost: avg {mean(rebuild_us):.1f} us, max {max(rebuild_us):.1f} us per version")
+    print(f"write-side diff cost: avg {write_ms:.2f} ms per save")
+
+
+if __name__ == "__main__":
+    main()
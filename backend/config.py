@@ -24,6 +24,34 @@ def _require(key: str) -> str:
     return value
 
 
+def _optional(key: str, default: str) -> str:
+    value = os.getenv(key)
+    if value is None or not value.strip():
+        return default
+    return value.strip()
+
+
+def _optional_int(key: str, default: int) -> int:
+    value = os.getenv(key)
+    if value is None or not value.strip():
+        return default
+    return int(value)
+
+
+def _optional_float(key: str, default: float) -> float:
+    value = os.getenv(key)
+    if value is None or not value.strip():
+        return default
+    return float(value)
+
+
+def _optional_bool(key: str, default: bool) -> bool:
+    value = os.getenv(key)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 _load_env()
 
 APP_ENV = _require("APP_ENV")
@@ -32,11 +60,52 @@ APP_PORT = int(_require("APP_PORT"))
 
 JWT_SECRET_KEY = _require("JWT_SECRET_KEY")
 JWT_EXPIRE_MINUTES = int(_require("JWT_EXPIRE_MINUTES"))
+JWT_CACHE_SECONDS = _optional_int("JWT_CACHE_SECONDS", 300)
+JWT_CACHE_MAX_ENTRIES = _optional_int("JWT_CACHE_MAX_ENTRIES", 10000)
+PASSWORD_HASH_WORKERS = _optional_int("PASSWORD_HASH_WORKERS", 2)
+PASSWORD_HASH_ALGORITHM = _optional("PASSWORD_HASH_ALGORITHM", "pbkdf2_sha256")
+PASSWORD_PBKDF2_ITERATIONS = _optional_int("PASSWORD_PBKDF2_ITERATIONS", 120000)
+PASSWORD_SCRYPT_N = _optional_int("PASSWORD_SCRYPT_N", 32768)
+PASSWORD_SCRYPT_R = _optional_int("PASSWORD_SCRYPT_R", 8)
+PASSWORD_SCRYPT_P = _optional_int("PASSWORD_SCRYPT_P", 1)
+PASSWORD_HASH_MAX_QUEUE = _optional_int("PASSWORD_HASH_MAX_QUEUE", 16)
 
 DATABASE_URL = _require("DATABASE_URL")
+DB_POOL_MIN_SIZE = _optional_int("DB_POOL_MIN_SIZE", 1)
+DB_POOL_MAX_SIZE = _optional_int("DB_POOL_MAX_SIZE", 10)
+DB_POOL_TIMEOUT_SECONDS = _optional_int("DB_POOL_TIMEOUT_SECONDS", 10)
+DB_POOL_MAX_IDLE_SECONDS = _optional_int("DB_POOL_MAX_IDLE_SECONDS", 300)
+DB_POOL_MAX_LIFETIME_SECONDS = _optional_int("DB_POOL_MAX_LIFETIME_SECONDS", 1800)
+DB_POOL_CHECK_ON_CHECKOUT = _optional_bool("DB_POOL_CHECK_ON_CHECKOUT", False)
+DB_ASYNC_POOL_MAX_SIZE = _optional_int("DB_ASYNC_POOL_MAX_SIZE", 10)
 
 REDIS_URL = _require("REDIS_URL")
 WORK_LOCK_EXPIRE_SECONDS = int(_require("WORK_LOCK_EXPIRE_SECONDS"))
+WORK_LOCK_LEASE_SECONDS = _optional_int("WORK_LOCK_LEASE_SECONDS", 15)
+REDIS_MAX_CONNECTIONS = _optional_int("REDIS_MAX_CONNECTIONS", 50)
+REDIS_POOL_TIMEOUT_SECONDS = _optional_int("REDIS_POOL_TIMEOUT_SECONDS", 5)
+
+WORK_LIST_PAGE_SIZE = _optional_int("WORK_LIST_PAGE_SIZE", 50)
+WORK_LIST_MAX_PAGE_SIZE = _optional_int("WORK_LIST_MAX_PAGE_SIZE", 200)
+WORK_OWNERSHIP_CACHE_SECONDS = _optional_int("WORK_OWNERSHIP_CACHE_SECONDS", 30)
+WORK_OWNERSHIP_CACHE_MAX_ENTRIES = _optional_int("WORK_OWNERSHIP_CACHE_MAX_ENTRIES", 10000)
+
+AUTOSAVE_BUFFER_BACKEND = _optional("AUTOSAVE_BUFFER_BACKEND", "redis")
+AUTOSAVE_DEBOUNCE_SECONDS = _optional_float("AUTOSAVE_DEBOUNCE_SECONDS", 2.0)
+AUTOSAVE_MAX_DELAY_SECONDS = _optional_float("AUTOSAVE_MAX_DELAY_SECONDS", 10.0)
+
+VERSION_SNAPSHOT_INTERVAL = _optional_int("VERSION_SNAPSHOT_INTERVAL", 20)
+VERSION_DELTA_MAX_RATIO = _optional_float("VERSION_DELTA_MAX_RATIO", 0.5)
+VERSION_SNAPSHOT_CACHE_MAX_ENTRIES = _optional_int("VERSION_SNAPSHOT_CACHE_MAX_ENTRIES", 1000)
+VERSION_LIST_PAGE_SIZE = _optional_int("VERSION_LIST_PAGE_SIZE", 50)
+VERSION_LIST_MAX_PAGE_SIZE = _optional_int("VERSION_LIST_MAX_PAGE_SIZE", 200)
+
+ANALYSIS_QUEUE_BACKEND = _optional("ANALYSIS_QUEUE_BACKEND", "redis")
+ANALYSIS_WORKER_CONCURRENCY = _optional_int("ANALYSIS_WORKER_CONCURRENCY", 2)
+ANALYSIS_JOB_MAX_ATTEMPTS = _optional_int("ANALYSIS_JOB_MAX_ATTEMPTS", 3)
+ANALYSIS_JOB_RETRY_BASE_SECONDS = _optional_int("ANALYSIS_JOB_RETRY_BASE_SECONDS", 5)
+ANALYSIS_JOB_TTL_SECONDS = _optional_int("ANALYSIS_JOB_TTL_SECONDS", 86400)
+ANALYSIS_JOB_LEASE_SECONDS = _optional_int("ANALYSIS_JOB_LEASE_SECONDS", 60)
 
 LLM_BASE_URL = _require("LLM_BASE_URL")
 LLM_API_KEY = _require("LLM_API_KEY")
@@ -48,4 +117,19 @@ CLAUDE_BASE_URL = _require("CLAUDE_BASE_URL")
 CLAUDE_MODEL = _require("CLAUDE_MODEL")
 CLAUDE_TIMEOUT_SECONDS = int(_require("CLAUDE_TIMEOUT_SECONDS"))
 
+LLM_HTTP_MAX_CONNECTIONS = _optional_int("LLM_HTTP_MAX_CONNECTIONS", 20)
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = _optional_int("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", 10)
+LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS = _optional_int("LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS", 90)
+
+LLM_RETRY_MAX_ATTEMPTS = _optional_int("LLM_RETRY_MAX_ATTEMPTS", 3)
+LLM_RETRY_BASE_DELAY_SECONDS = _optional_float("LLM_RETRY_BASE_DELAY_SECONDS", 0.5)
+LLM_RETRY_MAX_DELAY_SECONDS = _optional_float("LLM_RETRY_MAX_DELAY_SECONDS", 8.0)
+LLM_RETRY_BUDGET_RATIO = _optional_float("LLM_RETRY_BUDGET_RATIO", 0.2)
+LLM_BREAKER_FAILURE_THRESHOLD = _optional_int("LLM_BREAKER_FAILURE_THRESHOLD", 5)
+LLM_BREAKER_RESET_SECONDS = _optional_int("LLM_BREAKER_RESET_SECONDS", 30)
+
+LLM_CACHE_BACKEND = _optional("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_TTL_SECONDS = _optional_int("LLM_CACHE_TTL_SECONDS", 86400)
+LLM_CACHE_MAX_ENTRIES = _optional_int("LLM_CACHE_MAX_ENTRIES", 1000)
+
 FRONTEND_BASE_URL = _require("FRONTEND_BASE_URL")
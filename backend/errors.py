@@ -24,6 +24,7 @@ ERROR_STATUS_MAP: Dict[str, int] = {
     "password_same": 422,
     "username_same": 409,
     "validation_failed": 422,
+    "rate_limited": 429,
 }
 
 
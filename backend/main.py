@@ -1,5 +1,7 @@
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,10 +12,16 @@ from backend.api.errors import BusinessError, business_error_handler
 from backend.api.llm.router import router as llm_router
 from backend.api.work.router import router as work_router
 from backend.config import FRONTEND_BASE_URL
-from backend.modules.auth import change, check, login, signup
+from backend.modules.analysis_queue import jobs as analysis_jobs
+from backend.modules.auth import change, check, hashing_pool, login, signup
 from backend.modules.conversation import manager as conversation_manager
+from backend.modules.llm_gateway.client import close_http_clients
+from backend.modules.session_lock import events as lock_events
+from backend.modules.work import autosave
 from backend.modules.work import manager as work_manager
-from backend.storage.db import execute_query
+from backend.storage.async_db import close_async_pool, execute_query_async
+from backend.storage.db import close_pool, execute_query, transaction
+from backend.storage.redis_client import close_client as close_redis_client
 
 
 def register_routers(app: FastAPI) -> None:
@@ -29,6 +37,11 @@ def register_error_handlers(app: FastAPI) -> None:
     app.add_exception_handler(BusinessError, business_error_handler)
 
 
+def register_job_handlers() -> None:
+    """Wire background job handlers into the analysis queue."""
+    analysis_jobs.set_handler(work_manager.run_analysis_job)
+
+
 def register_storage_executors() -> None:
     """Wire storage executors into business modules."""
     check.set_query_executor(execute_query)
@@ -36,10 +49,30 @@ def register_storage_executors() -> None:
     login.set_query_executor(execute_query)
     change.set_query_executor(execute_query)
     work_manager.set_query_executor(execute_query)
+    work_manager.set_transaction_factory(transaction)
     conversation_manager.set_query_executor(execute_query)
+    work_manager.set_async_query_executor(execute_query_async)
+    conversation_manager.set_async_query_executor(execute_query_async)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run analysis workers, the auto-save flusher and lock events; flush and close pools on stop."""
+    analysis_jobs.start_workers()
+    autosave.start_flusher()
+    lock_events.start_hub()
+    yield
+    autosave.stop_flusher()
+    analysis_jobs.stop_workers()
+    lock_events.stop_hub()
+    close_http_clients()
+    hashing_pool.shutdown()
+    close_pool()
+    await close_async_pool()
+    close_redis_client()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[FRONTEND_BASE_URL],
@@ -50,3 +83,4 @@ app.add_middleware(
 register_routers(app)
 register_error_handlers(app)
 register_storage_executors()
+register_job_handlers()
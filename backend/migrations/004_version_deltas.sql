@@ -0,0 +1,20 @@
+-- Delta-compressed work_versions content
+-- Created: 2026-10-18
+-- Purpose: Store drafts as compact diffs against the latest full snapshot
+-- instead of a full copy of the essay on every save.
+
+-- Delta rows carry no full content
+ALTER TABLE work_versions ALTER COLUMN content DROP NOT NULL;
+
+ALTER TABLE work_versions ADD COLUMN IF NOT EXISTS storage_kind VARCHAR(16) NOT NULL DEFAULT 'full';
+ALTER TABLE work_versions ADD COLUMN IF NOT EXISTS base_version INT;
+ALTER TABLE work_versions ADD COLUMN IF NOT EXISTS content_delta TEXT;
+ALTER TABLE work_versions ADD COLUMN IF NOT EXISTS content_preview VARCHAR(100);
+
+COMMENT ON COLUMN work_versions.storage_kind IS 'full: content holds the essay; delta: content_delta applies to base_version (always a full row).';
+COMMENT ON COLUMN work_versions.content_preview IS 'First 100 characters of the version content, written at save time.';
+
+-- Counting deltas per snapshot when deciding whether to take a new one
+CREATE INDEX IF NOT EXISTS idx_work_versions_work_base
+    ON work_versions(work_id, base_version)
+    WHERE base_version IS NOT NULL;
@@ -0,0 +1,9 @@
+-- Precomputed version list columns
+-- Created: 2026-10-18
+-- Purpose: Serve the version list from narrow columns so it never detoasts
+-- the essay body. Existing rows are filled by the runner's backfill step
+-- (python run_migration.py 005_version_word_count.sql).
+
+ALTER TABLE work_versions ADD COLUMN IF NOT EXISTS word_count INT;
+
+COMMENT ON COLUMN work_versions.word_count IS 'count_words() of the version content, written at save time.';
@@ -0,0 +1,7 @@
+-- Keyset pagination for the works list
+-- Created: 2026-10-18
+-- Purpose: Serve /api/work/list (WHERE user_email ORDER BY updated_at DESC,
+-- id DESC) from an index instead of sorting every work the user owns.
+
+CREATE INDEX IF NOT EXISTS idx_works_user_updated
+    ON works(user_email, updated_at DESC, id DESC);
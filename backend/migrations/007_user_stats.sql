@@ -0,0 +1,28 @@
+-- Per-user dashboard counters
+-- Created: 2026-10-18
+-- Purpose: Serve /api/work/stats from one row instead of SUM/COUNT scans
+-- over every work a user owns. work repo writes (create_work,
+-- update_work_content, update_work_content_at_version, delete_work) adjust
+-- the owner's row in the same statement as the works change.
+
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_email TEXT PRIMARY KEY,
+    project_count INT NOT NULL DEFAULT 0,
+    total_word_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Block work writes while seeding so no change slips between the
+-- aggregate and the counters.
+LOCK TABLE works IN SHARE MODE;
+
+INSERT INTO user_stats (user_email, project_count, total_word_count, updated_at)
+SELECT user_email, COUNT(*), COALESCE(SUM(word_count), 0), NOW()
+FROM works
+GROUP BY user_email
+ON CONFLICT (user_email) DO UPDATE SET
+    project_count = EXCLUDED.project_count,
+    total_word_count = EXCLUDED.total_word_count,
+    updated_at = NOW();
+
+COMMENT ON TABLE user_stats IS 'Per-user totals maintained by the work repo write statements.';
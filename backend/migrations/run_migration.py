@@ -2,6 +2,9 @@
 """
 Database migration runner
 Usage: python run_migration.py <migration_file.sql>
+
+Migrations listed in POST_STEPS also run a Python step (such as a batched
+backfill) after their SQL has committed.
 """
 
 import sys
@@ -24,6 +27,31 @@ except ImportError:
     psycopg2 = None
 
 
+def _backfill_version_summaries() -> None:
+    from backend.modules.work import version_manager
+    from backend.storage.db import close_pool, execute_query
+
+    version_manager.set_query_executor(execute_query)
+    try:
+        updated = version_manager.backfill_version_summaries()
+    finally:
+        close_pool()
+    print(f"✓ Backfilled content_preview/word_count on {updated} versions")
+
+
+POST_STEPS = {
+    "005_version_word_count.sql": _backfill_version_summaries,
+}
+
+
+def run_post_step(sql_file: Path) -> None:
+    """Run the Python step registered for a migration, if any"""
+    step = POST_STEPS.get(sql_file.name)
+    if step is not None:
+        print(f"Running post-migration step for {sql_file.name}")
+        step()
+
+
 def run_migration(sql_file: Path) -> None:
     """Execute SQL migration file"""
     if not sql_file.exists():
@@ -66,6 +94,7 @@ if __name__ == "__main__":
     migration_file = Path(__file__).parent / sys.argv[1]
     try:
         run_migration(migration_file)
+        run_post_step(migration_file)
     except Exception as e:
         print(f"✗ Migration failed: {e}")
         sys.exit(1)
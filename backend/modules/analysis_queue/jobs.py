@@ -0,0 +1,445 @@
+"""
+Background job queue for essay analysis.
+
+Submissions enqueue a job and return immediately; worker threads run the
+configured handler with bounded concurrency and retry failed jobs with
+exponential backoff. Jobs live in Redis (shared across processes) or in
+process memory (tests and single-process development).
+
+A worker claims a queued job by taking its lease, atomically with the
+status check, so a job id popped twice still runs once. The worker renews
+the lease while the handler runs. When a worker dies mid-job the lease
+expires and the next worker to poll re-queues the job (or fails it once it
+is out of attempts).
+"""
+
+import heapq
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import redis
+
+from backend.config import (
+    ANALYSIS_JOB_LEASE_SECONDS,
+    ANALYSIS_JOB_MAX_ATTEMPTS,
+    ANALYSIS_JOB_RETRY_BASE_SECONDS,
+    ANALYSIS_JOB_TTL_SECONDS,
+    ANALYSIS_QUEUE_BACKEND,
+    ANALYSIS_WORKER_CONCURRENCY,
+)
+from backend.errors import BusinessError
+from backend.storage import redis_client
+
+Job = Dict[str, Any]
+JobHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Business errors that a retry cannot fix.
+_PERMANENT_ERROR_CODES = {"validation_failed", "not_found", "forbidden"}
+
+# KEYS[1] = job key, KEYS[2] = leases zset; ARGV[1] = job id, ARGV[2] = now,
+# ARGV[3] = lease expiry, ARGV[4] = queued status.
+_CLAIM_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw or cjson.decode(raw)['status'] ~= ARGV[4] then
+    return 0
+end
+local lease = redis.call('ZSCORE', KEYS[2], ARGV[1])
+if lease and tonumber(lease) > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+return 1
+"""
+
+# KEYS[1] = job key; ARGV[1] = expected updated_at, ARGV[2] = new record,
+# ARGV[3] = ttl seconds.
+_REPLACE_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw or cjson.decode(raw)['updated_at'] ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+class InMemoryJobBackend:
+    """Process-local job store for tests and single-process deployments."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._jobs: Dict[str, Job] = {}
+        self._ready: List[str] = []
+        self._delayed: List[Tuple[float, str]] = []
+        self._leases: Dict[str, float] = {}
+
+    def save(self, job: Job) -> None:
+        with self._cond:
+            self._jobs[job["id"]] = json.loads(json.dumps(job))
+
+    def create(self, job: Job) -> bool:
+        with self._cond:
+            if job["id"] in self._jobs:
+                return False
+            self._jobs[job["id"]] = json.loads(json.dumps(job))
+            return True
+
+    def replace(self, job: Job, expected_updated_at: float) -> bool:
+        with self._cond:
+            current = self._jobs.get(job["id"])
+            if current is None or current["updated_at"] != expected_updated_at:
+                return False
+            self._jobs[job["id"]] = json.loads(json.dumps(job))
+            return True
+
+    def load(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+    def push(self, job_id: str) -> None:
+        with self._cond:
+            self._ready.append(job_id)
+            self._cond.notify()
+
+    def schedule(self, job_id: str, ready_at: float) -> None:
+        with self._cond:
+            heapq.heappush(self._delayed, (ready_at, job_id))
+            self._cond.notify()
+
+    def pop(self, timeout: float) -> Optional[str]:
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                now = time.time()
+                while self._delayed and self._delayed[0][0] <= now:
+                    self._ready.append(heapq.heappop(self._delayed)[1])
+                if self._ready:
+                    return self._ready.pop(0)
+                remaining = deadline - now
+                if remaining <= 0:
+                    return None
+                if self._delayed:
+                    remaining = min(remaining, self._delayed[0][0] - now)
+                self._cond.wait(remaining)
+
+    def claim(self, job_id: str, now: float, expires_at: float) -> bool:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != STATUS_QUEUED:
+                return False
+            if self._leases.get(job_id, now) > now:
+                return False
+            self._leases[job_id] = expires_at
+            return True
+
+    def renew(self, job_id: str, expires_at: float) -> None:
+        with self._cond:
+            if job_id in self._leases:
+                self._leases[job_id] = expires_at
+
+    def release(self, job_id: str) -> bool:
+        with self._cond:
+            return self._leases.pop(job_id, None) is not None
+
+    def lease_expires_at(self, job_id: str) -> Optional[float]:
+        with self._cond:
+            return self._leases.get(job_id)
+
+    def expired(self, now: float) -> List[str]:
+        with self._cond:
+            return [job_id for job_id, expires_at in self._leases.items() if expires_at <= now]
+
+
+class RedisJobBackend:
+    """Redis job store shared by every app process."""
+
+    _QUEUE_KEY = "analysis_jobs:queue"
+    _DELAYED_KEY = "analysis_jobs:delayed"
+    _LEASES_KEY = "analysis_jobs:leases"
+
+    def __init__(self, client: redis.Redis, ttl_seconds: int = ANALYSIS_JOB_TTL_SECONDS) -> None:
+        self._client = client
+        self._ttl = ttl_seconds
+        self._claim_script = client.register_script(_CLAIM_SCRIPT)
+        self._replace_script = client.register_script(_REPLACE_SCRIPT)
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"analysis_job:{job_id}"
+
+    def save(self, job: Job) -> None:
+        self._client.set(self._job_key(job["id"]), json.dumps(job), ex=self._ttl)
+
+    def create(self, job: Job) -> bool:
+        key = self._job_key(job["id"])
+        return bool(self._client.set(key, json.dumps(job), ex=self._ttl, nx=True))
+
+    def replace(self, job: Job, expected_updated_at: float) -> bool:
+        keys = [self._job_key(job["id"])]
+        args = [repr(expected_updated_at), json.dumps(job), self._ttl]
+        return bool(self._replace_script(keys=keys, args=args))
+
+    def load(self, job_id: str) -> Optional[Job]:
+        raw = self._client.get(self._job_key(job_id))
+        return json.loads(raw) if raw else None
+
+    def push(self, job_id: str) -> None:
+        self._client.lpush(self._QUEUE_KEY, job_id)
+
+    def schedule(self, job_id: str, ready_at: float) -> None:
+        self._client.zadd(self._DELAYED_KEY, {job_id: ready_at})
+
+    def pop(self, timeout: float) -> Optional[str]:
+        self._promote_due()
+        item = self._client.brpop(self._QUEUE_KEY, timeout=max(1, int(timeout)))
+        if item is None:
+            return None
+        return item[1]
+
+    def _promote_due(self) -> None:
+        due = self._client.zrangebyscore(self._DELAYED_KEY, "-inf", time.time())
+        for job_id in due:
+            # Only the worker whose ZREM succeeds re-queues the job.
+            if self._client.zrem(self._DELAYED_KEY, job_id):
+                self.push(job_id)
+
+    def claim(self, job_id: str, now: float, expires_at: float) -> bool:
+        # Status check and lease write are one script: two workers that pop
+        # the same id cannot both claim it.
+        keys = [self._job_key(job_id), self._LEASES_KEY]
+        args = [job_id, repr(now), repr(expires_at), STATUS_QUEUED]
+        return bool(self._claim_script(keys=keys, args=args))
+
+    def renew(self, job_id: str, expires_at: float) -> None:
+        # XX: never resurrect a lease that was released or reaped meanwhile.
+        self._client.zadd(self._LEASES_KEY, {job_id: expires_at}, xx=True)
+
+    def release(self, job_id: str) -> bool:
+        # Only the caller whose ZREM succeeds owns the expired job.
+        return bool(self._client.zrem(self._LEASES_KEY, job_id))
+
+    def lease_expires_at(self, job_id: str) -> Optional[float]:
+        return self._client.zscore(self._LEASES_KEY, job_id)
+
+    def expired(self, now: float) -> List[str]:
+        return self._client.zrangebyscore(self._LEASES_KEY, "-inf", now)
+
+
+_BACKEND: Optional[Any] = None
+_HANDLER: Optional[JobHandler] = None
+_WORKERS: List[threading.Thread] = []
+_STOP = threading.Event()
+
+
+def set_backend(backend: Optional[Any]) -> None:
+    """Set the job backend for dependency injection."""
+    global _BACKEND
+    _BACKEND = backend
+
+
+def set_handler(handler: Optional[JobHandler]) -> None:
+    """Configure the function that processes a job payload."""
+    global _HANDLER
+    _HANDLER = handler
+
+
+def _get_backend() -> Any:
+    global _BACKEND
+    if _BACKEND is None:
+        if ANALYSIS_QUEUE_BACKEND == "memory":
+            _BACKEND = InMemoryJobBackend()
+        else:
+            client = redis_client.get_client()
+            _BACKEND = RedisJobBackend(client)
+    return _BACKEND
+
+
+def enqueue(job_id: str, payload: Dict[str, Any]) -> Job:
+    """
+    Queue a job unless one with the same id is already pending or done.
+
+    A running record whose lease has expired belongs to a dead worker and
+    is replaced. Creation and replacement are both atomic, so concurrent
+    callers queue the job once. Returns the stored job record.
+    """
+    backend = _get_backend()
+    now = time.time()
+    job = {
+        "id": job_id,
+        "status": STATUS_QUEUED,
+        "payload": payload,
+        "attempts": 0,
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    while True:
+        if backend.create(job):
+            break
+        existing = backend.load(job_id)
+        if existing is None:
+            continue  # expired between the two calls
+        if existing["status"] != STATUS_FAILED and not _is_stale(backend, existing):
+            return existing
+        if backend.replace(job, existing["updated_at"]):
+            break
+    backend.push(job_id)
+    return job
+
+
+def get_job(job_id: str) -> Optional[Job]:
+    """Return the job record, or None when unknown or expired."""
+    return _get_backend().load(job_id)
+
+
+def process_next(timeout: float = 0) -> bool:
+    """Run one ready job on the calling thread. Returns False if none was ready."""
+    backend = _get_backend()
+    _reap_expired(backend)
+    job_id = backend.pop(timeout)
+    if job_id is None:
+        return False
+    _process(job_id)
+    return True
+
+
+def _process(job_id: str) -> None:
+    if _HANDLER is None:
+        raise RuntimeError("analysis queue handler not configured")
+    backend = _get_backend()
+    now = time.time()
+    # Only a queued job without a live lease is claimed; anything else is
+    # finished, failed, or already held by another worker.
+    if not backend.claim(job_id, now, now + ANALYSIS_JOB_LEASE_SECONDS):
+        return
+    job = backend.load(job_id)
+    if job is None:
+        backend.release(job_id)
+        return
+
+    job["status"] = STATUS_RUNNING
+    job["attempts"] += 1
+    job["updated_at"] = now
+    backend.save(job)
+
+    try:
+        with _renewing_lease(backend, job_id):
+            job["result"] = _HANDLER(job["payload"])
+        job["status"] = STATUS_DONE
+        job["error"] = None
+    except Exception as exc:
+        job["error"] = getattr(exc, "message", None) or str(exc)
+        if _should_retry(exc, job["attempts"]):
+            delay = ANALYSIS_JOB_RETRY_BASE_SECONDS * (2 ** (job["attempts"] - 1))
+            job["status"] = STATUS_QUEUED
+            backend.schedule(job_id, time.time() + delay)
+            print(f"[ANALYSIS QUEUE] Job {job_id} failed, retrying in {delay}s: {exc}")
+        else:
+            job["status"] = STATUS_FAILED
+            print(f"[ANALYSIS QUEUE] Job {job_id} failed permanently: {exc}")
+    job["updated_at"] = time.time()
+    backend.save(job)
+    backend.release(job_id)
+
+
+@contextmanager
+def _renewing_lease(backend: Any, job_id: str) -> Iterator[None]:
+    """Renew the job lease in the background until the block exits."""
+    done = threading.Event()
+
+    def renew() -> None:
+        while not done.wait(ANALYSIS_JOB_LEASE_SECONDS / 3):
+            try:
+                backend.renew(job_id, time.time() + ANALYSIS_JOB_LEASE_SECONDS)
+            except Exception as exc:
+                print(f"[ANALYSIS QUEUE] Lease renewal failed for {job_id}: {exc}")
+
+    renewer = threading.Thread(target=renew, name=f"analysis-lease-{job_id}", daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        done.set()
+        renewer.join()
+
+
+def _is_stale(backend: Any, job: Job) -> bool:
+    if job["status"] != STATUS_RUNNING:
+        return False
+    expires_at = backend.lease_expires_at(job["id"])
+    return expires_at is None or expires_at <= time.time()
+
+
+def _reap_expired(backend: Any) -> None:
+    """Re-queue (or fail) running jobs whose worker stopped renewing the lease."""
+    for job_id in backend.expired(time.time()):
+        if not backend.release(job_id):
+            continue
+        job = backend.load(job_id)
+        if job is None:
+            continue
+        if job["status"] == STATUS_QUEUED:
+            # Claimed by a worker that died before starting it.
+            backend.push(job_id)
+            continue
+        if job["status"] != STATUS_RUNNING:
+            continue
+        job["error"] = "worker lease expired"
+        job["updated_at"] = time.time()
+        if job["attempts"] >= ANALYSIS_JOB_MAX_ATTEMPTS:
+            job["status"] = STATUS_FAILED
+            backend.save(job)
+            print(f"[ANALYSIS QUEUE] Job {job_id} lease expired, failed permanently")
+        else:
+            job["status"] = STATUS_QUEUED
+            backend.save(job)
+            backend.push(job_id)
+            print(f"[ANALYSIS QUEUE] Job {job_id} lease expired, re-queued")
+
+
+def _should_retry(exc: Exception, attempts: int) -> bool:
+    if attempts >= ANALYSIS_JOB_MAX_ATTEMPTS:
+        return False
+    if isinstance(exc, BusinessError) and exc.code in _PERMANENT_ERROR_CODES:
+        return False
+    return True
+
+
+def _worker_loop() -> None:
+    while not _STOP.is_set():
+        try:
+            process_next(timeout=1)
+        except Exception as exc:
+            print(f"[ANALYSIS QUEUE] Worker error: {type(exc).__name__}: {exc}")
+            _STOP.wait(1)
+
+
+def start_workers(concurrency: int = ANALYSIS_WORKER_CONCURRENCY) -> None:
+    """Start ``concurrency`` daemon worker threads (no-op if already running)."""
+    if _WORKERS:
+        return
+    _STOP.clear()
+    for index in range(concurrency):
+        worker = threading.Thread(
+            target=_worker_loop, name=f"analysis-worker-{index}", daemon=True
+        )
+        worker.start()
+        _WORKERS.append(worker)
+
+
+def stop_workers(timeout: float = 5.0) -> None:
+    """Ask workers to exit after their current job and wait for them."""
+    _STOP.set()
+    for worker in _WORKERS:
+        worker.join(timeout)
+    _WORKERS.clear()
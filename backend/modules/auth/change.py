@@ -2,7 +2,7 @@ from typing import Any, Callable, Dict, Optional
 
 from backend.errors import BusinessError
 from backend.modules.auth import check
-from backend.modules.auth.passwords import hash_password, verify_password
+from backend.modules.auth.hashing_pool import hash_password, verify_password
 from backend.storage.user import repo as user_repo
 
 Query = Dict[str, Any]
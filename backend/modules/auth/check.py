@@ -25,14 +25,20 @@ def is_email_taken(email: str) -> bool:
     """Return True when a user exists for the given email.
 
     Example:
-        set_query_executor(lambda q: {"email": "a@b.com"})
+        set_query_executor(lambda q: True)
         is_email_taken("a@b.com")
     """
-    query = user_repo.get_user_by_email(email)
-    return _run(query) is not None
+    query = user_repo.email_exists(email)
+    return bool(_run(query))
 
 
 def is_username_taken(username: str) -> bool:
     """Return True when a user exists for the given username."""
-    query = user_repo.get_user_by_username(username)
-    return _run(query) is not None
+    query = user_repo.username_exists(username)
+    return bool(_run(query))
+
+
+def find_taken_field(email: str, username: str) -> Optional[str]:
+    """Return 'email' or 'username' for the first value already taken, else None."""
+    query = user_repo.find_taken_field(email, username)
+    return _run(query) or None
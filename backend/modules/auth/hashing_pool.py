@@ -0,0 +1,143 @@
+"""
+Bounded worker pool for password hashing and verification.
+
+PBKDF2 is deliberately CPU-heavy. Running it on request threads lets a
+burst of logins or signups starve every other sync route, so hashes run on
+a dedicated process pool of PASSWORD_HASH_WORKERS workers instead. At most
+PASSWORD_HASH_MAX_QUEUE more requests may wait for a worker; beyond that
+callers get BusinessError("rate_limited") (HTTP 429) at once rather than
+queueing behind the storm. PASSWORD_HASH_WORKERS=0 hashes inline on the
+calling thread, still subject to the same admission limit. A worker that
+dies (OOM kill, crash) breaks a process pool for good, so the pool is
+rebuilt and the call retried once.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from backend.config import PASSWORD_HASH_MAX_QUEUE, PASSWORD_HASH_WORKERS
+from backend.errors import BusinessError
+from backend.modules.auth import passwords
+
+ExecutorFactory = Callable[[], Executor]
+
+
+class HashingPool:
+    """Admission-controlled front for a hashing executor."""
+
+    def __init__(
+        self, executor_factory: Optional[ExecutorFactory], workers: int, max_queue: int
+    ) -> None:
+        self._executor_factory = executor_factory
+        self._executor = executor_factory() if executor_factory else None
+        self._executor_lock = threading.Lock()
+        self._workers = max(workers, 1)
+        self._capacity = self._workers + max(max_queue, 0)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats: Dict[str, int] = {"completed": 0, "rejected": 0, "peak_queue_depth": 0}
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._in_flight >= self._capacity:
+                self._stats["rejected"] += 1
+                raise BusinessError("rate_limited", "too many sign-in attempts, try again shortly")
+            self._in_flight += 1
+            depth = max(self._in_flight - self._workers, 0)
+            self._stats["peak_queue_depth"] = max(self._stats["peak_queue_depth"], depth)
+        try:
+            return self._call(fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._stats["completed"] += 1
+
+    def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._executor_lock:
+            executor = self._executor
+        if executor is None:
+            return fn(*args)
+        try:
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            print("[AUTH] Hashing worker died, restarting the pool")
+            return self._replace(executor).submit(fn, *args).result()
+
+    def _replace(self, broken: Executor) -> Executor:
+        # Concurrent callers see the same broken executor; only the first
+        # one builds a replacement, the rest reuse it.
+        with self._executor_lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._executor_factory()
+            return self._executor
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["in_flight"] = self._in_flight
+            snapshot["queue_depth"] = max(self._in_flight - self._workers, 0)
+            snapshot["workers"] = self._workers
+            snapshot["capacity"] = self._capacity
+        return snapshot
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_POOL: Optional[HashingPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def set_pool(pool: Optional[HashingPool]) -> None:
+    """Set the hashing pool for dependency injection (None resets)."""
+    global _POOL
+    _POOL = pool
+
+
+def _new_executor() -> Executor:
+    # spawn, not fork: the app process runs many threads.
+    return ProcessPoolExecutor(
+        max_workers=PASSWORD_HASH_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _get_pool() -> HashingPool:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                factory = _new_executor if PASSWORD_HASH_WORKERS > 0 else None
+                _POOL = HashingPool(factory, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+    return _POOL
+
+
+def hash_password(password: str) -> str:
+    """passwords.hash_password on the hashing pool."""
+    return _get_pool().run(passwords.hash_password, password)
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    """passwords.verify_password on the hashing pool."""
+    return _get_pool().run(passwords.verify_password, password, stored_hash)
+
+
+def get_stats() -> Dict[str, int]:
+    """Return in-flight work, current queue depth and rejection counters."""
+    return _get_pool().stats()
+
+
+def shutdown() -> None:
+    """Stop the worker processes; the next hash starts a new pool."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown()
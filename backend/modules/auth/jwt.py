@@ -8,7 +8,7 @@ properly upon request. The implementation uses the PyJWT library.
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 import jwt
 
@@ -74,12 +74,36 @@ def decode_token(token: str) -> Dict[str, str]:
         BusinessError: If the token is invalid, expired, or malformed,
                        a BusinessError with code 'unauthorized' is raised.
     """
+    claims, _ = decode_token_with_expiry(token)
+    return claims
+
+
+def decode_token_with_expiry(token: str) -> Tuple[Dict[str, str], float]:
+    """
+    Decodes and validates a JWT, also returning its expiration.
+
+    Callers that remember a decoded token (see token_cache) use the
+    expiration so they never accept it past its 'exp' claim.
+
+    Args:
+        token: The JWT string to decode.
+
+    Returns:
+        A tuple of the {email, username} claims and the 'exp' claim as a
+        POSIX timestamp.
+
+    Raises:
+        BusinessError: 'unauthorized' if the token is invalid, expired, or malformed.
+    """
     try:
         # The jwt.decode function handles the entire validation process:
         # 1. Checks if the token is well-formed.
         # 2. Verifies the signature using the secret key and algorithm.
         # 3. Checks the 'exp' claim to ensure the token has not expired.
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
+        # 'exp' is required so every decoded token has a known lifetime.
+        payload = jwt.decode(
+            token, JWT_SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp"]}
+        )
 
         # After successful decoding, we extract the claims.
         # It's good practice to explicitly check for the existence of expected claims.
@@ -91,7 +115,7 @@ def decode_token(token: str) -> Dict[str, str]:
             raise BusinessError(code="unauthorized", message="Invalid token claims")
 
         # Return the extracted user information.
-        return {"email": email, "username": username}
+        return {"email": email, "username": username}, float(payload["exp"])
 
     except jwt.PyJWTError:
         # This is a broad exception from the PyJWT library that catches various issues
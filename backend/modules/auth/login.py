@@ -1,7 +1,8 @@
 from typing import Any, Callable, Dict, Optional
 
 from backend.errors import BusinessError
-from backend.modules.auth.passwords import verify_password
+from backend.modules.auth.hashing_pool import hash_password, verify_password
+from backend.modules.auth.passwords import needs_rehash
 from backend.storage.user import repo as user_repo
 
 Query = Dict[str, Any]
@@ -22,6 +23,20 @@ def _run(query: Query) -> Optional[Dict[str, Any]]:
     return _EXECUTOR(query)
 
 
+def _upgrade_hash(email: str, password: str, old_hash: str) -> None:
+    # Best effort: a busy hashing pool or failed write leaves the old hash,
+    # which still verifies, and the upgrade is retried on the next login.
+    # The write only applies while old_hash is still stored, so it never
+    # undoes a password change that landed after this login read the row.
+    try:
+        new_hash = hash_password(password)
+        _run(user_repo.update_password_if_unchanged(email, old_hash, new_hash))
+    except BusinessError:
+        pass
+    except Exception as exc:
+        print(f"[AUTH] Password rehash failed: {type(exc).__name__}: {exc}")
+
+
 def login(email: str, password: str) -> Dict[str, Any]:
     user = _run(user_repo.get_user_by_email(email))
     if user is None:
@@ -29,6 +44,8 @@ def login(email: str, password: str) -> Dict[str, Any]:
     stored_hash = user.get("password_hash", "")
     if not verify_password(password, stored_hash):
         raise BusinessError("invalid_credentials", "invalid credentials")
+    if needs_rehash(stored_hash):
+        _upgrade_hash(user.get("email"), password, stored_hash)
     return {
         "id": user.get("id"),
         "email": user.get("email"),
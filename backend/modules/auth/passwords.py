@@ -1,35 +1,106 @@
+"""
+Password hashing with self-describing stored hashes.
+
+Stored format: ``<algorithm>$<k>=<v>,...$<salt b64>$<digest b64>``, e.g.
+``pbkdf2_sha256$i=120000$...$...`` or ``scrypt$n=32768,r=8,p=1$...$...``.
+Hashes written before this format are ``<salt b64>$<digest b64>`` and are
+PBKDF2-SHA256 with 120,000 iterations. New hashes use PASSWORD_HASH_ALGORITHM
+and its parameters; needs_rehash tells login when a stored hash is older
+than that so it can be upgraded with the plaintext it just verified.
+"""
+
 import base64
 import binascii
 import hashlib
 import hmac
 import os
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 
-_ITERATIONS = 120_000
+from backend.config import (
+    PASSWORD_HASH_ALGORITHM,
+    PASSWORD_PBKDF2_ITERATIONS,
+    PASSWORD_SCRYPT_N,
+    PASSWORD_SCRYPT_P,
+    PASSWORD_SCRYPT_R,
+)
+
+PBKDF2 = "pbkdf2_sha256"
+SCRYPT = "scrypt"
+_LEGACY_PARAMS = {"i": 120_000}
 _SALT_BYTES = 16
 
+Params = Dict[str, int]
+
+
+def current_params(algorithm: Optional[str] = None) -> Params:
+    """Parameters new hashes are written with for ``algorithm`` (default: the configured one)."""
+    algorithm = algorithm or PASSWORD_HASH_ALGORITHM
+    if algorithm == PBKDF2:
+        return {"i": PASSWORD_PBKDF2_ITERATIONS}
+    if algorithm == SCRYPT:
+        return {"n": PASSWORD_SCRYPT_N, "r": PASSWORD_SCRYPT_R, "p": PASSWORD_SCRYPT_P}
+    raise ValueError(f"unsupported password hash algorithm: {algorithm}")
+
+
+def derive(algorithm: str, params: Params, password: str, salt: bytes) -> bytes:
+    """Run the KDF once; also used by the calibration benchmark."""
+    if algorithm == PBKDF2:
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, params["i"])
+    if algorithm == SCRYPT:
+        n, r, p = params["n"], params["r"], params["p"]
+        # hashlib caps scrypt at 32 MiB unless told otherwise.
+        return hashlib.scrypt(
+            password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r * p, dklen=32
+        )
+    raise ValueError(f"unsupported password hash algorithm: {algorithm}")
+
 
-def _split_hash(value: str) -> Tuple[bytes, bytes]:
-    if "$" not in value:
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode()
+
+
+def _parse(value: str) -> Tuple[str, Params, bytes, bytes]:
+    parts = value.split("$")
+    if len(parts) == 2:
+        algorithm, params, (salt_b64, digest_b64) = PBKDF2, dict(_LEGACY_PARAMS), parts
+    elif len(parts) == 4:
+        algorithm, raw_params, salt_b64, digest_b64 = parts
+        params = {}
+        for pair in raw_params.split(","):
+            name, _, number = pair.partition("=")
+            params[name] = int(number)
+    else:
         raise ValueError("invalid hash format")
-    salt_b64, digest_b64 = value.split("$", 1)
     if not salt_b64 or not digest_b64:
         raise ValueError("invalid hash format")
-    return base64.b64decode(salt_b64), base64.b64decode(digest_b64)
+    return algorithm, params, base64.b64decode(salt_b64), base64.b64decode(digest_b64)
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using PBKDF2-HMAC-SHA256."""
+    """Hash a password with the configured algorithm and parameters."""
+    params = current_params()
     salt = os.urandom(_SALT_BYTES)
-    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, _ITERATIONS)
-    return f"{base64.b64encode(salt).decode()}${base64.b64encode(digest).decode()}"
+    digest = derive(PASSWORD_HASH_ALGORITHM, params, password, salt)
+    encoded_params = ",".join(f"{name}={number}" for name, number in params.items())
+    return f"{PASSWORD_HASH_ALGORITHM}${encoded_params}${_b64(salt)}${_b64(digest)}"
 
 
 def verify_password(password: str, stored_hash: str) -> bool:
-    """Verify a password against a stored hash."""
+    """Verify a password against a stored hash in any supported format."""
     try:
-        salt, digest = _split_hash(stored_hash)
-        candidate = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, _ITERATIONS)
-    except (ValueError, binascii.Error):
+        algorithm, params, salt, digest = _parse(stored_hash)
+        candidate = derive(algorithm, params, password, salt)
+    except (ValueError, KeyError, binascii.Error):
         return False
     return hmac.compare_digest(candidate, digest)
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    """True if the hash was not written with the current algorithm and parameters."""
+    try:
+        algorithm, params, _, _ = _parse(stored_hash)
+    except (ValueError, binascii.Error):
+        return False
+    if stored_hash.count("$") == 1:
+        return True  # legacy salt$digest: move to the self-describing format
+    return algorithm != PASSWORD_HASH_ALGORITHM or params != current_params()
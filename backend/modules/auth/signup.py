@@ -2,7 +2,7 @@ from typing import Any, Callable, Dict, Optional
 
 from backend.errors import BusinessError
 from backend.modules.auth import check
-from backend.modules.auth.passwords import hash_password
+from backend.modules.auth.hashing_pool import hash_password
 from backend.storage.user import repo as user_repo
 
 Query = Dict[str, Any]
@@ -23,14 +23,28 @@ def _run(query: Query) -> Optional[Dict[str, Any]]:
     return _EXECUTOR(query)
 
 
-def signup(email: str, username: str, password: str) -> Dict[str, Any]:
-    if check.is_email_taken(email):
+def _raise_conflict(field: str) -> None:
+    if field == "email":
         raise BusinessError("email_taken", "email already exists")
-    if check.is_username_taken(username):
-        raise BusinessError("username_taken", "username already exists")
+    raise BusinessError("username_taken", "username already exists")
+
+
+def signup(email: str, username: str, password: str) -> Dict[str, Any]:
+    # Probe before hashing so a taken value is rejected without paying for
+    # the KDF. The insert (user_repo.create_user) still checks both values
+    # and its constraints decide races with concurrent signups.
+    taken = check.find_taken_field(email, username)
+    if taken:
+        _raise_conflict(taken)
     password_hash = hash_password(password)
     query = user_repo.create_user(email, username, password_hash)
     result = _run(query) or {}
+    if result.get("conflict"):
+        _raise_conflict(result["conflict"])
+    if result.get("id") is None:
+        # A concurrent signup took a value between the check and the
+        # insert; only then pay for a probe to name the conflict.
+        _raise_conflict("email" if check.is_email_taken(email) else "username")
     return {
         "id": result.get("id"),
         "email": email,
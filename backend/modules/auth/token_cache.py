@@ -0,0 +1,78 @@
+"""
+Bounded cache of verified JWTs for require_user.
+
+Authenticated requests (auto-saves, lock heartbeats, polling) re-send the
+same token many times a minute. A token that verified once maps to the same
+{email, username} until it expires, so the claims are remembered by SHA-256
+of the token for at most JWT_CACHE_SECONDS and never past the token's own
+'exp'. Invalid tokens are never cached, and the least recently used entry
+is evicted beyond JWT_CACHE_MAX_ENTRIES.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from backend.config import JWT_CACHE_MAX_ENTRIES, JWT_CACHE_SECONDS
+from backend.modules.auth.jwt import decode_token_with_expiry
+
+Claims = Dict[str, str]
+
+_LOCK = threading.Lock()
+_ENTRIES: "OrderedDict[str, Tuple[float, Claims]]" = OrderedDict()
+_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+
+def _key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def verify_token(token: str) -> Claims:
+    """
+    Return the {email, username} of a valid token, decoding it only on a miss.
+
+    Raises:
+        BusinessError: unauthorized if the token is invalid or expired
+    """
+    key = _key(token)
+    now = time.time()
+    with _LOCK:
+        entry = _ENTRIES.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _ENTRIES.move_to_end(key)
+                _STATS["hits"] += 1
+                return dict(entry[1])
+            del _ENTRIES[key]
+            _STATS["expired"] += 1
+        _STATS["misses"] += 1
+
+    claims, expires_at = decode_token_with_expiry(token)
+    if JWT_CACHE_SECONDS > 0:
+        with _LOCK:
+            _ENTRIES[key] = (min(expires_at, now + JWT_CACHE_SECONDS), claims)
+            _ENTRIES.move_to_end(key)
+            while len(_ENTRIES) > JWT_CACHE_MAX_ENTRIES:
+                _ENTRIES.popitem(last=False)
+                _STATS["evictions"] += 1
+    return dict(claims)
+
+
+def get_stats() -> Dict[str, float]:
+    """Return counters since process start, current size and hit rate."""
+    with _LOCK:
+        stats: Dict[str, float] = dict(_STATS)
+        stats["size"] = len(_ENTRIES)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def clear() -> None:
+    """Empty the cache and reset its counters."""
+    with _LOCK:
+        _ENTRIES.clear()
+        for name in _STATS:
+            _STATS[name] = 0
@@ -1,12 +1,14 @@
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from backend.modules.work import manager as work_manager
 from backend.storage.conversation import repo as conversation_repo
 
 Query = Dict[str, Any]
 QueryExecutor = Callable[[Query], Any]
+AsyncQueryExecutor = Callable[[Query], Awaitable[Any]]
 
 _EXECUTOR: Optional[QueryExecutor] = None
+_ASYNC_EXECUTOR: Optional[AsyncQueryExecutor] = None
 
 
 def set_query_executor(executor: QueryExecutor) -> None:
@@ -15,6 +17,18 @@ def set_query_executor(executor: QueryExecutor) -> None:
     _EXECUTOR = executor
 
 
+def set_async_query_executor(executor: AsyncQueryExecutor) -> None:
+    """Configure the async storage executor used by Conversation reads."""
+    global _ASYNC_EXECUTOR
+    _ASYNC_EXECUTOR = executor
+
+
+async def _run_async(query: Query) -> Any:
+    if _ASYNC_EXECUTOR is None:
+        return None
+    return await _ASYNC_EXECUTOR(query)
+
+
 def _run(query: Query) -> Any:
     if _EXECUTOR is None:
         return None
@@ -22,13 +36,19 @@ def _run(query: Query) -> Any:
 
 
 def add_comment(work_id: str, user_email: str, content: str) -> Optional[str]:
-    _ = work_manager.get_work(work_id, user_email)
+    work_manager.verify_work_owner(work_id, user_email)
     query = conversation_repo.create_comment(work_id, user_email, content)
     result = _run(query) or {}
     return result.get("id")
 
 
 def list_comments(work_id: str, user_email: str) -> Any:
-    _ = work_manager.get_work(work_id, user_email)
+    work_manager.verify_work_owner(work_id, user_email)
     query = conversation_repo.list_comments(work_id, user_email)
     return _run(query) or []
+
+
+async def list_comments_async(work_id: str, user_email: str) -> Any:
+    await work_manager.verify_work_owner_async(work_id, user_email)
+    query = conversation_repo.list_comments(work_id, user_email)
+    return await _run_async(query) or []
@@ -5,10 +5,13 @@ Uses OpenAI API to generate structured feedback on essays.
 """
 
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from backend.config import CLAUDE_MODEL, LLM_MODEL
 from backend.errors import BusinessError
+from backend.modules.llm_gateway import cache as llm_cache
 from backend.modules.llm_gateway import client, prompts
+from backend.modules.llm_gateway.stream_parser import AnalysisStreamParser
 
 
 def generate_analysis(
@@ -20,10 +23,14 @@ def generate_analysis(
     user_actions: Optional[Dict[str, Dict[str, Any]]] = None,
     user_reflection: Optional[str] = None,
     essay_prompt: Optional[str] = None,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     """
     Generate AI analysis for an essay submission.
 
+    Responses are reused from the LLM cache when the fully built prompt and
+    model match an earlier validated call; pass use_cache=False to bypass it.
+
     Args:
         work_id: Work ID (for logging)
         current_text: Current essay content
@@ -33,6 +40,7 @@ def generate_analysis(
         user_actions: User's actions on previous suggestions (None for first submission)
         user_reflection: User's reflection on FAO comment (optional)
         essay_prompt: Essay prompt/requirements provided by user (optional)
+        use_cache: Read and write the LLM response cache (default True)
 
     Returns:
         Dict with:
@@ -43,6 +51,128 @@ def generate_analysis(
     Raises:
         BusinessError: If LLM API fails or response is invalid
     """
+    prompt, rubric, is_first_submission = _prepare_prompt(
+        work_id=work_id,
+        current_text=current_text,
+        current_version=current_version,
+        previous_text=previous_text,
+        previous_analysis=previous_analysis,
+        user_actions=user_actions,
+        user_reflection=user_reflection,
+        essay_prompt=essay_prompt,
+        use_cache=use_cache,
+    )
+
+    # Call LLM API with JSON mode (unless an identical prompt was answered before)
+    cached_response = llm_cache.get("analysis", LLM_MODEL, prompt, bypass=not use_cache)
+    if cached_response is not None:
+        print(f"[ANALYZER] Analysis cache hit for work {work_id}")
+        llm_response = cached_response
+    else:
+        try:
+            llm_response = client.generate_structured_response(prompt)
+        except Exception as e:
+            print(f"[ANALYZER ERROR] LLM API call failed: {e}")
+            raise BusinessError("llm_failed", f"Failed to generate analysis: {str(e)}") from e
+
+    # Parse and validate response
+    try:
+        analysis = _parse_and_validate_response(llm_response, is_first_submission, user_reflection, bool(rubric))
+    except Exception as e:
+        print(f"[ANALYZER ERROR] Response parsing failed: {e}")
+        print(f"[ANALYZER ERROR] Raw response: {llm_response[:500]}")
+        raise BusinessError("llm_failed", f"Invalid LLM response format: {str(e)}") from e
+
+    # Only validated responses are cached
+    if cached_response is None:
+        llm_cache.put("analysis", LLM_MODEL, prompt, llm_response, bypass=not use_cache)
+
+    return _finish_analysis(work_id, analysis, rubric)
+
+
+def stream_analysis(
+    work_id: str,
+    current_text: str,
+    current_version: int,
+    previous_text: Optional[str] = None,
+    previous_analysis: Optional[Dict[str, Any]] = None,
+    user_actions: Optional[Dict[str, Dict[str, Any]]] = None,
+    user_reflection: Optional[str] = None,
+    essay_prompt: Optional[str] = None,
+    use_cache: bool = True,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming variant of generate_analysis.
+
+    Takes the same arguments and yields (event, data) pairs:
+    - ("fao_delta", {"text": str}) while the FAO comment is generated
+    - ("sentence_comment", comment) as soon as each element of the
+      sentence_comments array closes and validates; invalid elements are
+      skipped rather than failing the whole analysis
+    - ("analysis", analysis) once, last, with the same dict
+      generate_analysis returns
+
+    Raises:
+        BusinessError: If LLM API fails or response is invalid
+    """
+    prompt, rubric, is_first_submission = _prepare_prompt(
+        work_id=work_id,
+        current_text=current_text,
+        current_version=current_version,
+        previous_text=previous_text,
+        previous_analysis=previous_analysis,
+        user_actions=user_actions,
+        user_reflection=user_reflection,
+        essay_prompt=essay_prompt,
+        use_cache=use_cache,
+    )
+
+    cached_response = llm_cache.get("analysis", LLM_MODEL, prompt, bypass=not use_cache)
+    if cached_response is not None:
+        print(f"[ANALYZER] Analysis cache hit for work {work_id}")
+        chunks: Iterable[str] = [cached_response]
+    else:
+        chunks = client.stream_structured_response(prompt)
+
+    # Comments are validated and yielded as each element closes
+    parser = _new_parser(is_first_submission)
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        yield from parser.feed(chunk)
+
+    try:
+        analysis = _build_result(parser.close(), is_first_submission, user_reflection, bool(rubric))
+    except Exception as e:
+        print(f"[ANALYZER ERROR] Response parsing failed: {e}")
+        print(f"[ANALYZER ERROR] Raw response: {buffer[:500]}")
+        raise BusinessError("llm_failed", f"Invalid LLM response format: {str(e)}") from e
+
+    # Partial results are served but never cached, so a replay (streamed or
+    # not) always sees a response that parsed completely.
+    if cached_response is None and parser.complete and not parser.rejected:
+        llm_cache.put("analysis", LLM_MODEL, prompt, buffer, bypass=not use_cache)
+
+    yield "analysis", _finish_analysis(work_id, analysis, rubric)
+
+
+def _prepare_prompt(
+    work_id: str,
+    current_text: str,
+    current_version: int,
+    previous_text: Optional[str],
+    previous_analysis: Optional[Dict[str, Any]],
+    user_actions: Optional[Dict[str, Dict[str, Any]]],
+    user_reflection: Optional[str],
+    essay_prompt: Optional[str],
+    use_cache: bool,
+) -> Tuple[str, Optional[Dict[str, Any]], bool]:
+    """
+    Build the analysis prompt, generating the rubric on first submission.
+
+    Returns:
+        (prompt, rubric or None, is_first_submission)
+    """
     is_first_submission = previous_text is None
 
     # Get or generate rubric
@@ -54,7 +184,14 @@ def generate_analysis(
         # STEP 1: Generate rubric using Claude (with fallback)
         try:
             rubric_prompt = prompts.build_rubric_generation_prompt(current_text, essay_prompt)
-            rubric_json = client.generate_rubric(rubric_prompt)
+            cached_rubric = llm_cache.get(
+                "rubric", CLAUDE_MODEL, rubric_prompt, bypass=not use_cache
+            )
+            if cached_rubric is not None:
+                print(f"[ANALYZER] Rubric cache hit")
+                rubric_json = cached_rubric
+            else:
+                rubric_json = client.generate_rubric(rubric_prompt)
 
             # Clean potential markdown wrapper from Claude response
             rubric_json = rubric_json.strip()
@@ -70,6 +207,10 @@ def generate_analysis(
                 print(f"[ANALYZER] Extracted JSON from markdown wrapper")
 
             rubric = json.loads(rubric_json)
+            if cached_rubric is None:
+                llm_cache.put(
+                    "rubric", CLAUDE_MODEL, rubric_prompt, rubric_json, bypass=not use_cache
+                )
             print(f"[ANALYZER] Rubric generated successfully with {len(rubric.get('dimensions', []))} dimensions")
         except BusinessError as e:
             if "claude_timeout" in str(e):
@@ -117,27 +258,18 @@ def generate_analysis(
             rubric=rubric,
         )
 
-    # Call LLM API with JSON mode
-    try:
-        llm_response = client.generate_structured_response(prompt)
-    except Exception as e:
-        print(f"[ANALYZER ERROR] LLM API call failed: {e}")
-        raise BusinessError("llm_failed", f"Failed to generate analysis: {str(e)}") from e
+    return prompt, rubric, is_first_submission
 
-    # Parse and validate response
-    try:
-        analysis = _parse_and_validate_response(llm_response, is_first_submission, user_reflection, bool(rubric))
-    except Exception as e:
-        print(f"[ANALYZER ERROR] Response parsing failed: {e}")
-        print(f"[ANALYZER ERROR] Raw response: {llm_response[:500]}")
-        raise BusinessError("llm_failed", f"Invalid LLM response format: {str(e)}") from e
 
+def _finish_analysis(
+    work_id: str, analysis: Dict[str, Any], rubric: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
     # Attach rubric to analysis (for first submission or from previous)
     if rubric:
         analysis["rubric"] = rubric
         print(f"[ANALYZER] Analysis includes rubric with {len(rubric.get('dimensions', []))} dimensions")
 
-    print(f"[ANALYZER] Analysis generated successfully: {len(analysis.get('sentence_comments', []))} comments")
+    print(f"[ANALYZER] Analysis generated for work {work_id}: {len(analysis.get('sentence_comments', []))} comments")
     return analysis
 
 
@@ -150,6 +282,10 @@ def _parse_and_validate_response(
     """
     Parse LLM response and validate structure.
 
+    Unlike the streaming path, a complete response is available here, so
+    truncated JSON or any invalid sentence comment fails the whole call
+    instead of silently returning (and caching) a partial analysis.
+
     Args:
         response: JSON string from LLM
         is_first_submission: Whether this is first submission
@@ -161,26 +297,35 @@ def _parse_and_validate_response(
     Raises:
         ValueError: If response format is invalid
     """
-    # Parse JSON
-    try:
-        data = json.loads(response)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Response is not valid JSON: {e}") from e
+    parser = _new_parser(is_first_submission)
+    parser.feed(response)
+    data = parser.close()
+    if not parser.complete:
+        raise ValueError("Response JSON is truncated")
+    if parser.rejected:
+        index, reason = parser.rejected[0]
+        raise ValueError(f"Invalid sentence comment {index}: {reason}")
+    return _build_result(data, is_first_submission, user_reflection_provided, has_rubric)
 
-    # Validate required fields
-    if "fao_comment" not in data:
-        raise ValueError("Missing required field: fao_comment")
 
-    if "sentence_comments" not in data:
-        raise ValueError("Missing required field: sentence_comments")
+def _new_parser(is_first_submission: bool) -> AnalysisStreamParser:
+    return AnalysisStreamParser(
+        lambda comment, index: _validate_sentence_comment(comment, index, is_first_submission)
+    )
 
-    if not isinstance(data["sentence_comments"], list):
-        raise ValueError("sentence_comments must be a list")
 
-    # Validate sentence comments structure
-    for idx, comment in enumerate(data["sentence_comments"]):
-        _validate_sentence_comment(comment, idx, is_first_submission)
+def _build_result(
+    data: Dict[str, Any],
+    is_first_submission: bool,
+    user_reflection_provided: bool,
+    has_rubric: bool,
+) -> Dict[str, Any]:
+    """
+    Validate the non-comment fields of a parsed response and build the result.
 
+    Raises:
+        ValueError: If rubric_evaluation is malformed
+    """
     # Validate rubric_evaluation if present
     if has_rubric and "rubric_evaluation" in data:
         if not isinstance(data["rubric_evaluation"], dict):
@@ -0,0 +1,181 @@
+"""
+Content-addressed cache for LLM responses.
+
+Entries are keyed by a SHA-256 of the response kind, model name and the
+fully built prompt, so an unchanged resubmission (or a retried submit)
+reuses the earlier result instead of paying provider latency again.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import redis
+
+from backend.config import (
+    LLM_CACHE_BACKEND,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+)
+from backend.storage import redis_client
+
+
+class InMemoryLRUCache:
+    """Process-local LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class RedisCache:
+    """
+    Redis cache shared across processes, bounded by an LRU index.
+
+    Entries expire by TTL on their own, so a second sorted set scored by
+    expiry lets each write drop expired members from the LRU index before
+    counting it; otherwise dead members would fill the index and evict
+    live entries early.
+    """
+
+    _INDEX_KEY = "llm_cache:index"
+    _EXPIRY_KEY = "llm_cache:expiry"
+
+    def __init__(self, client: redis.Redis, max_entries: int = LLM_CACHE_MAX_ENTRIES) -> None:
+        self._client = client
+        self._max_entries = max_entries
+
+    @staticmethod
+    def _entry_key(key: str) -> str:
+        return f"llm_cache:{key}"
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(self._entry_key(key))
+        if value is not None:
+            self._client.zadd(self._INDEX_KEY, {key: time.time()})
+        return value
+
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        now = time.time()
+        pipe = self._client.pipeline()
+        pipe.set(self._entry_key(key), value, ex=ttl_seconds)
+        pipe.zadd(self._INDEX_KEY, {key: now})
+        pipe.zadd(self._EXPIRY_KEY, {key: now + ttl_seconds})
+        pipe.zrangebyscore(self._EXPIRY_KEY, "-inf", now)
+        expired = pipe.execute()[-1]
+        if expired:
+            pipe = self._client.pipeline()
+            pipe.zrem(self._INDEX_KEY, *expired)
+            pipe.zrem(self._EXPIRY_KEY, *expired)
+            pipe.execute()
+        overflow = self._client.zcard(self._INDEX_KEY) - self._max_entries
+        if overflow > 0:
+            evicted = [k for k, _ in self._client.zpopmin(self._INDEX_KEY, overflow)]
+            if evicted:
+                pipe = self._client.pipeline()
+                pipe.zrem(self._EXPIRY_KEY, *evicted)
+                pipe.delete(*(self._entry_key(k) for k in evicted))
+                pipe.execute()
+
+
+_BACKEND = None
+_BACKEND_LOCK = threading.Lock()
+_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "sets": 0, "errors": 0, "bypassed": 0}
+_STATS_LOCK = threading.Lock()
+
+
+def set_backend(backend) -> None:
+    """Set the cache backend for dependency injection (None resets)."""
+    global _BACKEND
+    _BACKEND = backend
+
+
+def _get_backend():
+    global _BACKEND
+    if _BACKEND is None:
+        with _BACKEND_LOCK:
+            if _BACKEND is None:
+                if LLM_CACHE_BACKEND == "redis":
+                    client = redis_client.get_client()
+                    _BACKEND = RedisCache(client)
+                else:
+                    _BACKEND = InMemoryLRUCache()
+    return _BACKEND
+
+
+def _count(name: str) -> None:
+    with _STATS_LOCK:
+        _STATS[name] += 1
+
+
+def cache_key(kind: str, model: str, prompt: str) -> str:
+    """Return the content address for a prompt sent to a model."""
+    digest = hashlib.sha256()
+    for part in (kind, model, prompt):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def enabled() -> bool:
+    """True unless LLM_CACHE_BACKEND=off (every request goes to the provider)."""
+    return LLM_CACHE_BACKEND != "off"
+
+
+def get(kind: str, model: str, prompt: str, bypass: bool = False) -> Optional[str]:
+    """Return a cached response, or None on miss, bypass or cache failure."""
+    if bypass:
+        _count("bypassed")
+        return None
+    if not enabled():
+        return None
+    try:
+        value = _get_backend().get(cache_key(kind, model, prompt))
+    except Exception as exc:
+        # The cache is an optimisation; never fail an analysis because of it.
+        print(f"[LLM CACHE] Read failed: {type(exc).__name__}: {exc}")
+        _count("errors")
+        return None
+    _count("hits" if value is not None else "misses")
+    return value
+
+
+def put(kind: str, model: str, prompt: str, value: str, bypass: bool = False) -> None:
+    """Store a validated response under its content address."""
+    if bypass or not enabled():
+        return
+    try:
+        _get_backend().set(cache_key(kind, model, prompt), value, LLM_CACHE_TTL_SECONDS)
+    except Exception as exc:
+        print(f"[LLM CACHE] Write failed: {type(exc).__name__}: {exc}")
+        _count("errors")
+        return
+    _count("sets")
+
+
+def get_stats() -> Dict[str, int]:
+    """Return hit/miss counters since process start."""
+    with _STATS_LOCK:
+        return dict(_STATS)
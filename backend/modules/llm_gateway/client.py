@@ -1,4 +1,7 @@
-from typing import Any, Dict
+import importlib.util
+import json
+import threading
+from typing import Any, Dict, Iterator, Optional
 
 import httpx
 
@@ -9,10 +12,102 @@ from backend.config import (
     CLAUDE_TIMEOUT_SECONDS,
     LLM_API_KEY,
     LLM_BASE_URL,
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
     LLM_MODEL,
     LLM_TIMEOUT_SECONDS,
 )
 from backend.errors import BusinessError
+from backend.modules.llm_gateway import resilience
+
+# Providers get one long-lived client each so back-to-back calls reuse the
+# TCP/TLS session instead of handshaking on every request.
+PROVIDER_OPENAI = "openai"
+PROVIDER_CLAUDE = "claude"
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_HTTP_CLIENTS: Dict[str, httpx.Client] = {}
+_HTTP_CLIENTS_LOCK = threading.Lock()
+
+
+def set_http_client(provider: str, http_client: Optional[httpx.Client]) -> None:
+    """Set the HTTP client used for a provider (dependency injection)."""
+    with _HTTP_CLIENTS_LOCK:
+        if http_client is None:
+            _HTTP_CLIENTS.pop(provider, None)
+        else:
+            _HTTP_CLIENTS[provider] = http_client
+
+
+def _http_client(provider: str) -> httpx.Client:
+    client = _HTTP_CLIENTS.get(provider)
+    if client is None:
+        with _HTTP_CLIENTS_LOCK:
+            client = _HTTP_CLIENTS.get(provider)
+            if client is None:
+                client = httpx.Client(
+                    http2=_HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                    ),
+                )
+                _HTTP_CLIENTS[provider] = client
+    return client
+
+
+def close_http_clients() -> None:
+    """Close every provider client; the next call lazily opens new ones."""
+    with _HTTP_CLIENTS_LOCK:
+        clients = list(_HTTP_CLIENTS.values())
+        _HTTP_CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+def _post(
+    provider: str, endpoint: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: int
+) -> httpx.Response:
+    """POST to a provider through the retry/backoff/circuit-breaker layer."""
+    return resilience.send(
+        provider,
+        lambda: _http_client(provider).post(
+            endpoint, json=payload, headers=headers, timeout=timeout
+        ),
+    )
+
+
+def _open_stream(
+    provider: str, endpoint: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: int
+) -> httpx.Response:
+    """
+    Open a streamed POST through the resilience layer.
+
+    Retries only cover opening the stream; once the body starts flowing a
+    failure surfaces to the caller. The caller must close the response.
+    """
+    http = _http_client(provider)
+    response = resilience.send(
+        provider,
+        lambda: http.send(
+            http.build_request("POST", endpoint, json=payload, headers=headers, timeout=timeout),
+            stream=True,
+        ),
+    )
+    if response.is_error:
+        response.read()
+        response.close()
+        response.raise_for_status()
+    return response
+
+
+def _iter_sse_data(response: httpx.Response) -> Iterator[str]:
+    """Yield the data field of each server-sent event."""
+    for line in response.iter_lines():
+        if line.startswith("data:"):
+            yield line[5:].strip()
 
 
 def _build_prompt(text_snapshot: str) -> str:
@@ -50,12 +145,7 @@ def generate_comment(text_snapshot: str) -> str:
     print(f"[LLM] API Key prefix: {LLM_API_KEY[:20]}...")
 
     try:
-        response = httpx.post(
-            endpoint,
-            json=payload,
-            headers=headers,
-            timeout=LLM_TIMEOUT_SECONDS
-        )
+        response = _post(PROVIDER_OPENAI, endpoint, payload, headers, LLM_TIMEOUT_SECONDS)
         print(f"[LLM] Response status: {response.status_code}")
         print(f"[LLM] Response text: {response.text[:500]}")
 
@@ -109,12 +199,7 @@ def generate_rubric(prompt: str) -> str:
     print(f"[CLAUDE] Prompt length: {len(prompt)} chars")
 
     try:
-        response = httpx.post(
-            endpoint,
-            json=payload,
-            headers=headers,
-            timeout=CLAUDE_TIMEOUT_SECONDS
-        )
+        response = _post(PROVIDER_CLAUDE, endpoint, payload, headers, CLAUDE_TIMEOUT_SECONDS)
         print(f"[CLAUDE] Response status: {response.status_code}")
 
         response.raise_for_status()
@@ -175,12 +260,7 @@ def generate_structured_response(prompt: str) -> str:
     print(f"[LLM] Prompt length: {len(prompt)} chars")
 
     try:
-        response = httpx.post(
-            endpoint,
-            json=payload,
-            headers=headers,
-            timeout=LLM_TIMEOUT_SECONDS
-        )
+        response = _post(PROVIDER_OPENAI, endpoint, payload, headers, LLM_TIMEOUT_SECONDS)
         print(f"[LLM] Response status: {response.status_code}")
 
         response.raise_for_status()
@@ -206,3 +286,62 @@ def generate_structured_response(prompt: str) -> str:
     except Exception as exc:
         print(f"[LLM ERROR] Exception: {type(exc).__name__}: {str(exc)}")
         raise BusinessError("llm_failed", f"llm request failed: {str(exc)}") from exc
+
+
+def _stream_openai(payload: Dict[str, Any], label: str) -> Iterator[str]:
+    headers = {
+        "Authorization": f"Bearer {LLM_API_KEY}",
+        "Content-Type": "application/json",
+    }
+    endpoint = _llm_endpoint()
+    print(f"[LLM] Streaming from endpoint: {endpoint} ({label})")
+
+    try:
+        response = _open_stream(
+            PROVIDER_OPENAI, endpoint, {**payload, "stream": True}, headers, LLM_TIMEOUT_SECONDS
+        )
+        try:
+            for data in _iter_sse_data(response):
+                if data == "[DONE]":
+                    return
+                choices = json.loads(data).get("choices") or []
+                if not choices:
+                    continue
+                delta = (choices[0].get("delta") or {}).get("content")
+                if isinstance(delta, str) and delta:
+                    yield delta
+        finally:
+            response.close()
+    except httpx.HTTPStatusError as exc:
+        print(f"[LLM ERROR] HTTP {exc.response.status_code}: {exc.response.text}")
+        raise BusinessError("llm_failed", f"LLM API error: {exc.response.status_code}") from exc
+    except Exception as exc:
+        print(f"[LLM ERROR] Stream exception: {type(exc).__name__}: {str(exc)}")
+        raise BusinessError("llm_failed", f"llm stream failed: {str(exc)}") from exc
+
+
+def stream_comment(text_snapshot: str) -> Iterator[str]:
+    """Streaming variant of generate_comment: yields text deltas."""
+    payload: Dict[str, Any] = {
+        "model": LLM_MODEL,
+        "messages": [{"role": "user", "content": _build_prompt(text_snapshot)}],
+    }
+    return _stream_openai(payload, "comment")
+
+
+def stream_structured_response(prompt: str) -> Iterator[str]:
+    """
+    Streaming variant of generate_structured_response.
+
+    Yields raw JSON text deltas as the model produces them; joining them
+    gives the same string generate_structured_response would return.
+
+    Raises:
+        BusinessError: If the stream cannot be opened or breaks mid-way
+    """
+    payload: Dict[str, Any] = {
+        "model": LLM_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"},
+    }
+    return _stream_openai(payload, "JSON Mode")
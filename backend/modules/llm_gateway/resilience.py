@@ -0,0 +1,229 @@
+"""
+Retry, backoff and circuit breaking for LLM provider calls.
+
+send() wraps one provider request: transient failures (429, 5xx, dropped
+connections) are retried with jittered exponential backoff that honours
+Retry-After, a per-provider retry budget caps retries to a fraction of
+traffic, and a per-provider circuit breaker fails fast while the provider
+is down instead of waiting out every timeout.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from backend.config import (
+    LLM_BREAKER_FAILURE_THRESHOLD,
+    LLM_BREAKER_RESET_SECONDS,
+    LLM_RETRY_BASE_DELAY_SECONDS,
+    LLM_RETRY_BUDGET_RATIO,
+    LLM_RETRY_MAX_ATTEMPTS,
+    LLM_RETRY_MAX_DELAY_SECONDS,
+)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Read timeouts are not retried: the caller already waited the full timeout.
+RETRYABLE_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.RemoteProtocolError,
+)
+
+_sleep = time.sleep
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while its breaker is open."""
+
+
+class CircuitBreaker:
+    """Open after consecutive failures; allow one probe after the reset timeout."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = LLM_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = LLM_BREAKER_RESET_SECONDS,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self._reset_seconds:
+                    return False
+                # Let a single probe through; others keep failing fast.
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """
+    Token bucket allowing retries for roughly ``ratio`` of requests.
+
+    Each request deposits ``ratio`` tokens and each retry withdraws one, so
+    during an outage retries cannot multiply provider load.
+    """
+
+    def __init__(self, ratio: float = LLM_RETRY_BUDGET_RATIO, max_tokens: float = 10.0) -> None:
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BUDGETS: Dict[str, RetryBudget] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _breaker(provider: str) -> CircuitBreaker:
+    with _REGISTRY_LOCK:
+        return _BREAKERS.setdefault(provider, CircuitBreaker())
+
+
+def _budget(provider: str) -> RetryBudget:
+    with _REGISTRY_LOCK:
+        return _BUDGETS.setdefault(provider, RetryBudget())
+
+
+def reset(provider: Optional[str] = None) -> None:
+    """Forget breaker and budget state (all providers when None)."""
+    with _REGISTRY_LOCK:
+        if provider is None:
+            _BREAKERS.clear()
+            _BUDGETS.clear()
+        else:
+            _BREAKERS.pop(provider, None)
+            _BUDGETS.pop(provider, None)
+
+
+def get_breaker_states() -> Dict[str, str]:
+    """Return the circuit state of every provider seen so far."""
+    with _REGISTRY_LOCK:
+        breakers = dict(_BREAKERS)
+    return {name: breaker.state for name, breaker in breakers.items()}
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_seconds(attempt: int) -> float:
+    ceiling = min(LLM_RETRY_MAX_DELAY_SECONDS, LLM_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)  # full jitter
+
+
+def send(provider: str, request: Callable[[], httpx.Response]) -> httpx.Response:
+    """
+    Run ``request`` with retries under the provider's breaker and budget.
+
+    Returns the last response (which may still carry an error status for
+    the caller's raise_for_status) or re-raises the last transport error.
+
+    Raises:
+        CircuitOpenError: If the provider's breaker is open
+    """
+    breaker = _breaker(provider)
+    budget = _budget(provider)
+    budget.deposit()
+
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"{provider} circuit open; failing fast")
+
+        delay: Optional[float] = None
+        try:
+            response = request()
+        except httpx.TimeoutException:
+            breaker.record_failure()
+            raise
+        except RETRYABLE_EXCEPTIONS as exc:
+            breaker.record_failure()
+            if not _may_retry(provider, attempt, budget):
+                raise
+            print(f"[LLM RETRY] {provider} {type(exc).__name__}, attempt {attempt + 1}")
+        except BaseException:
+            # Any other error still settles the call; a half-open probe
+            # left unrecorded would keep the breaker failing fast forever.
+            breaker.record_failure()
+            raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            delay = _retry_after_seconds(response)
+            if delay is not None and delay > LLM_RETRY_MAX_DELAY_SECONDS:
+                return response
+            if not _may_retry(provider, attempt, budget):
+                return response
+            print(f"[LLM RETRY] {provider} HTTP {response.status_code}, attempt {attempt + 1}")
+            response.close()  # release streamed responses before retrying
+
+        _sleep(delay if delay is not None else _backoff_seconds(attempt))
+        attempt += 1
+
+
+def _may_retry(provider: str, attempt: int, budget: RetryBudget) -> bool:
+    if attempt + 1 >= LLM_RETRY_MAX_ATTEMPTS:
+        return False
+    if not budget.withdraw():
+        print(f"[LLM RETRY] {provider} retry budget exhausted")
+        return False
+    return True
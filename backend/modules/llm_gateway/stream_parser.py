@@ -0,0 +1,209 @@
+"""
+Incremental parser for streamed analysis JSON.
+
+The analysis response is one JSON object whose ``sentence_comments`` array
+can be long. AnalysisStreamParser scans text as it arrives, relays the
+``fao_comment`` string while it is still being generated and validates each
+``sentence_comments`` element the moment its object closes, so comments
+can be shown and saved progressively and one malformed element does not
+discard the ones before it.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Event = Tuple[str, Dict[str, Any]]
+CommentValidator = Callable[[Dict[str, Any], int], None]
+
+FAO_FIELD = "fao_comment"
+COMMENTS_FIELD = "sentence_comments"
+
+# A string segment must not be decoded while it ends inside a \uXXXX escape
+# or right after the high half of a surrogate pair.
+_UNSAFE_TAIL = re.compile(r"\\u(?:[0-9a-fA-F]{0,3}|[dD][89abAB][0-9a-fA-F]{2})$")
+
+
+class AnalysisStreamParser:
+    """
+    Feed text chunks; collect top-level fields and validated comments.
+
+    feed() returns the events produced by the new text:
+    - ("fao_delta", {"text": str}) as the FAO comment grows
+    - ("sentence_comment", comment) for each element that validates
+
+    Elements that are not valid JSON objects or fail ``validate`` are
+    skipped and recorded in ``rejected`` as (index, reason).
+    """
+
+    def __init__(self, validate: CommentValidator) -> None:
+        self._validate = validate
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._awaiting_value = False
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._element_start: Optional[int] = None
+        self._element_index = 0
+        self._fao_sent = 0
+        self.fields: Dict[str, Any] = {}
+        self.sentence_comments: List[Dict[str, Any]] = []
+        self.rejected: List[Tuple[int, str]] = []
+        self.complete = False
+
+    def feed(self, chunk: str) -> List[Event]:
+        self._buffer += chunk
+        events: List[Event] = []
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer) and not self.complete:
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string(i, events)
+            elif not char.isspace():
+                self._scan(i, char, events)
+            i += 1
+        self._pos = i
+        if self._in_fao_value():
+            self._emit_fao(self._pos - 1 if self._escape else self._pos, events)
+        return events
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Return the parsed top-level fields with validated comments.
+
+        A response cut off after the FAO comment keeps everything that was
+        complete; one without a FAO comment or comments array is rejected.
+
+        Raises:
+            ValueError: If required fields are missing or malformed
+        """
+        if FAO_FIELD not in self.fields:
+            raise ValueError(f"Missing required field: {FAO_FIELD}")
+        if COMMENTS_FIELD not in self.fields:
+            raise ValueError(f"Missing required field: {COMMENTS_FIELD}")
+        if self.fields[COMMENTS_FIELD] is not True:
+            raise ValueError(f"{COMMENTS_FIELD} must be a list")
+        if self._element_index and not self.sentence_comments:
+            raise ValueError(f"No valid {COMMENTS_FIELD}: {self.rejected[0][1]}")
+        if not self.complete:
+            print(f"[STREAM PARSER] Response truncated; keeping {len(self.sentence_comments)} comments")
+        return {**self.fields, COMMENTS_FIELD: list(self.sentence_comments)}
+
+    def _scan(self, i: int, char: str, events: List[Event]) -> None:
+        depth = len(self._stack)
+        if depth == 0:
+            if char == "{":
+                self._stack.append(char)
+                self._expect_key = True
+            return
+
+        if depth == 1 and self._awaiting_value:
+            self._awaiting_value = False
+            self._value_start = i
+            if self._key == COMMENTS_FIELD:
+                # Marks the array as seen; elements are collected separately.
+                self.fields[COMMENTS_FIELD] = char == "["
+
+        if char == '"':
+            self._in_string = True
+            self._string_start = i
+        elif char in "{[":
+            if char == "{" and self._in_comments_array():
+                self._element_start = i
+            self._stack.append(char)
+        elif char in "}]":
+            self._stack.pop()
+            if char == "}" and self._element_start is not None and self._in_comments_array():
+                self._close_element(self._element_start, i, events)
+                self._element_start = None
+            if not self._stack:
+                self._end_scalar(i)
+                self.complete = True
+            elif len(self._stack) == 1 and self._value_start is not None:
+                self._end_value(i + 1)
+        elif depth == 1 and char == ":":
+            self._awaiting_value = True
+        elif depth == 1 and char == ",":
+            self._end_scalar(i)
+            self._expect_key = True
+
+    def _close_string(self, end: int, events: List[Event]) -> None:
+        if len(self._stack) != 1:
+            return
+        if self._expect_key:
+            self._key = json.loads(self._buffer[self._string_start:end + 1])
+            self._expect_key = False
+            return
+        if self._value_start == self._string_start:
+            if self._key == FAO_FIELD:
+                self._emit_fao(end, events)
+            self._end_value(end + 1)
+
+    def _end_scalar(self, end: int) -> None:
+        # Numbers, booleans and null end at the next comma or closing brace.
+        if self._value_start is not None:
+            self._end_value(end)
+
+    def _end_value(self, end: int) -> None:
+        start, self._value_start = self._value_start, None
+        if self._key is None or self._key == COMMENTS_FIELD:
+            return
+        raw = self._buffer[start:end].strip()
+        try:
+            self.fields[self._key] = json.loads(raw)
+        except ValueError:
+            print(f"[STREAM PARSER] Dropping malformed field '{self._key}'")
+
+    def _in_comments_array(self) -> bool:
+        return self._stack == ["{", "["] and self._key == COMMENTS_FIELD
+
+    def _in_fao_value(self) -> bool:
+        return (
+            self._in_string
+            and len(self._stack) == 1
+            and self._key == FAO_FIELD
+            and self._value_start == self._string_start
+        )
+
+    def _emit_fao(self, end: int, events: List[Event]) -> None:
+        start = max(self._fao_sent, self._string_start + 1)
+        segment = self._buffer[start:end]
+        while self._in_string:
+            tail = _UNSAFE_TAIL.search(segment)
+            if not tail:
+                break
+            head = segment[:tail.start()]
+            # An odd run of backslashes means the match is itself escaped.
+            if (len(head) - len(head.rstrip("\\"))) % 2:
+                break
+            segment = head
+        if segment:
+            events.append(("fao_delta", {"text": json.loads(f'"{segment}"')}))
+            self._fao_sent = start + len(segment)
+
+    def _close_element(self, start: int, end: int, events: List[Event]) -> None:
+        index = self._element_index
+        self._element_index += 1
+        try:
+            comment = json.loads(self._buffer[start:end + 1])
+            if not isinstance(comment, dict):
+                raise ValueError(f"Comment {index}: must be an object")
+            self._validate(comment, index)
+        except ValueError as exc:
+            print(f"[STREAM PARSER] Skipping sentence comment: {exc}")
+            self.rejected.append((index, str(exc)))
+            return
+        self.sentence_comments.append(comment)
+        events.append(("sentence_comment", comment))
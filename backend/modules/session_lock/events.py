@@ -0,0 +1,167 @@
+"""
+Lock-holder change notifications.
+
+The lock scripts PUBLISH the new holder on ``work_lock_events:{work_id}``
+(an empty message once released). One background thread per process
+pattern-subscribes to all of those channels and fans messages out to local
+watchers, so any number of open lock streams share a single Redis
+connection. The same subscriber tells the lock module about holder
+changes so leases end when another process releases or takes a lock.
+Watchers are asyncio queues fed from that thread, so an open
+stream costs the event loop nothing while it waits. Expiry is silent in
+Redis, so watchers also re-read the holder whenever they have been idle
+for a while.
+"""
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Dict, Optional
+
+from backend.modules.session_lock import lock as session_lock
+from backend.storage import redis_client
+
+_CHANNEL_PATTERN = "work_lock_events:*"
+_CHANNEL_PREFIX = "work_lock_events:"
+_RETRY_SECONDS = 1.0
+
+WatcherQueue = asyncio.Queue[Optional[str]]
+
+
+class LockEventHub:
+    """Fan Redis lock messages out to in-process watcher queues."""
+
+    def __init__(self, client: Any = None) -> None:
+        self._client = client
+        self._lock = threading.Lock()
+        # work_id -> {watcher queue: the event loop that owns it}
+        self._watchers: Dict[str, Dict[WatcherQueue, asyncio.AbstractEventLoop]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, work_id: str) -> WatcherQueue:
+        """Register a queue on the running event loop for a work's changes."""
+        watcher: WatcherQueue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._watchers.setdefault(work_id, {})[watcher] = loop
+        return watcher
+
+    def unwatch(self, work_id: str, watcher: WatcherQueue) -> None:
+        with self._lock:
+            watchers = self._watchers.get(work_id)
+            if watchers is not None:
+                watchers.pop(watcher, None)
+                if not watchers:
+                    del self._watchers[work_id]
+
+    def dispatch(self, channel: str, holder: str) -> None:
+        """Deliver one published message to the watchers of its work."""
+        work_id = channel[len(_CHANNEL_PREFIX):]
+        session_lock.holder_changed(work_id, holder or None)
+        with self._lock:
+            watchers = list(self._watchers.get(work_id, {}).items())
+        for watcher, loop in watchers:
+            try:
+                loop.call_soon_threadsafe(watcher.put_nowait, holder or None)
+            except RuntimeError:
+                # The watcher's loop has closed; it unwatches on its own.
+                pass
+
+    def start(self) -> None:
+        if self._thread is None and self._client is not None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._listen, name="lock-events", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(_CHANNEL_PATTERN)
+                session_lock.set_lease_guard(True)
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "pmessage":
+                        self.dispatch(message["channel"], message["data"])
+            except Exception as exc:
+                print(f"[LOCK EVENTS] Subscriber error: {type(exc).__name__}: {exc}")
+                self._stop.wait(_RETRY_SECONDS)
+            finally:
+                session_lock.set_lease_guard(False)
+                pubsub.close()
+
+
+_HUB: Optional[LockEventHub] = None
+_HUB_LOCK = threading.Lock()
+
+
+def set_hub(hub: Optional[LockEventHub]) -> None:
+    """Set the event hub for dependency injection (None resets)."""
+    global _HUB
+    _HUB = hub
+
+
+def _get_hub() -> LockEventHub:
+    global _HUB
+    if _HUB is None:
+        with _HUB_LOCK:
+            if _HUB is None:
+                hub = LockEventHub(redis_client.get_client())
+                hub.start()
+                _HUB = hub
+    return _HUB
+
+
+def start_hub() -> None:
+    """Start the subscriber so leases are trusted before the first watcher."""
+    _get_hub()
+
+
+def stop_hub() -> None:
+    """Stop the subscriber thread; the next watcher starts a new one."""
+    global _HUB
+    with _HUB_LOCK:
+        hub, _HUB = _HUB, None
+    if hub is not None:
+        hub.stop()
+
+
+async def watch_lock(
+    work_id: str, idle_seconds: float = 15.0, max_seconds: float = 300.0
+) -> AsyncIterator[Optional[str]]:
+    """
+    Yield the current lock holder, then every change until ``max_seconds``.
+
+    ``None`` means nobody holds the lock. Streams end after ``max_seconds``
+    so clients reconnect and load balancers can rebalance connections.
+    """
+    hub = _get_hub()
+    watcher = hub.watch(work_id)
+    loop = asyncio.get_running_loop()
+    try:
+        holder = await asyncio.to_thread(session_lock.get_lock_holder, work_id)
+        yield holder
+        deadline = loop.time() + max_seconds
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                latest = await asyncio.wait_for(
+                    watcher.get(), timeout=min(idle_seconds, remaining)
+                )
+            except asyncio.TimeoutError:
+                latest = await asyncio.to_thread(session_lock.get_lock_holder, work_id)
+            if latest != holder:
+                holder = latest
+                yield holder
+    finally:
+        hub.unwatch(work_id, watcher)
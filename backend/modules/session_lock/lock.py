@@ -1,55 +1,174 @@
-from typing import Optional
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
 import redis
 
-from backend.config import REDIS_URL, WORK_LOCK_EXPIRE_SECONDS
+from backend.config import WORK_LOCK_EXPIRE_SECONDS, WORK_LOCK_LEASE_SECONDS
+from backend.storage import redis_client
 
 _CLIENT: Optional[redis.Redis] = None
+_SCRIPTS: Dict[str, Any] = {}
+
+# work_id -> (device_id, monotonic deadline) of locks this process has just
+# acquired or refreshed; see hold_lock.
+_LEASES: Dict[str, Tuple[str, float]] = {}
+_LEASES_LOCK = threading.Lock()
+# Set while this process is subscribed to lock events (see events), which
+# is what lets it drop leases when another process changes the holder.
+_LEASE_GUARD = threading.Event()
+
+# Each operation is one server-side script so the holder check and the
+# write happen atomically in a single round-trip. Holder changes are
+# published on the work's channel (see events).
+# KEYS[1] = lock key, ARGV[1] = device_id, ARGV[2] = expire seconds,
+# ARGV[3] = channel.
+_ACQUIRE_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    redis.call('PUBLISH', ARGV[3], ARGV[1])
+    return 1
+end
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+_REFRESH_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# ARGV[2] = channel; an empty message means the lock is free.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('PUBLISH', ARGV[2], '')
+    return 1
+end
+return 0
+"""
 
 
 def set_client(client: redis.Redis) -> None:
     """Set a Redis client for dependency injection."""
     global _CLIENT
     _CLIENT = client
+    _SCRIPTS.clear()
 
 
 def _get_client() -> redis.Redis:
     if _CLIENT is None:
-        return redis.Redis.from_url(REDIS_URL, decode_responses=True)
+        return redis_client.get_client()
     return _CLIENT
 
 
+def _run_script(source: str, work_id: str, *args: Any) -> bool:
+    # register_script caches the SHA; calls use EVALSHA and fall back to
+    # EVAL once if the server does not have the script loaded yet.
+    client = _get_client()
+    script = _SCRIPTS.get(source)
+    if script is None or script.registered_client is not client:
+        script = client.register_script(source)
+        _SCRIPTS[source] = script
+    return bool(script(keys=[_key(work_id)], args=list(args)))
+
+
 def _key(work_id: str) -> str:
     return f"work_lock:{work_id}"
 
 
+def channel(work_id: str) -> str:
+    """Pub/sub channel carrying the new holder whenever a work's lock changes."""
+    return f"work_lock_events:{work_id}"
+
+
+def _remember_lease(work_id: str, device_id: str, started: float) -> None:
+    # Measured from before the Redis call, and never longer than the key's
+    # own expiry, so the lease always ends before the lock can.
+    lease = min(WORK_LOCK_LEASE_SECONDS, WORK_LOCK_EXPIRE_SECONDS)
+    with _LEASES_LOCK:
+        _LEASES[work_id] = (device_id, started + lease)
+
+
+def _forget_lease(work_id: str) -> None:
+    with _LEASES_LOCK:
+        _LEASES.pop(work_id, None)
+
+
+def _has_lease(work_id: str, device_id: str) -> bool:
+    if not _LEASE_GUARD.is_set():
+        return False
+    with _LEASES_LOCK:
+        lease = _LEASES.get(work_id)
+    return lease is not None and lease[0] == device_id and time.monotonic() < lease[1]
+
+
+def set_lease_guard(active: bool) -> None:
+    """
+    Record whether lock events reach this process.
+
+    Leases are only trusted while they do. Losing the subscription drops
+    every lease, since holder changes may have been missed meanwhile.
+    """
+    if active:
+        _LEASE_GUARD.set()
+        return
+    _LEASE_GUARD.clear()
+    with _LEASES_LOCK:
+        _LEASES.clear()
+
+
+def holder_changed(work_id: str, holder: Optional[str]) -> None:
+    """Drop this process's lease when any process hands the lock elsewhere."""
+    with _LEASES_LOCK:
+        lease = _LEASES.get(work_id)
+        if lease is not None and lease[0] != holder:
+            del _LEASES[work_id]
+
+
 def acquire_lock(work_id: str, device_id: str) -> bool:
-    client = _get_client()
-    key = _key(work_id)
-    acquired = client.set(key, device_id, nx=True, ex=WORK_LOCK_EXPIRE_SECONDS)
+    started = time.monotonic()
+    acquired = _run_script(
+        _ACQUIRE_SCRIPT, work_id, device_id, WORK_LOCK_EXPIRE_SECONDS, channel(work_id)
+    )
     if acquired:
-        return True
-    holder = client.get(key)
-    if holder == device_id:
-        client.expire(key, WORK_LOCK_EXPIRE_SECONDS)
-        return True
-    return False
+        _remember_lease(work_id, device_id, started)
+    return acquired
 
 
 def refresh_lock(work_id: str, device_id: str) -> bool:
-    client = _get_client()
-    key = _key(work_id)
-    if client.get(key) != device_id:
-        return False
-    return bool(client.expire(key, WORK_LOCK_EXPIRE_SECONDS))
+    started = time.monotonic()
+    refreshed = _run_script(_REFRESH_SCRIPT, work_id, device_id, WORK_LOCK_EXPIRE_SECONDS)
+    if refreshed:
+        _remember_lease(work_id, device_id, started)
+    else:
+        _forget_lease(work_id)
+    return refreshed
 
 
 def release_lock(work_id: str, device_id: str) -> bool:
-    client = _get_client()
-    key = _key(work_id)
-    if client.get(key) != device_id:
-        return False
-    return bool(client.delete(key))
+    _forget_lease(work_id)
+    return _run_script(_RELEASE_SCRIPT, work_id, device_id, channel(work_id))
+
+
+def hold_lock(work_id: str, device_id: str) -> bool:
+    """
+    Acquire or renew the lock, skipping Redis while a recent lease is held.
+
+    After a successful acquire or refresh this process trusts the lock for
+    WORK_LOCK_LEASE_SECONDS without asking Redis again. The key itself
+    lives WORK_LOCK_EXPIRE_SECONDS, so no other device can take it during
+    the lease unless this device releases it from another process; that
+    release is published, and the lock-events subscriber drops the lease.
+    Without a live subscriber no lease is trusted.
+    """
+    if _has_lease(work_id, device_id):
+        return True
+    return acquire_lock(work_id, device_id)
 
 
 def get_lock_holder(work_id: str) -> Optional[str]:
@@ -0,0 +1,305 @@
+"""
+Write-behind buffer for auto-saves.
+
+Auto-saves only keep the latest content of a work, so they are buffered
+per work and written to Postgres once typing pauses for
+AUTOSAVE_DEBOUNCE_SECONDS, or at most AUTOSAVE_MAX_DELAY_SECONDS after the
+first buffered save. Explicit drafts, submissions and lock releases
+discard or flush the buffer first, so they are always durable.
+
+Each entry records the work's current_version when it was buffered and is
+only written while that still holds; a draft or submission saved in the
+meantime therefore never gets overwritten by older buffered content.
+Entries live in Redis (shared across processes) or in process memory.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import redis
+
+from backend.config import (
+    AUTOSAVE_BUFFER_BACKEND,
+    AUTOSAVE_DEBOUNCE_SECONDS,
+    AUTOSAVE_MAX_DELAY_SECONDS,
+)
+from backend.modules.work.utils import count_words
+from backend.storage import redis_client
+from backend.storage.work import repo as work_repo
+
+Entry = Dict[str, Any]
+Query = Dict[str, Any]
+QueryExecutor = Callable[[Query], Any]
+
+BACKEND_OFF = "off"
+_POLL_SECONDS = 0.5
+
+
+class InMemoryAutosaveBuffer:
+    """Process-local buffer for tests and single-process deployments."""
+
+    def __init__(
+        self,
+        debounce_seconds: float = AUTOSAVE_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = AUTOSAVE_MAX_DELAY_SECONDS,
+    ) -> None:
+        self._debounce = debounce_seconds
+        self._max_delay = max_delay_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Entry] = {}
+        self._due: Dict[str, float] = {}
+
+    def put(self, entry: Entry, now: float) -> None:
+        with self._lock:
+            previous = self._entries.get(entry["work_id"]) or {}
+            merged = {**previous, **{k: v for k, v in entry.items() if v is not None}}
+            merged.setdefault("first_at", now)
+            merged["last_at"] = now
+            self._entries[entry["work_id"]] = merged
+            self._due[entry["work_id"]] = min(
+                merged["first_at"] + self._max_delay, now + self._debounce
+            )
+
+    def get(self, work_id: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(work_id)
+            return dict(entry) if entry else None
+
+    def take(self, work_id: str) -> Optional[Entry]:
+        with self._lock:
+            self._due.pop(work_id, None)
+            return self._entries.pop(work_id, None)
+
+    def claim_due(self, now: float) -> List[str]:
+        with self._lock:
+            due = [work_id for work_id, due_at in self._due.items() if due_at <= now]
+            for work_id in due:
+                del self._due[work_id]
+            return due
+
+
+class RedisAutosaveBuffer:
+    """Redis buffer shared by every app process."""
+
+    _DUE_KEY = "autosave:due"
+    # Safety net if no process is left to flush an entry.
+    _ENTRY_TTL_SECONDS = 86400
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        debounce_seconds: float = AUTOSAVE_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = AUTOSAVE_MAX_DELAY_SECONDS,
+    ) -> None:
+        self._client = client
+        self._debounce = debounce_seconds
+        self._max_delay = max_delay_seconds
+
+    @staticmethod
+    def _key(work_id: str) -> str:
+        return f"autosave:{work_id}"
+
+    def put(self, entry: Entry, now: float) -> None:
+        key = self._key(entry["work_id"])
+        fields = {k: v for k, v in entry.items() if v is not None}
+        fields["last_at"] = now
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hsetnx(key, "first_at", now)
+        pipe.hset(key, mapping=fields)
+        pipe.hget(key, "first_at")
+        pipe.expire(key, self._ENTRY_TTL_SECONDS)
+        first_at = float(pipe.execute()[2])
+        due_at = min(first_at + self._max_delay, now + self._debounce)
+        self._client.zadd(self._DUE_KEY, {entry["work_id"]: due_at})
+
+    def get(self, work_id: str) -> Optional[Entry]:
+        return self._decode(self._client.hgetall(self._key(work_id)))
+
+    def take(self, work_id: str) -> Optional[Entry]:
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hgetall(self._key(work_id))
+        pipe.delete(self._key(work_id))
+        pipe.zrem(self._DUE_KEY, work_id)
+        return self._decode(pipe.execute()[0])
+
+    def claim_due(self, now: float) -> List[str]:
+        due = self._client.zrangebyscore(self._DUE_KEY, "-inf", now)
+        # Only the process whose ZREM succeeds flushes the entry.
+        return [work_id for work_id in due if self._client.zrem(self._DUE_KEY, work_id)]
+
+    @staticmethod
+    def _decode(raw: Dict[str, str]) -> Optional[Entry]:
+        if not raw:
+            return None
+        entry: Entry = dict(raw)
+        entry["base_version"] = int(raw.get("base_version") or 0)
+        for field in ("first_at", "last_at"):
+            if field in raw:
+                entry[field] = float(raw[field])
+        return entry
+
+
+_BACKEND: Optional[Any] = None
+_EXECUTOR: Optional[QueryExecutor] = None
+_FLUSHER: Optional[threading.Thread] = None
+_STOP = threading.Event()
+
+
+def set_backend(backend: Optional[Any]) -> None:
+    """Set the buffer backend for dependency injection."""
+    global _BACKEND
+    _BACKEND = backend
+
+
+def set_query_executor(executor: Optional[QueryExecutor]) -> None:
+    """Configure the storage executor used to write buffered content."""
+    global _EXECUTOR
+    _EXECUTOR = executor
+
+
+def _get_backend() -> Optional[Any]:
+    global _BACKEND
+    if _BACKEND is None and AUTOSAVE_BUFFER_BACKEND != BACKEND_OFF:
+        if AUTOSAVE_BUFFER_BACKEND == "memory":
+            _BACKEND = InMemoryAutosaveBuffer()
+        else:
+            client = redis_client.get_client()
+            _BACKEND = RedisAutosaveBuffer(client)
+    return _BACKEND
+
+
+def enabled() -> bool:
+    """True unless AUTOSAVE_BUFFER_BACKEND=off (auto-saves write through)."""
+    return _get_backend() is not None
+
+
+def buffer(
+    work_id: str,
+    user_email: str,
+    content: str,
+    base_version: int,
+    essay_prompt: Optional[str] = None,
+    word_count: Optional[int] = None,
+) -> None:
+    """Buffer the latest auto-saved content of a work.
+
+    ``word_count`` may be passed when the caller already knows it;
+    otherwise it is counted when the entry is written.
+    """
+    _get_backend().put(
+        {
+            "work_id": work_id,
+            "user_email": user_email,
+            "content": content,
+            "base_version": base_version,
+            "essay_prompt": essay_prompt,
+            # An empty string clears a count left by an earlier save.
+            "word_count": "" if word_count is None else word_count,
+        },
+        time.time(),
+    )
+
+
+def pending(work_id: str) -> Optional[Entry]:
+    """Return the buffered entry for a work, if any."""
+    backend = _get_backend()
+    return backend.get(work_id) if backend else None
+
+
+def apply_pending(work: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay buffered content on a works row so reads see the latest save."""
+    entry = pending(str(work.get("id")))
+    if not entry or entry["base_version"] != (work.get("current_version") or 0):
+        return work
+    overlaid = {**work, "content": entry["content"], "word_count": _word_count(entry)}
+    if entry.get("essay_prompt") is not None:
+        overlaid["essay_prompt"] = entry["essay_prompt"]
+    return overlaid
+
+
+def discard(work_id: str) -> None:
+    """Drop buffered content that an explicit save is about to supersede."""
+    backend = _get_backend()
+    if backend:
+        backend.take(work_id)
+
+
+def flush(work_id: str) -> bool:
+    """Write a work's buffered content now. Returns False if none was buffered."""
+    backend = _get_backend()
+    entry = backend.take(work_id) if backend else None
+    if entry is None:
+        return False
+    _write(backend, entry)
+    return True
+
+
+def flush_due(now: Optional[float] = None) -> int:
+    """Write every entry whose debounce has elapsed. Returns the number written."""
+    backend = _get_backend()
+    if backend is None:
+        return 0
+    flushed = 0
+    for work_id in backend.claim_due(time.time() if now is None else now):
+        if flush(work_id):
+            flushed += 1
+    return flushed
+
+
+def _word_count(entry: Entry) -> int:
+    if entry.get("word_count") in (None, ""):
+        return count_words(entry["content"])
+    return int(entry["word_count"])
+
+
+def _write(backend: Any, entry: Entry) -> None:
+    if _EXECUTOR is None:
+        raise RuntimeError("autosave query executor not configured")
+    query = work_repo.update_work_content_at_version(
+        entry["work_id"],
+        entry["user_email"],
+        entry["content"],
+        _word_count(entry),
+        entry["base_version"],
+        entry.get("essay_prompt"),
+    )
+    try:
+        _EXECUTOR(query)
+    except Exception:
+        # Keep the content for the next flush unless newer content arrived.
+        if backend.get(entry["work_id"]) is None:
+            backend.put(entry, entry.get("first_at") or time.time())
+        raise
+
+
+def _flusher_loop() -> None:
+    while not _STOP.is_set():
+        try:
+            flush_due()
+        except Exception as exc:
+            print(f"[AUTOSAVE] Flush error: {type(exc).__name__}: {exc}")
+        _STOP.wait(_POLL_SECONDS)
+
+
+def start_flusher() -> None:
+    """Start the background flush thread (no-op if running or disabled)."""
+    global _FLUSHER
+    if _FLUSHER is not None or not enabled():
+        return
+    _STOP.clear()
+    _FLUSHER = threading.Thread(target=_flusher_loop, name="autosave-flusher", daemon=True)
+    _FLUSHER.start()
+
+
+def stop_flusher(timeout: float = 5.0) -> None:
+    """Stop the flush thread and write everything still buffered."""
+    global _FLUSHER
+    _STOP.set()
+    if _FLUSHER is not None:
+        _FLUSHER.join(timeout)
+        _FLUSHER = None
+    try:
+        flush_due(now=float("inf"))
+    except Exception as exc:
+        print(f"[AUTOSAVE] Final flush failed: {type(exc).__name__}: {exc}")
@@ -1,9 +1,17 @@
+import asyncio
+import base64
 import json
-from typing import Any, Callable, Dict, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 
+from backend.config import WORK_LIST_MAX_PAGE_SIZE, WORK_LIST_PAGE_SIZE
 from backend.errors import BusinessError
+from backend.modules.analysis_queue import jobs as analysis_jobs
 from backend.modules.llm_gateway import analyzer
+from backend.modules.session_lock import events as lock_events
 from backend.modules.session_lock import lock as session_lock
+from backend.modules.work import autosave, ownership, text_patch
+from backend.modules.work import unit_of_work as work_uow
 from backend.modules.work import version_manager
 from backend.modules.work.utils import count_words
 from backend.storage.suggestion_resolution import repo as resolution_repo
@@ -13,22 +21,51 @@ from backend.storage.work_retrieve import repo as work_retrieve_repo
 
 Query = Dict[str, Any]
 QueryExecutor = Callable[[Query], Any]
+AsyncQueryExecutor = Callable[[Query], Awaitable[Any]]
+TransactionFactory = work_uow.TransactionFactory
+
+_WORK_CURSOR_PREFIX = "w1:"
 
 _EXECUTOR: Optional[QueryExecutor] = None
+_ASYNC_EXECUTOR: Optional[AsyncQueryExecutor] = None
 
 
 def set_query_executor(executor: QueryExecutor) -> None:
-    """Configure the storage executor used by Work operations."""
+    """Configure the storage executor used by Work operations.
+
+    Any transaction factory bound to a previous executor is dropped.
+    """
     global _EXECUTOR
     _EXECUTOR = executor
-    # Also configure version_manager
+    # Also configure version_manager and the auto-save flusher
     version_manager.set_query_executor(executor)
+    autosave.set_query_executor(executor)
+    work_uow.set_transaction_factory(None)
+
+
+def set_transaction_factory(factory: Optional[TransactionFactory]) -> None:
+    """Configure the storage transaction factory used for multi-query operations."""
+    work_uow.set_transaction_factory(factory)
+
+
+def set_async_query_executor(executor: AsyncQueryExecutor) -> None:
+    """Configure the async storage executor used by non-blocking Work reads/writes."""
+    global _ASYNC_EXECUTOR
+    _ASYNC_EXECUTOR = executor
+    version_manager.set_async_query_executor(executor)
+
+
+async def _run_async(query: Query) -> Any:
+    if _ASYNC_EXECUTOR is None:
+        return None
+    return await _ASYNC_EXECUTOR(query)
 
 
 def _run(query: Query) -> Any:
-    if _EXECUTOR is None:
+    executor = work_uow.active_executor() or _EXECUTOR
+    if executor is None:
         return None
-    return _EXECUTOR(query)
+    return executor(query)
 
 
 def create_work(user_email: str) -> Optional[str]:
@@ -50,6 +87,114 @@ def get_work(work_id: str, user_email: str) -> Any:
     return result
 
 
+def verify_work_owner(work_id: str, user_email: str) -> None:
+    """
+    Raise not_found unless ``user_email`` owns the work.
+
+    Uses a narrow probe instead of get_work and skips it while a recent
+    check is cached (see ownership).
+    """
+    if ownership.is_cached(work_id, user_email):
+        return
+    _probe_work(work_id, user_email)
+
+
+def _probe_work(work_id: str, user_email: str) -> Dict[str, Any]:
+    result = _run(work_retrieve_repo.probe_work(work_id, user_email))
+    if result is None:
+        raise BusinessError("not_found", "work not found")
+    ownership.remember(work_id, user_email)
+    return result
+
+
+async def verify_work_owner_async(work_id: str, user_email: str) -> None:
+    """Async variant of verify_work_owner."""
+    if ownership.is_cached(work_id, user_email):
+        return
+    await _probe_work_async(work_id, user_email)
+
+
+async def _probe_work_async(work_id: str, user_email: str) -> Dict[str, Any]:
+    result = await _run_async(work_retrieve_repo.probe_work(work_id, user_email))
+    if result is None:
+        raise BusinessError("not_found", "work not found")
+    ownership.remember(work_id, user_email)
+    return result
+
+
+async def create_work_async(user_email: str) -> Optional[str]:
+    query = work_repo.create_work(user_email)
+    result = await _run_async(query) or {}
+    return result.get("id")
+
+
+async def list_works_async(user_email: str) -> Any:
+    query = work_retrieve_repo.list_works(user_email)
+    return await _run_async(query) or []
+
+
+async def list_works_page_async(
+    user_email: str, cursor: Optional[str] = None, limit: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Get one page of the user's works, most recently updated first.
+
+    Returns:
+        (works, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        BusinessError: validation_failed if cursor or limit is invalid
+    """
+    page_size = WORK_LIST_PAGE_SIZE if limit is None else limit
+    if page_size < 1:
+        raise BusinessError("validation_failed", "limit must be at least 1")
+    page_size = min(page_size, WORK_LIST_MAX_PAGE_SIZE)
+    query = work_retrieve_repo.list_works(
+        user_email,
+        before=decode_work_cursor(cursor) if cursor else None,
+        # One extra row tells us whether another page follows.
+        limit=page_size + 1,
+    )
+    works = await _run_async(query) or []
+    if len(works) <= page_size:
+        return works, None
+    works = works[:page_size]
+    return works, encode_work_cursor(works[-1]["updated_at"], works[-1]["id"])
+
+
+def encode_work_cursor(updated_at: Any, work_id: Any) -> str:
+    """Encode the position of the last work on a page as an opaque cursor."""
+    if isinstance(updated_at, datetime):
+        updated_at = updated_at.isoformat()
+    raw = f"{_WORK_CURSOR_PREFIX}{updated_at}|{work_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_work_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor from encode_work_cursor into (updated_at, work_id).
+
+    Raises:
+        BusinessError: validation_failed if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        if not raw.startswith(_WORK_CURSOR_PREFIX):
+            raise ValueError(raw)
+        updated_at, work_id = raw[len(_WORK_CURSOR_PREFIX):].split("|", 1)
+        return datetime.fromisoformat(updated_at), work_id
+    except ValueError:
+        raise BusinessError("validation_failed", "invalid cursor")
+
+
+async def get_work_async(work_id: str, user_email: str) -> Any:
+    query = work_retrieve_repo.get_work(work_id, user_email)
+    result = await _run_async(query)
+    if result is None:
+        raise BusinessError("not_found", "work not found")
+    return result
+
+
 def update_work(
     work_id: str,
     user_email: str,
@@ -67,51 +212,188 @@ def update_work(
         content: Updated content
         device_id: Device ID for locking
         auto_save: If True, only update content without creating version.
-                   If False, create a new draft version.
+                   The content is buffered and written by the auto-save
+                   flusher (see autosave). If False, create a new draft
+                   version.
         essay_prompt: Essay prompt/requirements (optional)
 
     Returns:
         Dict with 'ok' and 'version' (if created)
     """
-    _ = get_work(work_id, user_email)
-    if not session_lock.acquire_lock(work_id, device_id):
+    work = _probe_work(work_id, user_email)
+    # Skips Redis while this process holds a fresh lease on the lock
+    if not session_lock.hold_lock(work_id, device_id):
         raise BusinessError("locked", "work locked")
 
-    # Calculate word count
-    word_count = count_words(content)
+    if auto_save and autosave.enabled():
+        autosave.buffer(
+            work_id, user_email, content, work.get("current_version") or 0, essay_prompt
+        )
+        return {"ok": True}
 
-    # Update content and word count in works table
-    query = work_repo.update_work_content(work_id, user_email, content, word_count)
-    _run(query)
+    return _save_content(work_id, user_email, content, auto_save, essay_prompt)
 
-    # Update essay prompt if provided
-    if essay_prompt is not None:
-        prompt_query = work_repo.update_essay_prompt(work_id, user_email, essay_prompt)
-        _run(prompt_query)
 
-    result = {"ok": True}
+async def update_work_async(
+    work_id: str,
+    user_email: str,
+    content: str,
+    device_id: str,
+    auto_save: bool = True,
+    essay_prompt: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of update_work.
 
-    # Create version if not auto_save
-    if not auto_save:
-        # Get latest submitted version to determine parent
-        latest_submission = version_manager.get_latest_submitted_version(work_id)
-        parent_version = (
-            latest_submission.get("version_number") if latest_submission else None
-        )
+    The ownership probe uses the async pool; the sync lock, auto-save
+    buffer and versioned-write transaction run via asyncio.to_thread so
+    the event loop never waits on Redis or a sync connection.
+    """
+    work = await _probe_work_async(work_id, user_email)
+    if not await asyncio.to_thread(session_lock.hold_lock, work_id, device_id):
+        raise BusinessError("locked", "work locked")
 
-        # Create draft version
-        new_version = version_manager.create_draft_version(
-            work_id=work_id,
-            user_email=user_email,
-            content=content,
-            parent_submission_version=parent_version,
+    if auto_save and autosave.enabled():
+        await asyncio.to_thread(
+            autosave.buffer,
+            work_id, user_email, content, work.get("current_version") or 0, essay_prompt,
         )
-        result["version"] = new_version
+        return {"ok": True}
+
+    return await asyncio.to_thread(
+        _save_content, work_id, user_email, content, auto_save, essay_prompt
+    )
+
+
+def _save_content(
+    work_id: str,
+    user_email: str,
+    content: str,
+    auto_save: bool,
+    essay_prompt: Optional[str],
+) -> Dict[str, Any]:
+    """Write content directly, creating a draft version unless auto_save."""
+    # This write supersedes anything still buffered
+    autosave.discard(work_id)
+
+    # Calculate word count
+    word_count = count_words(content)
+    result = {"ok": True}
+
+    with work_uow.unit_of_work():
+        # Update content and word count in works table
+        query = work_repo.update_work_content(work_id, user_email, content, word_count)
+        _run(query)
+
+        # Update essay prompt if provided
+        if essay_prompt is not None:
+            prompt_query = work_repo.update_essay_prompt(work_id, user_email, essay_prompt)
+            _run(prompt_query)
+
+        # Create version if not auto_save
+        if not auto_save:
+            # Get latest submitted version to determine parent
+            latest_submission = version_manager.get_latest_submitted_version(work_id)
+            parent_version = (
+                latest_submission.get("version_number") if latest_submission else None
+            )
+
+            # Create draft version
+            new_version = version_manager.create_draft_version(
+                work_id=work_id,
+                user_email=user_email,
+                content=content,
+                parent_submission_version=parent_version,
+            )
+            result["version"] = new_version
 
-    session_lock.refresh_lock(work_id, device_id)
     return result
 
 
+def patch_work(
+    work_id: str,
+    user_email: str,
+    device_id: str,
+    base_hash: str,
+    ops: List[Dict[str, Any]],
+    essay_prompt: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Auto-save by applying range replacements to the latest content.
+
+    The patch is applied to the buffered auto-save content if there is
+    one, else to the stored content, and only if that content still hashes
+    to ``base_hash``. See text_patch for the operation format.
+
+    Returns:
+        Dict with 'ok', the new 'content_hash' and 'word_count'
+
+    Raises:
+        BusinessError: conflict if the base is stale (resend the full
+            content via update_work), validation_failed for bad ranges
+    """
+    work = get_work(work_id, user_email)
+    if not session_lock.hold_lock(work_id, device_id):
+        raise BusinessError("locked", "work locked")
+    return _apply_and_save_patch(work, work_id, user_email, base_hash, ops, essay_prompt)
+
+
+async def patch_work_async(
+    work_id: str,
+    user_email: str,
+    device_id: str,
+    base_hash: str,
+    ops: List[Dict[str, Any]],
+    essay_prompt: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of patch_work.
+
+    The work is read from the async pool; locking, the buffer and the
+    write run via asyncio.to_thread.
+    """
+    work = await get_work_async(work_id, user_email)
+    if not await asyncio.to_thread(session_lock.hold_lock, work_id, device_id):
+        raise BusinessError("locked", "work locked")
+    return await asyncio.to_thread(
+        _apply_and_save_patch, work, work_id, user_email, base_hash, ops, essay_prompt
+    )
+
+
+def _apply_and_save_patch(
+    work: Dict[str, Any],
+    work_id: str,
+    user_email: str,
+    base_hash: str,
+    ops: List[Dict[str, Any]],
+    essay_prompt: Optional[str],
+) -> Dict[str, Any]:
+    base_version = work.get("current_version") or 0
+    current = autosave.apply_pending(work) if autosave.enabled() else work
+    content = current.get("content") or ""
+    if text_patch.content_hash(content) != base_hash:
+        raise BusinessError("conflict", "patch base is stale")
+
+    word_count = current.get("word_count")
+    if word_count is None:
+        word_count = count_words(content)
+    content, word_count = text_patch.apply_patch(content, ops, word_count)
+
+    if autosave.enabled():
+        autosave.buffer(work_id, user_email, content, base_version, essay_prompt, word_count)
+    else:
+        with work_uow.unit_of_work():
+            _run(work_repo.update_work_content(work_id, user_email, content, word_count))
+            if essay_prompt is not None:
+                _run(work_repo.update_essay_prompt(work_id, user_email, essay_prompt))
+
+    return {
+        "ok": True,
+        "content_hash": text_patch.content_hash(content),
+        "word_count": word_count,
+    }
+
+
 def submit_work(
     work_id: str,
     user_email: str,
@@ -123,7 +405,8 @@ def submit_work(
     """
     Submit work for evaluation.
 
-    Creates a submitted version and cleans up draft versions.
+    Creates a submitted version, cleans up draft versions and queues the
+    AI analysis; poll get_analysis_status for the result.
 
     Args:
         work_id: Work ID
@@ -135,11 +418,161 @@ def submit_work(
             Format: {"suggestion_id": {"action": "resolved|rejected", "user_note": "..."}}
 
     Returns:
-        Dict with 'ok', 'version', and 'analysis_id'
+        Dict with 'ok', 'version', 'analysis_id' (None until the job
+        finishes) and 'analysis_status'
 
     Raises:
         BusinessError: If validation fails (e.g., unprocessed suggestions)
     """
+    payload = _submit_version(
+        work_id, user_email, content, device_id, user_reflection, suggestion_actions
+    )
+
+    # Queue AI analysis; the LLM calls run on analysis workers
+    job = analysis_jobs.enqueue(
+        _analysis_job_id(work_id, payload["current_version"]), payload
+    )
+
+    return {
+        "ok": True,
+        "version": payload["current_version"],
+        "analysis_id": (job.get("result") or {}).get("analysis_id"),
+        "analysis_status": job["status"],
+    }
+
+
+async def submit_work_async(
+    work_id: str,
+    user_email: str,
+    content: str,
+    device_id: str,
+    user_reflection: Optional[str] = None,
+    suggestion_actions: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of submit_work.
+
+    Submission takes the Redis lock and writes the version in one sync
+    transaction, so the whole step runs via asyncio.to_thread after an
+    async ownership check.
+    """
+    await verify_work_owner_async(work_id, user_email)
+    return await asyncio.to_thread(
+        submit_work, work_id, user_email, content, device_id, user_reflection, suggestion_actions
+    )
+
+
+async def submit_work_stream_async(
+    work_id: str,
+    user_email: str,
+    content: str,
+    device_id: str,
+    user_reflection: Optional[str] = None,
+    suggestion_actions: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[Dict[str, Any], Iterator[Tuple[str, Dict[str, Any]]]]:
+    """
+    Async variant of submit_work_stream.
+
+    The version is created via asyncio.to_thread; the returned event
+    iterator stays sync (the LLM client is) and is consumed off the loop by
+    the streaming response.
+    """
+    await verify_work_owner_async(work_id, user_email)
+    return await asyncio.to_thread(
+        submit_work_stream,
+        work_id, user_email, content, device_id, user_reflection, suggestion_actions,
+    )
+
+
+def submit_work_stream(
+    work_id: str,
+    user_email: str,
+    content: str,
+    device_id: str,
+    user_reflection: Optional[str] = None,
+    suggestion_actions: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[Dict[str, Any], Iterator[Tuple[str, Dict[str, Any]]]]:
+    """
+    Submit work and stream the AI analysis while it is generated.
+
+    The version is created before returning, so lock and validation errors
+    raise as with submit_work. The returned iterator then runs the analysis
+    inline and yields the analyzer's fao_delta and sentence_comment events,
+    followed by ("done", {"analysis_id"}) once it is saved. If generation
+    fails or the consumer stops early, the analysis job is queued instead
+    and an ("error", {...}) event is yielded where possible.
+
+    Returns:
+        (dict with 'ok' and 'version', event iterator)
+    """
+    payload = _submit_version(
+        work_id, user_email, content, device_id, user_reflection, suggestion_actions
+    )
+    result = {"ok": True, "version": payload["current_version"]}
+    return result, _stream_analysis(payload)
+
+
+def _stream_analysis(payload: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    analysis_id: Optional[str] = None
+    error: Optional[BusinessError] = None
+    job: Optional[Dict[str, Any]] = None
+    try:
+        previous_text, previous_analysis = _load_previous_analysis(
+            payload["work_id"], payload["user_email"], payload["previous_submission"]
+        )
+        events = analyzer.stream_analysis(
+            work_id=payload["work_id"],
+            current_text=payload["current_content"],
+            current_version=payload["current_version"],
+            previous_text=previous_text,
+            previous_analysis=previous_analysis,
+            user_actions=payload["suggestion_actions"],
+            user_reflection=payload["user_reflection"],
+            essay_prompt=payload["essay_prompt"],
+        )
+        for event, data in events:
+            if event != "analysis":
+                yield event, data
+                continue
+            with work_uow.unit_of_work():
+                analysis_id = str(_save_analysis(
+                    work_id=payload["work_id"],
+                    user_email=payload["user_email"],
+                    current_version=payload["current_version"],
+                    current_content=payload["current_content"],
+                    analysis=data,
+                    previous_submission=payload["previous_submission"],
+                    suggestion_actions=payload["suggestion_actions"],
+                ))
+    except BusinessError as exc:
+        print(f"[WORK MANAGER] Streamed analysis failed: {exc.code}: {exc.message}")
+        error = exc
+    finally:
+        # Never lose a submission's analysis: hand it to the workers
+        if analysis_id is None:
+            job = analysis_jobs.enqueue(
+                _analysis_job_id(payload["work_id"], payload["current_version"]), payload
+            )
+
+    if analysis_id is None:
+        yield "error", {
+            "code": error.code if error else "llm_failed",
+            "message": error.message if error else "analysis incomplete",
+            "analysis_status": job["status"] if job else analysis_jobs.STATUS_QUEUED,
+        }
+        return
+    yield "done", {"analysis_id": analysis_id}
+
+
+def _submit_version(
+    work_id: str,
+    user_email: str,
+    content: str,
+    device_id: str,
+    user_reflection: Optional[str],
+    suggestion_actions: Optional[Dict[str, Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Create the submitted version and return the analysis job payload."""
     work = get_work(work_id, user_email)
     essay_prompt = work.get("essay_prompt")  # Get essay prompt for LLM analysis
 
@@ -153,47 +586,102 @@ def submit_work(
     if latest_submission:
         _validate_suggestion_actions(work_id, latest_submission, suggestion_actions)
 
-    # Create submitted version
-    new_version = version_manager.create_submitted_version(
-        work_id=work_id,
-        user_email=user_email,
-        content=content,
-        user_reflection=user_reflection,
-    )
-
     # Calculate word count
     word_count = count_words(content)
 
-    # Update content and word count in works table
-    query = work_repo.update_work_content(work_id, user_email, content, word_count)
-    _run(query)
+    # The submitted content supersedes anything still buffered
+    autosave.discard(work_id)
 
-    # Clean up draft versions after previous submission
-    if latest_submission:
-        parent_version = latest_submission.get("version_number")
-        version_manager.delete_draft_versions_after_submission(work_id, parent_version)
+    # Version, content and draft cleanup commit together
+    with work_uow.unit_of_work():
+        # Create submitted version
+        new_version = version_manager.create_submitted_version(
+            work_id=work_id,
+            user_email=user_email,
+            content=content,
+            user_reflection=user_reflection,
+        )
 
-    session_lock.refresh_lock(work_id, device_id)
+        # Update content and word count in works table
+        query = work_repo.update_work_content(work_id, user_email, content, word_count)
+        _run(query)
 
-    # Generate AI analysis
-    analysis_id = _generate_and_save_analysis(
-        work_id=work_id,
-        user_email=user_email,
-        current_version=new_version,
-        current_content=content,
-        previous_submission=latest_submission,
-        user_reflection=user_reflection,
-        suggestion_actions=suggestion_actions,
-        essay_prompt=essay_prompt,
-    )
+        # Clean up draft versions after previous submission
+        if latest_submission:
+            parent_version = latest_submission.get("version_number")
+            version_manager.delete_draft_versions_after_submission(work_id, parent_version)
+
+    session_lock.refresh_lock(work_id, device_id)
 
+    previous_submission = None
+    if latest_submission:
+        previous_submission = {
+            "version_number": latest_submission.get("version_number"),
+            "content": latest_submission.get("content"),
+        }
     return {
-        "ok": True,
-        "version": new_version,
-        "analysis_id": analysis_id,
+        "work_id": work_id,
+        "user_email": user_email,
+        "current_version": new_version,
+        "current_content": content,
+        "previous_submission": previous_submission,
+        "user_reflection": user_reflection,
+        "suggestion_actions": suggestion_actions,
+        "essay_prompt": essay_prompt,
     }
 
 
+def _analysis_job_id(work_id: str, version_number: int) -> str:
+    return f"{work_id}:{version_number}"
+
+
+def run_analysis_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analysis queue handler: generate and persist analysis for a submission.
+
+    Safe to retry: an analysis already saved for the version is reused.
+    """
+    existing_query = analysis_repo.get_analysis_by_version(
+        payload["work_id"], payload["current_version"]
+    )
+    existing = _run(existing_query)
+    if existing and existing.get("id"):
+        return {"analysis_id": str(existing["id"])}
+    analysis_id = _generate_and_save_analysis(**payload)
+    return {"analysis_id": str(analysis_id)}
+
+
+def get_analysis_status(work_id: str, user_email: str, version_number: int) -> Dict[str, Any]:
+    """
+    Report progress of the analysis for a submitted version.
+
+    Returns:
+        Dict with 'status' (queued, running, done, failed), 'analysis_id',
+        'attempts' and 'error'
+    """
+    verify_work_owner(work_id, user_email)
+    job = analysis_jobs.get_job(_analysis_job_id(work_id, version_number))
+    if job is not None:
+        return {
+            "status": job["status"],
+            "analysis_id": (job.get("result") or {}).get("analysis_id"),
+            "attempts": job.get("attempts", 0),
+            "error": job.get("error"),
+        }
+
+    # Job record expired (or predates the queue): fall back to storage
+    query = analysis_repo.get_analysis_by_version(work_id, version_number)
+    existing = _run(query)
+    if existing and existing.get("id"):
+        return {
+            "status": analysis_jobs.STATUS_DONE,
+            "analysis_id": str(existing["id"]),
+            "attempts": 0,
+            "error": None,
+        }
+    raise BusinessError("not_found", "analysis not found")
+
+
 def _validate_suggestion_actions(
     work_id: str,
     previous_submission: Dict[str, Any],
@@ -284,6 +772,39 @@ def _generate_and_save_analysis(
     Raises:
         BusinessError: If analysis generation or saving fails
     """
+    previous_text, previous_analysis = _load_previous_analysis(
+        work_id, user_email, previous_submission
+    )
+
+    # Generate analysis using AI
+    analysis = analyzer.generate_analysis(
+        work_id=work_id,
+        current_text=current_content,
+        current_version=current_version,
+        previous_text=previous_text,
+        previous_analysis=previous_analysis,
+        user_actions=suggestion_actions,
+        user_reflection=user_reflection,
+        essay_prompt=essay_prompt,
+    )
+
+    # Save analysis, rubric and resolutions in one transaction
+    with work_uow.unit_of_work():
+        return _save_analysis(
+            work_id=work_id,
+            user_email=user_email,
+            current_version=current_version,
+            current_content=current_content,
+            analysis=analysis,
+            previous_submission=previous_submission,
+            suggestion_actions=suggestion_actions,
+        )
+
+
+def _load_previous_analysis(
+    work_id: str, user_email: str, previous_submission: Optional[Dict[str, Any]]
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Return (previous_text, previous_analysis) for an iterative submission."""
     # Get previous analysis if this is not first submission
     previous_text = None
     previous_analysis = None
@@ -312,19 +833,19 @@ def _generate_and_save_analysis(
                     print(f"[WORK MANAGER] Failed to parse rubric from work: {e}")
                     previous_analysis["rubric"] = None
 
-    # Generate analysis using AI
-    analysis = analyzer.generate_analysis(
-        work_id=work_id,
-        current_text=current_content,
-        current_version=current_version,
-        previous_text=previous_text,
-        previous_analysis=previous_analysis,
-        user_actions=suggestion_actions,
-        user_reflection=user_reflection,
-        essay_prompt=essay_prompt,
-    )
+    return previous_text, previous_analysis
+
 
-    # Save analysis to database
+def _save_analysis(
+    work_id: str,
+    user_email: str,
+    current_version: int,
+    current_content: str,
+    analysis: Dict[str, Any],
+    previous_submission: Optional[Dict[str, Any]],
+    suggestion_actions: Optional[Dict[str, Dict[str, Any]]],
+) -> str:
+    """Persist a generated analysis plus its rubric and suggestion resolutions."""
     sentence_comments_json = json.dumps(analysis["sentence_comments"])
 
     save_query = analysis_repo.create_analysis(
@@ -421,10 +942,77 @@ def delete_work(work_id: str, user_email: str) -> bool:
         True if successful
     """
     # Verify ownership
-    _ = get_work(work_id, user_email)
+    verify_work_owner(work_id, user_email)
 
     # Delete work (cascade will handle related tables)
+    autosave.discard(work_id)
     query = work_repo.delete_work(work_id, user_email)
     _run(query)
+    ownership.forget(work_id)
+
+    return True
+
+
+def release_work(work_id: str, user_email: str, device_id: str) -> bool:
+    """
+    Flush buffered auto-save content and release the device's lock.
+
+    Returns:
+        True if the lock was held by ``device_id`` and released
+    """
+    verify_work_owner(work_id, user_email)
+    autosave.flush(work_id)
+    return session_lock.release_lock(work_id, device_id)
+
 
+def heartbeat_work(work_id: str, user_email: str, device_id: str) -> bool:
+    """
+    Acquire or renew the device's lock on a work.
+
+    Editors call this periodically; it always checks Redis (unlike saves,
+    which ride on the lease it renews).
+
+    Returns:
+        True if ``device_id`` now holds the lock, False if another device does
+    """
+    verify_work_owner(work_id, user_email)
+    return session_lock.acquire_lock(work_id, device_id)
+
+
+async def watch_work_lock_async(
+    work_id: str, user_email: str
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream lock-holder changes of a work as ("lock", {"holder"}) events.
+
+    Ownership is checked before the stream starts. The first event is the
+    current holder; ``holder`` is None when free.
+    """
+    await verify_work_owner_async(work_id, user_email)
+    return _lock_events(work_id)
+
+
+async def _lock_events(work_id: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    async for holder in lock_events.watch_lock(work_id):
+        yield "lock", {"holder": holder}
+
+
+async def revert_work_async(
+    work_id: str, user_email: str, target_version: int, device_id: str
+) -> int:
+    """Check ownership asynchronously, then revert via asyncio.to_thread."""
+    await verify_work_owner_async(work_id, user_email)
+    return await asyncio.to_thread(
+        version_manager.revert_to_version, work_id, user_email, target_version, device_id
+    )
+
+
+async def delete_work_async(work_id: str, user_email: str) -> bool:
+    """Async variant of delete_work."""
+    await verify_work_owner_async(work_id, user_email)
+    # The buffer is sync (Redis by default); keep it off the event loop
+    await asyncio.to_thread(autosave.discard, work_id)
+    query = work_repo.delete_work(work_id, user_email)
+    await _run_async(query)
+    ownership.forget(work_id)
     return True
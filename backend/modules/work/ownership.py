@@ -0,0 +1,72 @@
+"""
+Short-lived cache of verified work ownership.
+
+Ownership of a work never changes while it exists, so a positive check is
+remembered per (user, work) for WORK_OWNERSHIP_CACHE_SECONDS and guards
+skip the database until it expires. Deleting a work forgets it in this
+process; other processes may accept it until their entry expires, after
+which the usual not_found applies.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Set, Tuple
+
+from backend.config import WORK_OWNERSHIP_CACHE_MAX_ENTRIES, WORK_OWNERSHIP_CACHE_SECONDS
+
+Key = Tuple[str, str]
+
+_LOCK = threading.Lock()
+_ENTRIES: "OrderedDict[Key, float]" = OrderedDict()
+# work_id -> emails with an entry, so forget touches only that work's keys.
+_BY_WORK: Dict[str, Set[str]] = {}
+
+
+def _drop(key: Key) -> None:
+    del _ENTRIES[key]
+    emails = _BY_WORK[key[0]]
+    emails.discard(key[1])
+    if not emails:
+        del _BY_WORK[key[0]]
+
+
+def is_cached(work_id: str, user_email: str) -> bool:
+    """True if ``user_email`` was verified as the owner of ``work_id`` recently."""
+    key = (str(work_id), user_email)
+    with _LOCK:
+        expires_at = _ENTRIES.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            _drop(key)
+            return False
+        _ENTRIES.move_to_end(key)
+        return True
+
+
+def remember(work_id: str, user_email: str) -> None:
+    """Record a successful ownership check."""
+    if WORK_OWNERSHIP_CACHE_SECONDS <= 0:
+        return
+    key = (str(work_id), user_email)
+    with _LOCK:
+        _ENTRIES[key] = time.monotonic() + WORK_OWNERSHIP_CACHE_SECONDS
+        _ENTRIES.move_to_end(key)
+        _BY_WORK.setdefault(key[0], set()).add(user_email)
+        while len(_ENTRIES) > WORK_OWNERSHIP_CACHE_MAX_ENTRIES:
+            _drop(next(iter(_ENTRIES)))
+
+
+def forget(work_id: str) -> None:
+    """Drop every cached check for a deleted work."""
+    with _LOCK:
+        for user_email in _BY_WORK.pop(str(work_id), ()):
+            del _ENTRIES[(str(work_id), user_email)]
+
+
+def clear() -> None:
+    """Empty the cache."""
+    with _LOCK:
+        _ENTRIES.clear()
+        _BY_WORK.clear()
@@ -0,0 +1,57 @@
+"""
+Range-replacement patches for auto-saves.
+
+A patch is a list of operations ``{"start", "end", "text"}`` applied in
+order, each replacing ``content[start:end]`` of the result so far with
+``text``. Offsets count Unicode code points. Patches name the content they
+were made against by its content_hash, and the word count is adjusted from
+the edited region only instead of re-counting the whole essay.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+from backend.errors import BusinessError
+from backend.modules.work.utils import count_words
+
+MAX_OPS = 100
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 hex digest of the UTF-8 content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _word_bounds(content: str, start: int, end: int) -> Tuple[int, int]:
+    # Widen to whitespace so the region holds whole words on both sides.
+    while start > 0 and not content[start - 1].isspace():
+        start -= 1
+    while end < len(content) and not content[end].isspace():
+        end += 1
+    return start, end
+
+
+def apply_patch(content: str, ops: List[Dict[str, Any]], word_count: int) -> Tuple[str, int]:
+    """
+    Apply ``ops`` to ``content`` and return (new content, new word count).
+
+    ``word_count`` must be count_words(content); each operation re-counts
+    only the words it touches.
+
+    Raises:
+        BusinessError: validation_failed if an operation is out of range
+    """
+    if not ops:
+        raise BusinessError("validation_failed", "patch has no operations")
+    if len(ops) > MAX_OPS:
+        raise BusinessError("validation_failed", f"patch has more than {MAX_OPS} operations")
+    for op in ops:
+        start, end, text = op["start"], op["end"], op["text"]
+        if not 0 <= start <= end <= len(content):
+            raise BusinessError("validation_failed", "patch range out of bounds")
+        left, right = _word_bounds(content, start, end)
+        before = count_words(content[left:right])
+        after = count_words(content[left:start] + text + content[end:right])
+        content = content[:start] + text + content[end:]
+        word_count += after - before
+    return content, word_count
@@ -0,0 +1,49 @@
+"""
+Unit-of-work support for Work operations.
+
+Groups several storage query contracts into one transaction so a business
+operation commits once and never leaves half-applied state behind.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional
+
+Query = Dict[str, Any]
+QueryExecutor = Callable[[Query], Any]
+TransactionFactory = Callable[[], ContextManager[QueryExecutor]]
+
+_FACTORY: Optional[TransactionFactory] = None
+_ACTIVE: ContextVar[Optional[QueryExecutor]] = ContextVar(
+    "work_unit_of_work", default=None
+)
+
+
+def set_transaction_factory(factory: Optional[TransactionFactory]) -> None:
+    """Configure the storage transaction factory used by Work operations."""
+    global _FACTORY
+    _FACTORY = factory
+
+
+def active_executor() -> Optional[QueryExecutor]:
+    """Return the executor of the enclosing unit of work, if any."""
+    return _ACTIVE.get()
+
+
+@contextmanager
+def unit_of_work() -> Iterator[None]:
+    """
+    Route queries issued inside the block through one transaction.
+
+    Nested blocks join the outermost unit of work. Without a configured
+    factory, queries fall back to the module executor (one commit each).
+    """
+    if _FACTORY is None or _ACTIVE.get() is not None:
+        yield
+        return
+    with _FACTORY() as executor:
+        token = _ACTIVE.set(executor)
+        try:
+            yield
+        finally:
+            _ACTIVE.reset(token)
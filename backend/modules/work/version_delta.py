@@ -0,0 +1,117 @@
+"""
+Compact diffs between essay versions.
+
+A delta is a JSON list of operations applied left to right against a base
+text: a positive int copies that many characters from the base, a negative
+int skips that many, and a string is inserted as-is. Diffs are computed on
+sentences first, then on words inside the sentences that changed, which
+keeps them small for typical edits and cheap to compute on whole essays.
+"""
+
+import difflib
+import json
+import re
+from typing import Any, Dict, List, Optional, Union
+
+from backend.config import VERSION_DELTA_MAX_RATIO, VERSION_SNAPSHOT_INTERVAL
+
+Op = Union[int, str]
+
+_SENTENCE = re.compile(r"[^.!?\n]+[.!?\n]*\s*|[.!?\n]+\s*")
+_WORD = re.compile(r"\s+|\S+\s*")
+
+
+def _push(ops: List[Op], op: Op) -> None:
+    if not op:
+        return
+    if ops:
+        last = ops[-1]
+        if isinstance(op, str) and isinstance(last, str):
+            ops[-1] = last + op
+            return
+        if isinstance(op, int) and isinstance(last, int) and (op > 0) == (last > 0):
+            ops[-1] = last + op
+            return
+    ops.append(op)
+
+
+def _diff(ops: List[Op], base: List[str], target: List[str], refine: bool) -> None:
+    matcher = difflib.SequenceMatcher(None, base, target, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            _push(ops, sum(len(token) for token in base[i1:i2]))
+        elif tag == "replace" and refine:
+            _diff(ops, _WORD.findall("".join(base[i1:i2])), _WORD.findall("".join(target[j1:j2])), False)
+        else:
+            _push(ops, -sum(len(token) for token in base[i1:i2]))
+            _push(ops, "".join(target[j1:j2]))
+
+
+def make_delta(base: str, target: str) -> str:
+    """Return the delta that turns ``base`` into ``target``."""
+    ops: List[Op] = []
+    _diff(ops, _SENTENCE.findall(base), _SENTENCE.findall(target), refine=True)
+    # The rest of the base is dropped implicitly.
+    if ops and isinstance(ops[-1], int) and ops[-1] < 0:
+        ops.pop()
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_delta(base: str, delta: str) -> str:
+    """
+    Rebuild the target text from ``base`` and a delta from make_delta.
+
+    Raises:
+        ValueError: If the delta reaches past the end of the base
+    """
+    parts: List[str] = []
+    pos = 0
+    for op in json.loads(delta):
+        if isinstance(op, str):
+            parts.append(op)
+            continue
+        end = pos + abs(op)
+        if end > len(base):
+            raise ValueError("delta does not match its base version")
+        if op > 0:
+            parts.append(base[pos:end])
+        pos = end
+    return "".join(parts)
+
+
+def plan_storage(
+    content: str,
+    snapshot: Optional[Dict[str, Any]],
+    is_submitted: bool,
+    snapshot_interval: int = VERSION_SNAPSHOT_INTERVAL,
+    max_ratio: float = VERSION_DELTA_MAX_RATIO,
+) -> Dict[str, Any]:
+    """
+    Choose the work_versions columns that store ``content``.
+
+    Drafts become a delta against the latest full snapshot (a row with
+    ``version_number``, ``content`` and ``delta_count``), so any version
+    rebuilds from at most one snapshot plus one delta. Submissions, the
+    first version, a draft after ``snapshot_interval`` deltas and drafts
+    whose delta is not much smaller than the text are stored in full.
+    """
+    fields: Dict[str, Any] = {
+        "content": content,
+        "storage_kind": "full",
+        "content_preview": content[:100],
+    }
+    if is_submitted or not snapshot or snapshot.get("content") is None:
+        return fields
+    if (snapshot.get("delta_count") or 0) >= snapshot_interval:
+        return fields
+
+    delta = make_delta(snapshot["content"], content)
+    if len(delta) > len(content) * max_ratio:
+        return fields
+    return {
+        **fields,
+        "content": None,
+        "storage_kind": "delta",
+        "base_version": snapshot["version_number"],
+        "content_delta": delta,
+    }
@@ -4,15 +4,36 @@ Business logic for work version management.
 Handles version creation, submission, and rollback operations.
 """
 
-from typing import Any, Callable, Dict, Optional
-
+import base64
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from backend.config import (
+    VERSION_LIST_MAX_PAGE_SIZE,
+    VERSION_LIST_PAGE_SIZE,
+    VERSION_SNAPSHOT_CACHE_MAX_ENTRIES,
+)
 from backend.errors import BusinessError
+from backend.modules.work import version_delta
+from backend.modules.work.unit_of_work import active_executor
+from backend.modules.work.utils import count_words
 from backend.storage.work_version import repo as version_repo
 
 Query = Dict[str, Any]
 QueryExecutor = Callable[[Query], Any]
+AsyncQueryExecutor = Callable[[Query], Awaitable[Any]]
+
+_CURSOR_PREFIX = "v1:"
 
 _EXECUTOR: Optional[QueryExecutor] = None
+_ASYNC_EXECUTOR: Optional[AsyncQueryExecutor] = None
+
+# Latest snapshot content per work, as (version row id, content). Rows are
+# immutable and ids are never reused, so an entry is valid exactly while
+# its id is still the work's latest snapshot.
+_SNAPSHOT_LOCK = threading.Lock()
+_SNAPSHOTS: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
 
 
 def set_query_executor(executor: QueryExecutor) -> None:
@@ -21,29 +42,153 @@ def set_query_executor(executor: QueryExecutor) -> None:
     _EXECUTOR = executor
 
 
+def set_async_query_executor(executor: AsyncQueryExecutor) -> None:
+    """Configure the async storage executor used by version reads."""
+    global _ASYNC_EXECUTOR
+    _ASYNC_EXECUTOR = executor
+
+
+async def _run_async(query: Query) -> Any:
+    if _ASYNC_EXECUTOR is None:
+        return None
+    return await _ASYNC_EXECUTOR(query)
+
+
 def _run(query: Query) -> Any:
-    if _EXECUTOR is None:
+    executor = active_executor() or _EXECUTOR
+    if executor is None:
         return None
-    return _EXECUTOR(query)
+    return executor(query)
 
 
 def get_current_version_number(work_id: str) -> int:
     """Get current version number for a work."""
     query = version_repo.get_current_version_number(work_id)
     result = _run(query)
-    if result is None:
-        return 0
-    return result.get("current_version", 0)
+    return result or 0
+
+
+async def get_current_version_number_async(work_id: str) -> int:
+    """Async variant of get_current_version_number."""
+    query = version_repo.get_current_version_number(work_id)
+    result = await _run_async(query)
+    return result or 0
 
 
 def get_latest_submitted_version(work_id: str) -> Optional[Dict[str, Any]]:
     """Get the most recent submitted version for a work."""
     query = version_repo.get_latest_submitted_version(work_id)
-    result = _run(query)
-    # Handle list result from ORDER BY query (fetchall returns list)
-    if isinstance(result, list):
-        return result[0] if result else None
-    return result
+    return _run(query)
+
+
+def _remember_snapshot(work_id: str, version_id: Any, content: str) -> None:
+    if VERSION_SNAPSHOT_CACHE_MAX_ENTRIES <= 0:
+        return
+    key = str(work_id)
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOTS[key] = (str(version_id), content)
+        _SNAPSHOTS.move_to_end(key)
+        while len(_SNAPSHOTS) > VERSION_SNAPSHOT_CACHE_MAX_ENTRIES:
+            _SNAPSHOTS.popitem(last=False)
+
+
+def _snapshot_content(work_id: str, version_id: Any) -> Optional[str]:
+    """Content of the full version ``version_id``, from the cache if current."""
+    key = str(work_id)
+    with _SNAPSHOT_LOCK:
+        cached = _SNAPSHOTS.get(key)
+        if cached is not None and cached[0] == str(version_id):
+            _SNAPSHOTS.move_to_end(key)
+            return cached[1]
+    content = _run(version_repo.get_snapshot_content(str(version_id)))
+    if content is not None:
+        _remember_snapshot(work_id, version_id, content)
+    return content
+
+
+def clear_snapshot_cache() -> None:
+    """Empty the per-work snapshot content cache."""
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOTS.clear()
+
+
+def _storage_fields(work_id: str, content: str, is_submitted: bool) -> Dict[str, Any]:
+    """
+    Columns storing a new version's content (full snapshot or delta).
+
+    Drafts diff against the latest snapshot. Its id and delta count are
+    read on every save; its content only when this process has not cached
+    that snapshot yet, which trades one essay of memory per active work
+    (VERSION_SNAPSHOT_CACHE_MAX_ENTRIES) for not reading it back each save.
+    """
+    snapshot = None
+    if not is_submitted:
+        snapshot = _run(version_repo.get_latest_snapshot(work_id))
+        if snapshot:
+            snapshot = {**snapshot, "content": _snapshot_content(work_id, snapshot["id"])}
+    fields = version_delta.plan_storage(content, snapshot, is_submitted)
+    fields["word_count"] = count_words(content)
+    return fields
+
+
+def _create_version(work_id: str, content: str, **params: Any) -> int:
+    fields = _storage_fields(work_id, content, params["is_submitted"])
+    # One statement allocates the version number and inserts the row
+    row = _run(version_repo.create_version(work_id=work_id, **params, **fields))
+    version_number = _allocated_version(row)
+    if fields["storage_kind"] == "full":
+        # The next draft will diff against this row; keep its content.
+        _remember_snapshot(work_id, row["id"], content)
+    return version_number
+
+
+def _materialize(version: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Rebuild delta-stored content and drop storage-only fields."""
+    if version is None:
+        return None
+    base_content = version.pop("base_content", None)
+    delta = version.pop("content_delta", None)
+    if version.pop("storage_kind", "full") == "delta":
+        if base_content is None or delta is None:
+            raise BusinessError("not_found", "version base snapshot missing")
+        version["content"] = version_delta.apply_delta(base_content, delta)
+    return version
+
+
+def backfill_version_summaries(batch_size: int = 500) -> int:
+    """
+    Fill content_preview and word_count on versions saved before they
+    were written at save time (migration 005), one batch per statement.
+
+    Returns:
+        Number of versions updated
+    """
+    updated = 0
+    after_id = None
+    while True:
+        rows = _run(version_repo.list_versions_missing_summary(after_id, batch_size)) or []
+        if not rows:
+            return updated
+        ids, previews, word_counts = [], [], []
+        for row in rows:
+            try:
+                content = _materialize(dict(row)).get("content") or ""
+            except (BusinessError, ValueError):
+                print(f"[VERSION BACKFILL] Cannot rebuild version {row['id']}; leaving it empty")
+                content = ""
+            ids.append(str(row["id"]))
+            previews.append(content[:100])
+            word_counts.append(count_words(content))
+        _run(version_repo.set_version_summaries(ids, previews, word_counts))
+        updated += len(rows)
+        after_id = ids[-1]
+        print(f"[VERSION BACKFILL] {updated} versions updated")
+
+
+def _allocated_version(row: Optional[Dict[str, Any]]) -> int:
+    if not row:
+        raise BusinessError("not_found", "work not found")
+    return row["version_number"]
 
 
 def create_draft_version(
@@ -57,28 +202,15 @@ def create_draft_version(
 
     Returns the new version number.
     """
-    # Get current version and increment
-    current_version = get_current_version_number(work_id)
-    new_version = current_version + 1
-
-    # Create version record
-    query = version_repo.create_version(
-        work_id=work_id,
+    return _create_version(
+        work_id,
+        content,
         user_email=user_email,
-        version_number=new_version,
-        content=content,
         is_submitted=False,
         parent_submission_version=parent_submission_version,
         user_reflection=None,
         change_type="draft_edit",
     )
-    _run(query)
-
-    # Update current_version in works table
-    update_query = version_repo.update_current_version(work_id, new_version)
-    _run(update_query)
-
-    return new_version
 
 
 def create_submitted_version(
@@ -92,28 +224,15 @@ def create_submitted_version(
 
     Returns the new version number.
     """
-    # Get current version and increment
-    current_version = get_current_version_number(work_id)
-    new_version = current_version + 1
-
-    # Create version record
-    query = version_repo.create_version(
-        work_id=work_id,
+    return _create_version(
+        work_id,
+        content,
         user_email=user_email,
-        version_number=new_version,
-        content=content,
         is_submitted=True,
         parent_submission_version=None,  # Submitted versions don't have parent
         user_reflection=user_reflection,
         change_type="submission",
     )
-    _run(query)
-
-    # Update current_version in works table
-    update_query = version_repo.update_current_version(work_id, new_version)
-    _run(update_query)
-
-    return new_version
 
 
 def delete_draft_versions_after_submission(
@@ -124,37 +243,120 @@ def delete_draft_versions_after_submission(
     _run(query)
 
 
-def get_version_list(
+def get_version_page(
     work_id: str,
     version_type: Optional[str] = None,
     parent_version: Optional[int] = None,
-) -> list:
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Tuple[list, Optional[str]]:
     """
-    Get version list for a work.
+    Get one page of a work's version list, newest first.
 
     Args:
         work_id: Work ID
         version_type: 'submitted', 'draft', or None for all
         parent_version: Filter drafts by parent submission version
+        cursor: next_cursor from the previous page, or None for the first
+        limit: Page size, capped at VERSION_LIST_MAX_PAGE_SIZE
+
+    Returns:
+        (versions, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        BusinessError: validation_failed if cursor or limit is invalid
     """
-    is_submitted = None
+    query, page_size = _page_query(work_id, version_type, parent_version, cursor, limit)
+    return _paginate(_run(query) or [], page_size)
+
+
+async def get_version_page_async(
+    work_id: str,
+    version_type: Optional[str] = None,
+    parent_version: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Tuple[list, Optional[str]]:
+    """Async variant of get_version_page."""
+    query, page_size = _page_query(work_id, version_type, parent_version, cursor, limit)
+    return _paginate(await _run_async(query) or [], page_size)
+
+
+def _is_submitted_filter(version_type: Optional[str]) -> Optional[bool]:
     if version_type == "submitted":
-        is_submitted = True
-    elif version_type == "draft":
-        is_submitted = False
+        return True
+    if version_type == "draft":
+        return False
+    return None
+
 
+def _page_query(
+    work_id: str,
+    version_type: Optional[str],
+    parent_version: Optional[int],
+    cursor: Optional[str],
+    limit: Optional[int],
+) -> Tuple[Query, int]:
+    page_size = VERSION_LIST_PAGE_SIZE if limit is None else limit
+    if page_size < 1:
+        raise BusinessError("validation_failed", "limit must be at least 1")
+    page_size = min(page_size, VERSION_LIST_MAX_PAGE_SIZE)
     query = version_repo.get_versions_by_work(
         work_id=work_id,
-        is_submitted=is_submitted,
+        is_submitted=_is_submitted_filter(version_type),
         parent_submission_version=parent_version,
+        before_version=decode_version_cursor(cursor) if cursor else None,
+        # One extra row tells us whether another page follows.
+        limit=page_size + 1,
     )
-    return _run(query) or []
+    return query, page_size
+
+
+def _paginate(rows: list, page_size: int) -> Tuple[list, Optional[str]]:
+    if len(rows) <= page_size:
+        return rows, None
+    page = rows[:page_size]
+    return page, encode_version_cursor(page[-1]["version_number"])
+
+
+def encode_version_cursor(version_number: int) -> str:
+    """Encode the last version number of a page as an opaque cursor."""
+    raw = f"{_CURSOR_PREFIX}{version_number}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_version_cursor(cursor: str) -> int:
+    """
+    Decode a cursor from encode_version_cursor.
+
+    Raises:
+        BusinessError: validation_failed if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        if not raw.startswith(_CURSOR_PREFIX):
+            raise ValueError(raw)
+        version_number = int(raw[len(_CURSOR_PREFIX):])
+    except ValueError:
+        raise BusinessError("validation_failed", "invalid cursor")
+    if version_number < 1:
+        raise BusinessError("validation_failed", "invalid cursor")
+    return version_number
 
 
 def get_version_detail(work_id: str, version_number: int) -> Optional[Dict[str, Any]]:
     """Get detailed information for a specific version."""
     query = version_repo.get_version(work_id, version_number)
-    result = _run(query)
+    result = _materialize(_run(query))
+    if result is None:
+        raise BusinessError("not_found", "version not found")
+    return result
+
+
+async def get_version_detail_async(work_id: str, version_number: int) -> Dict[str, Any]:
+    """Async variant of get_version_detail."""
+    query = version_repo.get_version(work_id, version_number)
+    result = _materialize(await _run_async(query))
     if result is None:
         raise BusinessError("not_found", "version not found")
     return result
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.config import (
+    DATABASE_URL,
+    DB_ASYNC_POOL_MAX_SIZE,
+    DB_POOL_CHECK_ON_CHECKOUT,
+    DB_POOL_MAX_IDLE_SECONDS,
+    DB_POOL_MAX_LIFETIME_SECONDS,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+)
+from backend.storage.db import FETCH_MODES
+
+try:  # pragma: no cover - import guarding depends on environment
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # pragma: no cover
+    dict_row = None
+    AsyncConnectionPool = None
+
+Query = Dict[str, Any]
+AsyncQueryExecutor = Callable[[Query], Awaitable[Optional[Any]]]
+
+_POOL: Optional["AsyncConnectionPool"] = None
+_POOL_LOCK = asyncio.Lock()
+
+
+async def _get_pool() -> "AsyncConnectionPool":
+    global _POOL
+    if _POOL is None:
+        async with _POOL_LOCK:
+            if _POOL is None:
+                if AsyncConnectionPool is None:
+                    raise RuntimeError(
+                        "Async storage requires psycopg with psycopg_pool. "
+                        "Install psycopg[binary,pool]."
+                    )
+                # Sized apart from the sync pool in db.py; a process holds
+                # up to both maxima (see docs/general/env_contract.md).
+                pool = AsyncConnectionPool(
+                    DATABASE_URL,
+                    min_size=min(DB_POOL_MIN_SIZE, DB_ASYNC_POOL_MAX_SIZE),
+                    max_size=DB_ASYNC_POOL_MAX_SIZE,
+                    timeout=DB_POOL_TIMEOUT_SECONDS,
+                    max_idle=DB_POOL_MAX_IDLE_SECONDS,
+                    max_lifetime=DB_POOL_MAX_LIFETIME_SECONDS,
+                    kwargs={"row_factory": dict_row},
+                    check=(
+                        AsyncConnectionPool.check_connection
+                        if DB_POOL_CHECK_ON_CHECKOUT
+                        else None
+                    ),
+                    open=False,
+                )
+                await pool.open()
+                _POOL = pool
+    return _POOL
+
+
+async def close_async_pool() -> None:
+    """Close the async pool; the next query lazily opens a new one."""
+    global _POOL
+    pool, _POOL = _POOL, None
+    if pool is not None:
+        await pool.close()
+
+
+async def _fetch_result(cursor, fetch: str) -> Any:
+    if fetch == "none" or cursor.description is None:
+        return None
+    if fetch == "all":
+        return await cursor.fetchall()
+    row = await cursor.fetchone()
+    if fetch == "scalar":
+        return next(iter(row.values())) if row else None
+    return row
+
+
+async def execute_query_async(query: Query) -> Optional[Any]:
+    """Async counterpart of ``db.execute_query`` for the same query contracts."""
+    sql = query.get("sql")
+    params = query.get("params") or {}
+    if not sql:
+        raise ValueError("query missing sql")
+    fetch = query.get("fetch")
+    if fetch not in FETCH_MODES:
+        raise ValueError(f"query has invalid fetch mode: {fetch!r}")
+
+    pool = await _get_pool()
+    # The pool commits on clean exit and rolls back on error.
+    async with pool.connection() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return await _fetch_result(cursor, fetch)
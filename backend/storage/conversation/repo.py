@@ -1,9 +1,12 @@
 from typing import Any, Dict
 
 
-def _build_query(sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a portable SQL contract for the caller to execute."""
-    return {"sql": sql, "params": params}
+def _build_query(sql: str, params: Dict[str, Any], fetch: str) -> Dict[str, Any]:
+    """Return a portable SQL contract for the caller to execute.
+
+    ``fetch`` declares the result cardinality: one, all, scalar or none.
+    """
+    return {"sql": sql, "params": params, "fetch": fetch}
 
 
 def create_comment(work_id: str, user_email: str, content: str) -> Dict[str, Any]:
@@ -17,7 +20,7 @@ def create_comment(work_id: str, user_email: str, content: str) -> Dict[str, Any
         "user_email": user_email,
         "content": content,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="one")
 
 
 def list_comments(work_id: str, user_email: str) -> Dict[str, Any]:
@@ -28,4 +31,4 @@ def list_comments(work_id: str, user_email: str) -> Dict[str, Any]:
         "ORDER BY created_at ASC"
     )
     params = {"work_id": work_id, "user_email": user_email}
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="all")
@@ -1,52 +1,117 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
 
-from backend.config import DATABASE_URL
+from backend.config import (
+    DATABASE_URL,
+    DB_POOL_CHECK_ON_CHECKOUT,
+    DB_POOL_MAX_IDLE_SECONDS,
+    DB_POOL_MAX_LIFETIME_SECONDS,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+)
 
 try:  # pragma: no cover - import guarding depends on environment
-    import psycopg
     from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
 except ImportError:  # pragma: no cover
-    psycopg = None
     dict_row = None
-
-try:  # pragma: no cover - import guarding depends on environment
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-except ImportError:  # pragma: no cover
-    psycopg2 = None
-    RealDictCursor = None
+    ConnectionPool = None
 
 Query = Dict[str, Any]
+QueryExecutor = Callable[[Query], Optional[Any]]
+
+_POOL: Optional["ConnectionPool"] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> "ConnectionPool":
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                if ConnectionPool is None:
+                    raise RuntimeError(
+                        "Storage requires psycopg with psycopg_pool. "
+                        "Install psycopg[binary,pool]."
+                    )
+                pool = ConnectionPool(
+                    DATABASE_URL,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    timeout=DB_POOL_TIMEOUT_SECONDS,
+                    max_idle=DB_POOL_MAX_IDLE_SECONDS,
+                    max_lifetime=DB_POOL_MAX_LIFETIME_SECONDS,
+                    kwargs={"row_factory": dict_row},
+                    check=ConnectionPool.check_connection if DB_POOL_CHECK_ON_CHECKOUT else None,
+                    open=False,
+                )
+                # Opens min_size connections in the background
+                pool.open()
+                _POOL = pool
+    return _POOL
+
+
+def close_pool() -> None:
+    """Close pooled connections; the next query lazily opens a new pool."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
+
+
+FETCH_MODES = ("one", "all", "scalar", "none")
 
 
-def _fetch_result(cursor, sql: str) -> Any:
-    if cursor.description is None:
+def _fetch_mode(query: Query) -> str:
+    fetch = query.get("fetch")
+    if fetch not in FETCH_MODES:
+        raise ValueError(f"query has invalid fetch mode: {fetch!r}")
+    return fetch
+
+
+def _fetch_result(cursor, fetch: str) -> Any:
+    if fetch == "none" or cursor.description is None:
         return None
-    if "ORDER BY" in sql.upper():
+    if fetch == "all":
         return cursor.fetchall()
-    return cursor.fetchone()
+    row = cursor.fetchone()
+    if fetch == "scalar":
+        return next(iter(row.values())) if row else None
+    return row
 
 
-def execute_query(query: Query) -> Optional[Any]:
+def _execute(conn: Any, query: Query) -> Optional[Any]:
     sql = query.get("sql")
     params = query.get("params") or {}
     if not sql:
         raise ValueError("query missing sql")
+    fetch = _fetch_mode(query)
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return _fetch_result(cursor, fetch)
+
+
+def execute_query(query: Query) -> Optional[Any]:
+    # The pool commits on clean exit and rolls back on error.
+    with _get_pool().connection() as conn:
+        return _execute(conn, query)
+
+
+@contextmanager
+def transaction() -> Iterator[QueryExecutor]:
+    """Run every query issued through the yielded executor on one connection.
+
+    Commits once when the block exits cleanly and rolls back otherwise.
 
-    if psycopg is not None:
-        with psycopg.connect(DATABASE_URL, row_factory=dict_row) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(sql, params)
-                return _fetch_result(cursor, sql)
-
-    if psycopg2 is not None:
-        with psycopg2.connect(DATABASE_URL) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(sql, params)
-                result = _fetch_result(cursor, sql)
-            conn.commit()
-        return result
-
-    raise RuntimeError("No PostgreSQL driver found. Install psycopg or psycopg2.")
+    Example:
+        with transaction() as run:
+            run(version_repo.create_version(...))
+            run(work_repo.update_work_content(...))
+    """
+    with _get_pool().connection() as conn:
+        yield lambda query: _execute(conn, query)
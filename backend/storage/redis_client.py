@@ -0,0 +1,43 @@
+"""
+Process-wide Redis client backed by one bounded connection pool.
+
+Every module that talks to Redis (work locks, auto-save buffer, analysis
+queue, LLM cache) shares this client instead of building its own pool per
+call. When all REDIS_MAX_CONNECTIONS are busy, callers wait up to
+REDIS_POOL_TIMEOUT_SECONDS for one to free up rather than failing at once.
+"""
+
+import threading
+from typing import Optional
+
+import redis
+
+from backend.config import REDIS_MAX_CONNECTIONS, REDIS_POOL_TIMEOUT_SECONDS, REDIS_URL
+
+_CLIENT: Optional[redis.Redis] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> redis.Redis:
+    """Return the shared client, creating its pool on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                pool = redis.BlockingConnectionPool.from_url(
+                    REDIS_URL,
+                    decode_responses=True,
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    timeout=REDIS_POOL_TIMEOUT_SECONDS,
+                )
+                _CLIENT = redis.Redis(connection_pool=pool)
+    return _CLIENT
+
+
+def close_client() -> None:
+    """Disconnect pooled connections; the next call lazily opens a new pool."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        client, _CLIENT = _CLIENT, None
+    if client is not None:
+        client.connection_pool.disconnect()
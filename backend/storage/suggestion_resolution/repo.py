@@ -1,9 +1,12 @@
 from typing import Any, Dict, Optional
 
 
-def _build_query(sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a portable SQL contract for the caller to execute."""
-    return {"sql": sql, "params": params}
+def _build_query(sql: str, params: Dict[str, Any], fetch: str) -> Dict[str, Any]:
+    """Return a portable SQL contract for the caller to execute.
+
+    ``fetch`` declares the result cardinality: one, all, scalar or none.
+    """
+    return {"sql": sql, "params": params, "fetch": fetch}
 
 
 def create_resolution(
@@ -38,7 +41,7 @@ def create_resolution(
         "resolution_status": resolution_status,
         "llm_feedback": llm_feedback,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="one")
 
 
 def get_resolutions_by_analysis(analysis_id: str) -> Dict[str, Any]:
@@ -50,7 +53,7 @@ def get_resolutions_by_analysis(analysis_id: str) -> Dict[str, Any]:
         "WHERE analysis_id = %(analysis_id)s "
         "ORDER BY created_at"
     )
-    return _build_query(sql, {"analysis_id": analysis_id})
+    return _build_query(sql, {"analysis_id": analysis_id}, fetch="all")
 
 
 def get_resolutions_by_work(work_id: str) -> Dict[str, Any]:
@@ -62,7 +65,7 @@ def get_resolutions_by_work(work_id: str) -> Dict[str, Any]:
         "WHERE work_id = %(work_id)s "
         "ORDER BY from_version, created_at"
     )
-    return _build_query(sql, {"work_id": work_id})
+    return _build_query(sql, {"work_id": work_id}, fetch="all")
 
 
 def get_resolutions_between_versions(
@@ -83,4 +86,4 @@ def get_resolutions_between_versions(
         "from_version": from_version,
         "to_version": to_version,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="all")
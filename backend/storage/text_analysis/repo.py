@@ -1,9 +1,12 @@
 from typing import Any, Dict, Optional
 
 
-def _build_query(sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a portable SQL contract for the caller to execute."""
-    return {"sql": sql, "params": params}
+def _build_query(sql: str, params: Dict[str, Any], fetch: str) -> Dict[str, Any]:
+    """Return a portable SQL contract for the caller to execute.
+
+    ``fetch`` declares the result cardinality: one, all, scalar or none.
+    """
+    return {"sql": sql, "params": params, "fetch": fetch}
 
 
 def create_analysis(
@@ -36,7 +39,7 @@ def create_analysis(
         "reflection_comment": reflection_comment,
         "rubric_evaluation": rubric_evaluation,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="one")
 
 
 def get_analysis_by_version(work_id: str, version_number: int) -> Dict[str, Any]:
@@ -47,7 +50,7 @@ def get_analysis_by_version(work_id: str, version_number: int) -> Dict[str, Any]
         "FROM text_analyses "
         "WHERE work_id = %(work_id)s AND version_number = %(version_number)s"
     )
-    return _build_query(sql, {"work_id": work_id, "version_number": version_number})
+    return _build_query(sql, {"work_id": work_id, "version_number": version_number}, fetch="one")
 
 
 def get_analysis_by_id(analysis_id: str) -> Dict[str, Any]:
@@ -58,7 +61,7 @@ def get_analysis_by_id(analysis_id: str) -> Dict[str, Any]:
         "FROM text_analyses "
         "WHERE id = %(analysis_id)s"
     )
-    return _build_query(sql, {"analysis_id": analysis_id})
+    return _build_query(sql, {"analysis_id": analysis_id}, fetch="one")
 
 
 def get_latest_analysis(work_id: str) -> Dict[str, Any]:
@@ -70,4 +73,4 @@ def get_latest_analysis(work_id: str) -> Dict[str, Any]:
         "WHERE work_id = %(work_id)s "
         "ORDER BY version_number DESC LIMIT 1"
     )
-    return _build_query(sql, {"work_id": work_id})
+    return _build_query(sql, {"work_id": work_id}, fetch="one")
@@ -1,23 +1,64 @@
 from typing import Any, Dict
 
 
-def _build_query(sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a portable SQL contract for the caller to execute."""
-    return {"sql": sql, "params": params}
+def _build_query(sql: str, params: Dict[str, Any], fetch: str) -> Dict[str, Any]:
+    """Return a portable SQL contract for the caller to execute.
+
+    ``fetch`` declares the result cardinality: one, all, scalar or none.
+    """
+    return {"sql": sql, "params": params, "fetch": fetch}
 
 
 def create_user(email: str, username: str, password_hash: str) -> Dict[str, Any]:
+    """Insert a user in one round-trip, reporting a uniqueness conflict.
+
+    Returns ``{"id", "conflict"}``: ``conflict`` is 'email' or 'username'
+    when that value is already taken (id NULL). The unique constraints
+    still decide under concurrency: ON CONFLICT skips the insert, so a
+    signup that loses a race gets id NULL and conflict NULL.
+    """
     sql = (
+        "WITH conflict AS (SELECT CASE "
+        "WHEN EXISTS (SELECT 1 FROM users WHERE email = %(email)s) THEN 'email' "
+        "WHEN EXISTS (SELECT 1 FROM users WHERE username = %(username)s) THEN 'username' "
+        "END AS field), "
+        "created AS ("
         "INSERT INTO users (id, email, username, password_hash, created_at) "
-        "VALUES (gen_random_uuid(), %(email)s, %(username)s, %(password_hash)s, NOW()) "
-        "RETURNING id"
+        "SELECT gen_random_uuid(), %(email)s, %(username)s, %(password_hash)s, NOW() "
+        "FROM conflict WHERE field IS NULL "
+        "ON CONFLICT DO NOTHING "
+        "RETURNING id) "
+        "SELECT (SELECT id FROM created) AS id, (SELECT field FROM conflict) AS conflict"
     )
     params = {
         "email": email,
         "username": username,
         "password_hash": password_hash,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="one")
+
+
+def email_exists(email: str) -> Dict[str, Any]:
+    """Cheap availability probe (index-only, no row columns)."""
+    sql = "SELECT EXISTS (SELECT 1 FROM users WHERE email = %(email)s)"
+    return _build_query(sql, {"email": email}, fetch="scalar")
+
+
+def username_exists(username: str) -> Dict[str, Any]:
+    """Cheap availability probe (index-only, no row columns)."""
+    sql = "SELECT EXISTS (SELECT 1 FROM users WHERE username = %(username)s)"
+    return _build_query(sql, {"username": username}, fetch="scalar")
+
+
+def find_taken_field(email: str, username: str) -> Dict[str, Any]:
+    """Cheap probe naming the first taken value: 'email', 'username' or NULL."""
+    sql = (
+        "SELECT CASE "
+        "WHEN EXISTS (SELECT 1 FROM users WHERE email = %(email)s) THEN 'email' "
+        "WHEN EXISTS (SELECT 1 FROM users WHERE username = %(username)s) THEN 'username' "
+        "END AS taken_field"
+    )
+    return _build_query(sql, {"email": email, "username": username}, fetch="scalar")
 
 
 def get_user_by_email(email: str) -> Dict[str, Any]:
@@ -25,7 +66,7 @@ def get_user_by_email(email: str) -> Dict[str, Any]:
         "SELECT id, email, username, password_hash, created_at "
         "FROM users WHERE email = %(email)s"
     )
-    return _build_query(sql, {"email": email})
+    return _build_query(sql, {"email": email}, fetch="one")
 
 
 def get_user_by_username(username: str) -> Dict[str, Any]:
@@ -33,7 +74,7 @@ def get_user_by_username(username: str) -> Dict[str, Any]:
         "SELECT id, email, username, password_hash, created_at "
         "FROM users WHERE username = %(username)s"
     )
-    return _build_query(sql, {"username": username})
+    return _build_query(sql, {"username": username}, fetch="one")
 
 
 def update_password(email: str, password_hash: str) -> Dict[str, Any]:
@@ -42,10 +83,20 @@ def update_password(email: str, password_hash: str) -> Dict[str, Any]:
         "WHERE email = %(email)s"
     )
     params = {"email": email, "password_hash": password_hash}
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="none")
+
+
+def update_password_if_unchanged(email: str, old_hash: str, new_hash: str) -> Dict[str, Any]:
+    # Compare-and-set: a concurrent password change wins over a rehash.
+    sql = (
+        "UPDATE users SET password_hash = %(new_hash)s "
+        "WHERE email = %(email)s AND password_hash = %(old_hash)s"
+    )
+    params = {"email": email, "old_hash": old_hash, "new_hash": new_hash}
+    return _build_query(sql, params, fetch="none")
 
 
 def update_username(email: str, new_username: str) -> Dict[str, Any]:
     sql = "UPDATE users SET username = %(username)s WHERE email = %(email)s"
     params = {"email": email, "username": new_username}
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="none")
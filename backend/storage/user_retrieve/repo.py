@@ -1,11 +1,14 @@
 from typing import Any, Dict
 
 
-def _build_query(sql: str) -> Dict[str, Any]:
-    """Return a portable SQL contract for the caller to execute."""
-    return {"sql": sql, "params": {}}
+def _build_query(sql: str, fetch: str) -> Dict[str, Any]:
+    """Return a portable SQL contract for the caller to execute.
+
+    ``fetch`` declares the result cardinality: one, all, scalar or none.
+    """
+    return {"sql": sql, "params": {}, "fetch": fetch}
 
 
 def list_users_basic() -> Dict[str, Any]:
     sql = "SELECT email, username, created_at FROM users ORDER BY created_at DESC"
-    return _build_query(sql)
+    return _build_query(sql, fetch="all")
@@ -1,32 +1,99 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
-def _build_query(sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a portable SQL contract for the caller to execute."""
-    return {"sql": sql, "params": params}
+def _build_query(sql: str, params: Dict[str, Any], fetch: str) -> Dict[str, Any]:
+    """Return a portable SQL contract for the caller to execute.
+
+    ``fetch`` declares the result cardinality: one, all, scalar or none.
+    """
+    return {"sql": sql, "params": params, "fetch": fetch}
+
+
+# Writes that change a work's word_count or existence also adjust the
+# owner's user_stats row in the same statement, so the counters commit or
+# roll back together with the works row.
+_APPLY_WORD_COUNT_DELTA = (
+    "UPDATE user_stats SET total_word_count = user_stats.total_word_count + updated.delta, "
+    "updated_at = NOW() FROM updated WHERE user_stats.user_email = updated.user_email"
+)
+
+
+def _with_word_count_delta(update_sql: str) -> str:
+    # Lock the row before reading the old count so concurrent saves of the
+    # same work each apply their own delta.
+    return (
+        f"WITH updated AS ({update_sql} "
+        "RETURNING works.user_email, works.word_count - COALESCE(old.word_count, 0) AS delta) "
+        f"{_APPLY_WORD_COUNT_DELTA}"
+    )
+
+
+def _locked_old_row(conditions: str) -> str:
+    return (
+        "FROM (SELECT prior.id, prior.word_count FROM works AS prior "
+        f"WHERE {conditions} FOR UPDATE) AS old WHERE works.id = old.id"
+    )
 
 
 def create_work(user_email: str) -> Dict[str, Any]:
     sql = (
+        "WITH created AS ("
         "INSERT INTO works (id, user_email, content, updated_at, created_at) "
         "VALUES (gen_random_uuid(), %(user_email)s, '', NOW(), NOW()) "
-        "RETURNING id"
+        "RETURNING id, user_email), "
+        "counted AS ("
+        "INSERT INTO user_stats (user_email, project_count, total_word_count, updated_at) "
+        "SELECT user_email, 1, 0, NOW() FROM created "
+        "ON CONFLICT (user_email) DO UPDATE SET "
+        "project_count = user_stats.project_count + 1, updated_at = NOW()) "
+        "SELECT id FROM created"
     )
-    return _build_query(sql, {"user_email": user_email})
+    return _build_query(sql, {"user_email": user_email}, fetch="one")
 
 
 def update_work_content(work_id: str, user_email: str, content: str, word_count: int) -> Dict[str, Any]:
-    sql = (
+    sql = _with_word_count_delta(
         "UPDATE works SET content = %(content)s, word_count = %(word_count)s, updated_at = NOW() "
-        "WHERE id = %(work_id)s AND user_email = %(user_email)s"
+        + _locked_old_row("id = %(work_id)s AND user_email = %(user_email)s")
+    )
+    params = {
+        "content": content,
+        "word_count": word_count,
+        "work_id": work_id,
+        "user_email": user_email,
+    }
+    return _build_query(sql, params, fetch="none")
+
+
+def update_work_content_at_version(
+    work_id: str,
+    user_email: str,
+    content: str,
+    word_count: int,
+    base_version: int,
+    essay_prompt: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Write buffered auto-save content unless a version was saved since.
+
+    Matches no row once ``current_version`` has moved past ``base_version``.
+    """
+    sql = _with_word_count_delta(
+        "UPDATE works SET content = %(content)s, word_count = %(word_count)s, "
+        "essay_prompt = COALESCE(%(essay_prompt)s, works.essay_prompt), updated_at = NOW() "
+        + _locked_old_row(
+            "id = %(work_id)s AND user_email = %(user_email)s "
+            "AND current_version = %(base_version)s"
+        )
     )
     params = {
         "content": content,
         "word_count": word_count,
+        "essay_prompt": essay_prompt,
         "work_id": work_id,
         "user_email": user_email,
+        "base_version": base_version,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="none")
 
 
 def update_essay_prompt(work_id: str, user_email: str, essay_prompt: str) -> Dict[str, Any]:
@@ -40,7 +107,7 @@ def update_essay_prompt(work_id: str, user_email: str, essay_prompt: str) -> Dic
         "work_id": work_id,
         "user_email": user_email,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="none")
 
 
 def update_title(work_id: str, user_email: str, title: str) -> Dict[str, Any]:
@@ -54,7 +121,7 @@ def update_title(work_id: str, user_email: str, title: str) -> Dict[str, Any]:
         "work_id": work_id,
         "user_email": user_email,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="none")
 
 
 def update_rubric(work_id: str, rubric_json: str) -> Dict[str, Any]:
@@ -67,10 +134,17 @@ def update_rubric(work_id: str, rubric_json: str) -> Dict[str, Any]:
         "rubric": rubric_json,
         "work_id": work_id,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="none")
 
 
 def delete_work(work_id: str, user_email: str) -> Dict[str, Any]:
     """Delete a work (cascade deletes related records)."""
-    sql = "DELETE FROM works WHERE id = %(work_id)s AND user_email = %(user_email)s"
-    return _build_query(sql, {"work_id": work_id, "user_email": user_email})
+    sql = (
+        "WITH deleted AS ("
+        "DELETE FROM works WHERE id = %(work_id)s AND user_email = %(user_email)s "
+        "RETURNING user_email, word_count) "
+        "UPDATE user_stats SET project_count = user_stats.project_count - 1, "
+        "total_word_count = user_stats.total_word_count - COALESCE(deleted.word_count, 0), "
+        "updated_at = NOW() FROM deleted WHERE user_stats.user_email = deleted.user_email"
+    )
+    return _build_query(sql, {"work_id": work_id, "user_email": user_email}, fetch="none")
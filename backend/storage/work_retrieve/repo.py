@@ -1,9 +1,13 @@
-from typing import Any, Dict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 
 
-def _build_query(sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a portable SQL contract for the caller to execute."""
-    return {"sql": sql, "params": params}
+def _build_query(sql: str, params: Dict[str, Any], fetch: str) -> Dict[str, Any]:
+    """Return a portable SQL contract for the caller to execute.
+
+    ``fetch`` declares the result cardinality: one, all, scalar or none.
+    """
+    return {"sql": sql, "params": params, "fetch": fetch}
 
 
 def get_work(work_id: str, user_email: str) -> Dict[str, Any]:
@@ -12,31 +16,70 @@ def get_work(work_id: str, user_email: str) -> Dict[str, Any]:
         "FROM works WHERE id = %(work_id)s AND user_email = %(user_email)s"
     )
     params = {"work_id": work_id, "user_email": user_email}
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="one")
+
+
+def probe_work(work_id: str, user_email: str) -> Dict[str, Any]:
+    """Check that the user owns a work without reading its large columns."""
+    sql = (
+        "SELECT id, current_version "
+        "FROM works WHERE id = %(work_id)s AND user_email = %(user_email)s"
+    )
+    params = {"work_id": work_id, "user_email": user_email}
+    return _build_query(sql, params, fetch="one")
+
+
+def list_works(
+    user_email: str,
+    before: Optional[Tuple[datetime, str]] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """List a user's works, most recently updated first, without content.
+
+    ``before`` is the (updated_at, id) of the last work on the previous
+    page; with ``limit`` this pages by keyset over idx_works_user_updated.
+    """
+    conditions = ["user_email = %(user_email)s"]
+    params: Dict[str, Any] = {"user_email": user_email}
+    if before is not None:
+        conditions.append("(updated_at, id) < (%(before_updated_at)s, %(before_id)s)")
+        params["before_updated_at"], params["before_id"] = before
+    sql = (
+        "SELECT id, updated_at, created_at, word_count, title "
+        f"FROM works WHERE {' AND '.join(conditions)} "
+        "ORDER BY updated_at DESC, id DESC"
+    )
+    if limit is not None:
+        sql += " LIMIT %(limit)s"
+        params["limit"] = limit
+    return _build_query(sql, params, fetch="all")
+
 
+def get_user_stats(user_email: str) -> Dict[str, Any]:
+    """Read a user's maintained totals (one primary-key lookup, no scan).
 
-def list_works(user_email: str) -> Dict[str, Any]:
+    Returns no row for a user who has never created a work.
+    """
     sql = (
-        "SELECT id, user_email, content, updated_at, created_at, word_count, title "
-        "FROM works WHERE user_email = %(user_email)s "
-        "ORDER BY updated_at DESC"
+        "SELECT project_count, total_word_count "
+        "FROM user_stats WHERE user_email = %(user_email)s"
     )
-    return _build_query(sql, {"user_email": user_email})
+    return _build_query(sql, {"user_email": user_email}, fetch="one")
 
 
 def get_total_word_count(user_email: str) -> Dict[str, Any]:
     """Get total word count across all works for a user."""
     sql = (
-        "SELECT COALESCE(SUM(word_count), 0) as total_word_count "
-        "FROM works WHERE user_email = %(user_email)s"
+        "SELECT COALESCE((SELECT total_word_count FROM user_stats "
+        "WHERE user_email = %(user_email)s), 0) as total_word_count"
     )
-    return _build_query(sql, {"user_email": user_email})
+    return _build_query(sql, {"user_email": user_email}, fetch="scalar")
 
 
 def get_total_project_count(user_email: str) -> Dict[str, Any]:
     """Get total number of projects (works) for a user."""
     sql = (
-        "SELECT COUNT(*) as total_project_count "
-        "FROM works WHERE user_email = %(user_email)s"
+        "SELECT COALESCE((SELECT project_count FROM user_stats "
+        "WHERE user_email = %(user_email)s), 0) as total_project_count"
     )
-    return _build_query(sql, {"user_email": user_email})
+    return _build_query(sql, {"user_email": user_email}, fetch="scalar")
@@ -1,50 +1,85 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
-def _build_query(sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a portable SQL contract for the caller to execute."""
-    return {"sql": sql, "params": params}
+def _build_query(sql: str, params: Dict[str, Any], fetch: str) -> Dict[str, Any]:
+    """Return a portable SQL contract for the caller to execute.
+
+    ``fetch`` declares the result cardinality: one, all, scalar or none.
+    """
+    return {"sql": sql, "params": params, "fetch": fetch}
 
 
 def create_version(
     work_id: str,
     user_email: str,
-    version_number: int,
-    content: str,
+    content: Optional[str],
     is_submitted: bool,
     parent_submission_version: Optional[int],
     user_reflection: Optional[str],
     change_type: str,
+    storage_kind: str = "full",
+    base_version: Optional[int] = None,
+    content_delta: Optional[str] = None,
+    content_preview: Optional[str] = None,
+    word_count: Optional[int] = None,
 ) -> Dict[str, Any]:
-    """Create a new work version record."""
+    """Allocate the next version number and insert the version in one statement.
+
+    Bumping ``works.current_version`` row-locks the work, so concurrent
+    saves serialize instead of colliding on (work_id, version_number).
+    Returns no row if the work does not exist.
+
+    Full rows carry ``content``; delta rows carry ``content_delta`` against
+    the full row ``base_version`` and leave ``content`` NULL. Every row
+    carries ``content_preview`` and ``word_count`` for the version list.
+    """
     sql = (
+        "WITH allocated AS ("
+        "UPDATE works SET current_version = current_version + 1, updated_at = NOW() "
+        "WHERE id = %(work_id)s "
+        "RETURNING current_version"
+        ") "
         "INSERT INTO work_versions "
         "(work_id, user_email, version_number, content, is_submitted, "
-        "parent_submission_version, user_reflection, change_type, created_at) "
-        "VALUES (%(work_id)s, %(user_email)s, %(version_number)s, %(content)s, "
+        "parent_submission_version, user_reflection, change_type, "
+        "storage_kind, base_version, content_delta, content_preview, word_count, created_at) "
+        "SELECT %(work_id)s, %(user_email)s, allocated.current_version, %(content)s, "
         "%(is_submitted)s, %(parent_submission_version)s, %(user_reflection)s, "
-        "%(change_type)s, NOW()) "
+        "%(change_type)s, %(storage_kind)s, %(base_version)s, %(content_delta)s, "
+        "%(content_preview)s, %(word_count)s, NOW() "
+        "FROM allocated "
         "RETURNING id, version_number, created_at"
     )
     params = {
         "work_id": work_id,
         "user_email": user_email,
-        "version_number": version_number,
         "content": content,
         "is_submitted": is_submitted,
         "parent_submission_version": parent_submission_version,
         "user_reflection": user_reflection,
         "change_type": change_type,
+        "storage_kind": storage_kind,
+        "base_version": base_version,
+        "content_delta": content_delta,
+        "content_preview": content_preview,
+        "word_count": word_count,
     }
-    return _build_query(sql, params)
+    return _build_query(sql, params, fetch="one")
 
 
 def get_versions_by_work(
     work_id: str,
     is_submitted: Optional[bool] = None,
     parent_submission_version: Optional[int] = None,
+    before_version: Optional[int] = None,
+    limit: Optional[int] = None,
 ) -> Dict[str, Any]:
-    """Get version list for a work, optionally filtered by type."""
+    """Get version list for a work, optionally filtered by type.
+
+    ``before_version`` and ``limit`` page through the list newest first
+    (keyset pagination), walking idx_work_versions_work_version without a
+    sort. Only narrow columns are read; ``content`` is never detoasted.
+    """
     conditions = ["work_id = %(work_id)s"]
     params: Dict[str, Any] = {"work_id": work_id}
 
@@ -56,29 +91,43 @@ def get_versions_by_work(
         conditions.append("parent_submission_version = %(parent_submission_version)s")
         params["parent_submission_version"] = parent_submission_version
 
+    if before_version is not None:
+        conditions.append("version_number < %(before_version)s")
+        params["before_version"] = before_version
+
     where_clause = " AND ".join(conditions)
 
     sql = (
         f"SELECT id, work_id, user_email, version_number, "
-        f"LEFT(content, 100) as content_preview, is_submitted, "
+        f"content_preview, word_count, is_submitted, "
         f"parent_submission_version, change_type, created_at "
         f"FROM work_versions "
         f"WHERE {where_clause} "
         f"ORDER BY version_number DESC"
     )
-    return _build_query(sql, params)
+    if limit is not None:
+        sql += " LIMIT %(limit)s"
+        params["limit"] = limit
+    return _build_query(sql, params, fetch="all")
 
 
 def get_version(work_id: str, version_number: int) -> Dict[str, Any]:
-    """Get a specific version by work_id and version_number."""
+    """Get a specific version by work_id and version_number.
+
+    Delta rows come back with their base snapshot's content as
+    ``base_content`` so the caller can rebuild them in one round-trip.
+    """
     sql = (
-        "SELECT id, work_id, user_email, version_number, content, "
-        "is_submitted, parent_submission_version, user_reflection, "
-        "change_type, created_at "
-        "FROM work_versions "
-        "WHERE work_id = %(work_id)s AND version_number = %(version_number)s"
+        "SELECT v.id, v.work_id, v.user_email, v.version_number, v.content, "
+        "v.is_submitted, v.parent_submission_version, v.user_reflection, "
+        "v.change_type, v.created_at, v.storage_kind, v.content_delta, "
+        "b.content AS base_content "
+        "FROM work_versions v "
+        "LEFT JOIN work_versions b "
+        "ON b.work_id = v.work_id AND b.version_number = v.base_version "
+        "WHERE v.work_id = %(work_id)s AND v.version_number = %(version_number)s"
     )
-    return _build_query(sql, {"work_id": work_id, "version_number": version_number})
+    return _build_query(sql, {"work_id": work_id, "version_number": version_number}, fetch="one")
 
 
 def get_latest_submitted_version(work_id: str) -> Dict[str, Any]:
@@ -91,7 +140,65 @@ def get_latest_submitted_version(work_id: str) -> Dict[str, Any]:
         "WHERE work_id = %(work_id)s AND is_submitted = true "
         "ORDER BY version_number DESC LIMIT 1"
     )
-    return _build_query(sql, {"work_id": work_id})
+    return _build_query(sql, {"work_id": work_id}, fetch="one")
+
+
+def get_latest_snapshot(work_id: str) -> Dict[str, Any]:
+    """Get the id and number of a work's newest full version and how many
+    deltas use it, without its content (see get_snapshot_content)."""
+    sql = (
+        "SELECT s.id, s.version_number, "
+        "(SELECT COUNT(*) FROM work_versions d "
+        "WHERE d.work_id = s.work_id AND d.base_version = s.version_number) AS delta_count "
+        "FROM work_versions s "
+        "WHERE s.work_id = %(work_id)s AND s.storage_kind = 'full' "
+        "ORDER BY s.version_number DESC LIMIT 1"
+    )
+    return _build_query(sql, {"work_id": work_id}, fetch="one")
+
+
+def get_snapshot_content(version_id: str) -> Dict[str, Any]:
+    """Get the content of a full version by row id."""
+    sql = "SELECT content FROM work_versions WHERE id = %(version_id)s"
+    return _build_query(sql, {"version_id": version_id}, fetch="scalar")
+
+
+def list_versions_missing_summary(after_id: Optional[str], limit: int) -> Dict[str, Any]:
+    """Get a batch of versions without content_preview or word_count, by id.
+
+    Delta rows come back with ``base_content`` like ``get_version``.
+    """
+    conditions = ["(v.content_preview IS NULL OR v.word_count IS NULL)"]
+    params: Dict[str, Any] = {"limit": limit}
+    if after_id is not None:
+        conditions.append("v.id > %(after_id)s")
+        params["after_id"] = after_id
+    sql = (
+        "SELECT v.id, v.content, v.storage_kind, v.content_delta, "
+        "b.content AS base_content "
+        "FROM work_versions v "
+        "LEFT JOIN work_versions b "
+        "ON b.work_id = v.work_id AND b.version_number = v.base_version "
+        f"WHERE {' AND '.join(conditions)} "
+        "ORDER BY v.id LIMIT %(limit)s"
+    )
+    return _build_query(sql, params, fetch="all")
+
+
+def set_version_summaries(
+    ids: List[str], previews: List[str], word_counts: List[int]
+) -> Dict[str, Any]:
+    """Write content_preview and word_count for a batch of versions."""
+    sql = (
+        "UPDATE work_versions AS v "
+        "SET content_preview = s.content_preview, word_count = s.word_count "
+        "FROM (SELECT UNNEST(%(ids)s::uuid[]) AS id, "
+        "UNNEST(%(previews)s::text[]) AS content_preview, "
+        "UNNEST(%(word_counts)s::int[]) AS word_count) AS s "
+        "WHERE v.id = s.id"
+    )
+    params = {"ids": ids, "previews": previews, "word_counts": word_counts}
+    return _build_query(sql, params, fetch="none")
 
 
 def delete_draft_versions_after(work_id: str, parent_version: int) -> Dict[str, Any]:
@@ -102,19 +209,11 @@ def delete_draft_versions_after(work_id: str, parent_version: int) -> Dict[str,
         "AND is_submitted = false "
         "AND parent_submission_version = %(parent_version)s"
     )
-    return _build_query(sql, {"work_id": work_id, "parent_version": parent_version})
+    return _build_query(sql, {"work_id": work_id, "parent_version": parent_version}, fetch="none")
 
 
 def get_current_version_number(work_id: str) -> Dict[str, Any]:
     """Get the current version number for a work."""
     sql = "SELECT current_version FROM works WHERE id = %(work_id)s"
-    return _build_query(sql, {"work_id": work_id})
+    return _build_query(sql, {"work_id": work_id}, fetch="scalar")
 
-
-def update_current_version(work_id: str, version_number: int) -> Dict[str, Any]:
-    """Update the current_version field in works table."""
-    sql = (
-        "UPDATE works SET current_version = %(version_number)s, updated_at = NOW() "
-        "WHERE id = %(work_id)s"
-    )
-    return _build_query(sql, {"work_id": work_id, "version_number": version_number})
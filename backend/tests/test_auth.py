@@ -7,7 +7,17 @@ def _make_executor(store):
     def executor(query):
         sql = query["sql"]
         params = query["params"]
+        if "AS taken_field" in sql:
+            if params["email"] in store:
+                return "email"
+            if any(user["username"] == params["username"] for user in store.values()):
+                return "username"
+            return None
         if "INSERT INTO users" in sql:
+            if params["email"] in store:
+                return {"id": None, "conflict": "email"}
+            if any(user["username"] == params["username"] for user in store.values()):
+                return {"id": None, "conflict": "username"}
             user_id = f"user-{len(store)}"
             store[params["email"]] = {
                 "id": user_id,
@@ -15,7 +25,7 @@ def _make_executor(store):
                 "username": params["username"],
                 "password_hash": params["password_hash"],
             }
-            return {"id": user_id}
+            return {"id": user_id, "conflict": None}
         if "FROM users WHERE email" in sql:
             return store.get(params["email"])
         if "FROM users WHERE username" in sql:
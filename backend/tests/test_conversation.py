@@ -26,7 +26,7 @@ def _make_executor(store):
 def test_add_and_list_comments(monkeypatch):
     store = []
     manager.set_query_executor(_make_executor(store))
-    monkeypatch.setattr(work_manager, "get_work", lambda *_: {"id": "w1"})
+    monkeypatch.setattr(work_manager, "verify_work_owner", lambda *_: None)
     comment_id = manager.add_comment("w1", "a@b.com", "hi")
     assert comment_id is not None
     items = manager.list_comments("w1", "a@b.com")
@@ -36,7 +36,7 @@ def test_add_and_list_comments(monkeypatch):
 def test_add_comment_requires_work(monkeypatch):
     store = []
     manager.set_query_executor(_make_executor(store))
-    monkeypatch.setattr(work_manager, "get_work", lambda *_: (_ for _ in ()).throw(
+    monkeypatch.setattr(work_manager, "verify_work_owner", lambda *_: (_ for _ in ()).throw(
         BusinessError("not_found", "work not found")
     ))
     try:
@@ -1,6 +1,7 @@
 from fastapi.testclient import TestClient
 
 from backend.api.auth import deps as auth_deps
+from backend.api.llm import router as llm_router
 from backend.errors import BusinessError
 from backend.main import app
 from backend.modules.conversation import manager as conversation_manager
@@ -42,3 +43,25 @@ def test_llm_comment_failure(monkeypatch):
     )
     assert response.status_code == 502
     app.dependency_overrides.clear()
+
+
+def test_llm_comment_stream(monkeypatch):
+    app.dependency_overrides[auth_deps.require_user] = lambda: {
+        "email": "a@b.com",
+        "username": "usera",
+    }
+    saved = []
+    monkeypatch.setattr(llm_router, "stream_comment", lambda *_: iter(["o", "k"]))
+    monkeypatch.setattr(llm_router, "add_comment", lambda *args: saved.append(args))
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/llm/comment/stream",
+        json={"work_id": "w1", "text_snapshot": "hello"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert 'event: delta\ndata: {"text": "o"}' in response.text
+    assert 'event: done\ndata: {"comment": "ok"}' in response.text
+    assert saved == [("w1", "a@b.com", "ok")]
+    app.dependency_overrides.clear()
@@ -1,5 +1,5 @@
 from backend.errors import BusinessError
-from backend.modules.work import manager
+from backend.modules.work import autosave, manager
 from backend.modules.session_lock import lock as session_lock
 
 
@@ -36,6 +36,7 @@ def _make_executor(store):
 def test_create_list_get_update(monkeypatch):
     store = {}
     manager.set_query_executor(_make_executor(store))
+    autosave.set_backend(autosave.InMemoryAutosaveBuffer())
     monkeypatch.setattr(session_lock, "acquire_lock", lambda *_: True)
     monkeypatch.setattr(session_lock, "refresh_lock", lambda *_: True)
 
@@ -46,7 +47,10 @@ def test_create_list_get_update(monkeypatch):
     work = manager.get_work(work_id, "a@b.com")
     assert work["id"] == work_id
     manager.update_work(work_id, "a@b.com", "hello", "device-1")
+    assert autosave.apply_pending(manager.get_work(work_id, "a@b.com"))["content"] == "hello"
+    assert autosave.flush(work_id)
     assert store[work_id]["content"] == "hello"
+    autosave.set_backend(None)
 
 
 def test_update_lock_conflict(monkeypatch):
@@ -75,3 +75,26 @@ export async function signupApi(
     })
   });
 }
+
+export type Availability = {
+  emailTaken: boolean | null;
+  usernameTaken: boolean | null;
+};
+
+export async function checkAvailabilityApi(
+  email?: string,
+  username?: string
+): Promise<Availability> {
+  const params = new URLSearchParams();
+  if (email) {
+    params.set('email', email);
+  }
+  if (username) {
+    params.set('username', username);
+  }
+  const payload = await requestJson<{
+    email_taken: boolean | null;
+    username_taken: boolean | null;
+  }>(`/api/auth/availability?${params.toString()}`);
+  return { emailTaken: payload.email_taken, usernameTaken: payload.username_taken };
+}
@@ -2,7 +2,7 @@ import { useEffect, useState } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { WorkCard } from '../../components/modal/WorkCard';
 import { useAuthSession } from '../auth/session/AuthSessionContext';
-import { getTotalProjectCount, getTotalWordCount, listWorks } from '../works/api/workApi';
+import { getWorkStats, listWorks } from '../works/api/workApi';
 import { createLocalWork } from '../works/localWorkStorage';
 import { WorkSummary } from '../works/types/workContract';
 import './HomePage.css';
@@ -23,13 +23,9 @@ export function HomePage() {
 
     async function loadStats() {
       try {
-        const [projects, words, works] = await Promise.all([
-          getTotalProjectCount(),
-          getTotalWordCount(),
-          listWorks()
-        ]);
-        setProjectCount(projects);
-        setWordCount(words);
+        const [stats, works] = await Promise.all([getWorkStats(), listWorks()]);
+        setProjectCount(stats.totalProjectCount);
+        setWordCount(stats.totalWordCount);
 
         // Get most recently updated work (list is already sorted by updated_at DESC)
         setRecentWork(works[0] ?? null);
@@ -105,9 +101,10 @@ export function HomePage() {
                       // Refresh after delete
                       const works = await listWorks();
                       setRecentWork(works[0] ?? null);
-                      // Update project count
-                      const count = await getTotalProjectCount();
-                      setProjectCount(count);
+                      // Update counts
+                      const stats = await getWorkStats();
+                      setProjectCount(stats.totalProjectCount);
+                      setWordCount(stats.totalWordCount);
                     }}
                     onRename={async () => {
                       // Refresh after rename
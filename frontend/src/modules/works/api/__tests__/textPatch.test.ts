@@ -0,0 +1,21 @@
+import { describe, expect, it } from 'vitest';
+import { contentHash, diffToPatch } from '../textPatch';
+
+describe('textPatch', () => {
+  it('produces one replacement covering the changed region', () => {
+    expect(diffToPatch('The cat sat.', 'The dog sat.')).toEqual([
+      { start: 4, end: 7, text: 'dog' }
+    ]);
+    expect(diffToPatch('same', 'same')).toEqual([]);
+  });
+
+  it('counts offsets in code points', () => {
+    expect(diffToPatch('😀 a', '😀 ab')).toEqual([{ start: 3, end: 3, text: 'b' }]);
+  });
+
+  it('hashes like the server', async () => {
+    expect(await contentHash('hello')).toBe(
+      '2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824'
+    );
+  });
+});
@@ -0,0 +1,40 @@
+export type TextPatchOp = {
+  start: number;
+  end: number;
+  text: string;
+};
+
+// Offsets are Unicode code points to match the server, not UTF-16 units.
+export function diffToPatch(before: string, after: string): TextPatchOp[] {
+  const a = Array.from(before);
+  const b = Array.from(after);
+  let prefix = 0;
+  while (prefix < a.length && prefix < b.length && a[prefix] === b[prefix]) {
+    prefix += 1;
+  }
+  let suffix = 0;
+  while (
+    suffix < a.length - prefix &&
+    suffix < b.length - prefix &&
+    a[a.length - 1 - suffix] === b[b.length - 1 - suffix]
+  ) {
+    suffix += 1;
+  }
+  if (prefix === a.length && prefix === b.length) {
+    return [];
+  }
+  return [
+    {
+      start: prefix,
+      end: a.length - suffix,
+      text: b.slice(prefix, b.length - suffix).join('')
+    }
+  ];
+}
+
+export async function contentHash(text: string): Promise<string> {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('');
+}
@@ -20,6 +20,7 @@ import {
   WorkVersionList
 } from '../types/workContract';
 import { getStoredToken, handleSessionExpired } from '../../auth/session/tokenStore';
+import { TextPatchOp, contentHash, diffToPatch } from './textPatch';
 
 type ApiErrorPayload = {
   code?: string;
@@ -152,11 +153,43 @@ export async function createWork(): Promise<string> {
   return payload.work_id;
 }
 
+const WORK_PAGE_SIZE = 200;
+
 export async function listWorks(): Promise<WorkSummary[]> {
-  const payload = await requestJson<{ items: Array<{ work_id: string; updated_at: string; title?: string }> }>(
-    '/api/work/list'
+  type WorkPage = {
+    items: Array<{ work_id: string; updated_at: string; title?: string }>;
+    next_cursor?: string | null;
+  };
+
+  const params = new URLSearchParams();
+  params.set('limit', String(WORK_PAGE_SIZE));
+  const items: WorkPage['items'] = [];
+  let cursor: string | null | undefined;
+  do {
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+    const page = await requestJson<WorkPage>(`/api/work/list?${params.toString()}`);
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+
+  return fromApiWorkList(items);
+}
+
+export type WorkStats = {
+  totalWordCount: number;
+  totalProjectCount: number;
+};
+
+export async function getWorkStats(): Promise<WorkStats> {
+  const payload = await requestJson<{ total_word_count: number; total_project_count: number }>(
+    '/api/work/stats'
   );
-  return fromApiWorkList(payload.items);
+  return {
+    totalWordCount: payload.total_word_count,
+    totalProjectCount: payload.total_project_count
+  };
 }
 
 export async function getTotalWordCount(): Promise<number> {
@@ -221,6 +254,121 @@ export async function updateWork(
   return result;
 }
 
+export async function patchWork(
+  workId: string,
+  input: { deviceId: string; baseHash: string; ops: TextPatchOp[]; essayPrompt?: string }
+): Promise<{ contentHash: string; wordCount: number }> {
+  const payload = await requestJson<{ ok: boolean; content_hash: string; word_count: number }>(
+    `/api/work/${workId}/patch`,
+    {
+      method: 'POST',
+      body: JSON.stringify({
+        device_id: input.deviceId,
+        base_hash: input.baseHash,
+        ops: input.ops,
+        essay_prompt: input.essayPrompt
+      })
+    }
+  );
+  invalidateWorkCache(workId);
+  return { contentHash: payload.content_hash, wordCount: payload.word_count };
+}
+
+/**
+ * Auto-save only the changed region of `input.content` relative to
+ * `previous` (the last content the server acknowledged). Falls back to a
+ * full update when the server no longer has `previous`.
+ */
+export async function autoSaveWork(
+  workId: string,
+  previous: string,
+  input: WorkUpdateInput
+): Promise<void> {
+  const ops = diffToPatch(previous, input.content);
+  if (ops.length === 0) {
+    return;
+  }
+  try {
+    await patchWork(workId, {
+      deviceId: input.deviceId,
+      baseHash: await contentHash(previous),
+      ops,
+      essayPrompt: input.essayPrompt
+    });
+  } catch (error) {
+    if (!(error instanceof ApiRequestError) || error.code !== 'conflict') {
+      throw error;
+    }
+    await updateWork(workId, { ...input, autoSave: true });
+  }
+}
+
+export async function releaseWork(workId: string, deviceId: string): Promise<void> {
+  // keepalive lets the request finish while the page is unloading.
+  await requestJson<{ ok: boolean }>(`/api/work/${workId}/release`, {
+    method: 'POST',
+    keepalive: true,
+    body: JSON.stringify({ device_id: deviceId })
+  });
+  invalidateWorkCache(workId);
+}
+
+export async function heartbeatWork(workId: string, deviceId: string): Promise<boolean> {
+  const payload = await requestJson<{ held: boolean; expires_in: number }>(
+    `/api/work/${workId}/heartbeat`,
+    {
+      method: 'POST',
+      body: JSON.stringify({ device_id: deviceId })
+    }
+  );
+  return payload.held;
+}
+
+/**
+ * Follow lock-holder changes until the server closes the stream or
+ * `signal` aborts. `onHolder` receives null when the lock is free.
+ */
+export async function watchWorkLock(
+  workId: string,
+  onHolder: (holder: string | null) => void,
+  signal: AbortSignal
+): Promise<void> {
+  const token = getStoredToken();
+  const headers = new Headers();
+  if (token) {
+    headers.set('Authorization', `Bearer ${token}`);
+  }
+
+  const response = await fetch(`${getApiBaseUrl()}/api/work/${workId}/lock/events`, {
+    headers,
+    signal
+  });
+  if (!response.ok || !response.body) {
+    throw new ApiRequestError(`Request failed with status ${response.status}`, response.status);
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) {
+      return;
+    }
+    buffer += value;
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const event = /^event: (.*)$/m.exec(block)?.[1];
+      const data = /^data: (.*)$/m.exec(block)?.[1];
+      if (event === 'lock' && data) {
+        onHolder((JSON.parse(data) as { holder: string | null }).holder);
+      }
+      boundary = buffer.indexOf('\n\n');
+    }
+  }
+}
+
 export async function submitWork(
   workId: string,
   input: WorkSubmitInput
@@ -243,6 +391,8 @@ export async function submitWork(
   return fromApiSubmitResponse(payload);
 }
 
+const VERSION_PAGE_SIZE = 200;
+
 export async function getVersionList(
   workId: string,
   type: 'all' | 'submitted' | 'draft' = 'all',
@@ -250,11 +400,12 @@ export async function getVersionList(
 ): Promise<WorkVersionList> {
   const params = new URLSearchParams();
   params.set('type', type);
+  params.set('limit', String(VERSION_PAGE_SIZE));
   if (type === 'draft' && typeof parent === 'number') {
     params.set('parent', String(parent));
   }
 
-  const payload = await requestJson<{
+  type VersionPage = {
     current_version: number;
     versions: Array<{
       version_number: number;
@@ -263,9 +414,20 @@ export async function getVersionList(
       change_type: string;
       created_at: string;
     }>;
-  }>(`/api/work/${workId}/versions?${params.toString()}`);
+    next_cursor?: string | null;
+  };
+
+  const payload = await requestJson<VersionPage>(`/api/work/${workId}/versions?${params.toString()}`);
+  const versions = [...payload.versions];
+  let cursor = payload.next_cursor;
+  while (cursor) {
+    params.set('cursor', cursor);
+    const page = await requestJson<VersionPage>(`/api/work/${workId}/versions?${params.toString()}`);
+    versions.push(...page.versions);
+    cursor = page.next_cursor;
+  }
 
-  return fromApiVersionList(payload);
+  return fromApiVersionList({ current_version: payload.current_version, versions });
 }
 
 export async function getVersionDetail(
@@ -339,11 +501,44 @@ export async function renameWork(workId: string, title: string): Promise<void> {
   invalidateWorkCache(workId);
 }
 
+type AnalysisStatus = {
+  status: 'queued' | 'running' | 'done' | 'failed';
+  analysis_id?: string;
+  attempts: number;
+  error?: string;
+};
+
+const ANALYSIS_POLL_INTERVAL_MS = 2000;
+
+export async function getAnalysisStatus(
+  workId: string,
+  versionNumber: number
+): Promise<AnalysisStatus> {
+  return requestJson<AnalysisStatus>(
+    `/api/work/${workId}/versions/${versionNumber}/analysis_status`
+  );
+}
+
+async function waitForAnalysis(workId: string, versionNumber: number): Promise<string | undefined> {
+  for (;;) {
+    const status = await getAnalysisStatus(workId, versionNumber);
+    if (status.status === 'done') {
+      return status.analysis_id;
+    }
+    if (status.status === 'failed') {
+      throw new ApiRequestError(status.error || 'Analysis failed', 502, 'llm_failed');
+    }
+    await new Promise((resolve) => setTimeout(resolve, ANALYSIS_POLL_INTERVAL_MS));
+  }
+}
+
 export async function submitAndFetchAnalysis(
   workId: string,
   input: WorkSubmitInput
 ): Promise<SubmitAndFetchAnalysisResult> {
-  const submit = await submitWork(workId, input);
+  const submitted = await submitWork(workId, input);
+  const analysisId = submitted.analysisId ?? (await waitForAnalysis(workId, submitted.version));
+  const submit = { ...submitted, analysisId };
   const versionDetail = await getVersionDetail(workId, submit.version);
 
   return {
@@ -1,12 +1,16 @@
 import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import {
   ApiRequestError,
+  autoSaveWork,
   getVersionDetail,
   getVersionList,
   getWork,
+  heartbeatWork,
+  releaseWork,
   revertToVersion,
   submitAndFetchAnalysis,
-  updateWork
+  updateWork,
+  watchWorkLock
 } from '../api/workApi';
 import { WorkDetail, WorkVersionDetail, WorkVersionSummary } from '../types/workContract';
 import {
@@ -47,7 +51,9 @@ type UseWorkDetailState = {
 
 const DEFAULT_DEVICE_ID = 'web-phase5-device';
 const AUTO_SAVE_DELAY_MS = 3000;
-const LOCK_RETRY_INTERVAL_MS = 5000;
+// Fallback refresh while locked; lock events normally unlock sooner.
+const LOCK_RETRY_INTERVAL_MS = 30000;
+const LOCK_HEARTBEAT_INTERVAL_MS = 60000;
 const MAX_VISIBLE_VERSIONS = 50;
 
 function mapApiError(error: unknown): { code: string | null; message: string } {
@@ -276,6 +282,17 @@ export function useWorkDetail(workId: string | undefined) {
     void loadAll({ preserveLocalDraft: false });
   }, [loadAll]);
 
+  useEffect(() => {
+    if (!workId) {
+      return;
+    }
+
+    // Persist buffered auto-saves and free the lock when the editor closes.
+    return () => {
+      void releaseWork(workId, DEFAULT_DEVICE_ID).catch(() => undefined);
+    };
+  }, [workId]);
+
   const setContent = useCallback((next: string) => {
     setState((prev) => ({ ...prev, content: next }));
   }, []);
@@ -327,7 +344,7 @@ export function useWorkDetail(workId: string | undefined) {
       }));
 
       try {
-        await updateWork(workId, {
+        await autoSaveWork(workId, lastSyncedContentRef.current, {
           content,
           deviceId: DEFAULT_DEVICE_ID,
           autoSave: true,
@@ -463,6 +480,63 @@ export function useWorkDetail(workId: string | undefined) {
     return () => clearInterval(timer);
   }, [loadAll, state.locked, workId]);
 
+  useEffect(() => {
+    if (!state.locked || !workId) {
+      return;
+    }
+
+    // Reload as soon as the other device lets go of the lock.
+    const controller = new AbortController();
+    async function follow() {
+      while (!controller.signal.aborted) {
+        try {
+          await watchWorkLock(
+            workId!,
+            (holder) => {
+              if (holder === null || holder === DEFAULT_DEVICE_ID) {
+                void loadAll({ preserveLocalDraft: true });
+              }
+            },
+            controller.signal
+          );
+        } catch {
+          if (controller.signal.aborted) {
+            return;
+          }
+          await new Promise((resolve) => setTimeout(resolve, LOCK_RETRY_INTERVAL_MS));
+        }
+      }
+    }
+    void follow();
+
+    return () => controller.abort();
+  }, [loadAll, state.locked, workId]);
+
+  useEffect(() => {
+    if (!workId || state.loading || state.locked) {
+      return;
+    }
+
+    // Keep the lock alive while the editor is open, even without typing.
+    const timer = setInterval(() => {
+      void heartbeatWork(workId, DEFAULT_DEVICE_ID)
+        .then((held) => {
+          if (!held) {
+            const mapped = mapApiError(new ApiRequestError('work locked', 423, 'locked'));
+            setState((prev) => ({
+              ...prev,
+              error: mapped.message,
+              errorCode: mapped.code,
+              locked: true
+            }));
+          }
+        })
+        .catch(() => undefined);
+    }, LOCK_HEARTBEAT_INTERVAL_MS);
+
+    return () => clearInterval(timer);
+  }, [state.loading, state.locked, workId]);
+
   const markSuggestionAction = useCallback((commentId: string, action: 'resolved' | 'rejected') => {
     setState((prev) => ({
       ...prev,
@@ -23,3 +23,5 @@ os.environ.setdefault("WORK_LOCK_EXPIRE_SECONDS", "30")
 os.environ.setdefault("LLM_BASE_URL", "https://llm.after-word.org")
 os.environ.setdefault("LLM_TIMEOUT_SECONDS", "10")
 os.environ.setdefault("FRONTEND_BASE_URL", "http://localhost:3000")
+os.environ.setdefault("AUTOSAVE_BUFFER_BACKEND", "memory")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
@@ -0,0 +1,202 @@
+import pytest
+
+from backend.errors import BusinessError
+from backend.modules.analysis_queue import jobs
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    store = jobs.InMemoryJobBackend()
+    jobs.set_backend(store)
+    monkeypatch.setattr(jobs, "ANALYSIS_JOB_RETRY_BASE_SECONDS", 0)
+    monkeypatch.setattr(jobs, "ANALYSIS_JOB_MAX_ATTEMPTS", 3)
+    yield store
+    jobs.set_backend(None)
+    jobs.set_handler(None)
+
+
+def test_enqueue_and_process_job(backend) -> None:
+    seen = []
+
+    def handler(payload):
+        seen.append(payload)
+        return {"analysis_id": "analysis-1"}
+
+    jobs.set_handler(handler)
+    job = jobs.enqueue("work-1:2", {"work_id": "work-1"})
+    assert job["status"] == jobs.STATUS_QUEUED
+
+    assert jobs.process_next() is True
+    assert jobs.process_next() is False
+    done = jobs.get_job("work-1:2")
+    assert done["status"] == jobs.STATUS_DONE
+    assert done["result"] == {"analysis_id": "analysis-1"}
+    assert done["attempts"] == 1
+    assert seen == [{"work_id": "work-1"}]
+
+    # Re-enqueueing a finished job returns it without queuing more work
+    assert jobs.enqueue("work-1:2", {"work_id": "work-1"})["status"] == jobs.STATUS_DONE
+    assert jobs.process_next() is False
+
+
+def test_failed_job_retries_then_succeeds(backend) -> None:
+    calls = {"count": 0}
+
+    def flaky(payload):
+        calls["count"] += 1
+        if calls["count"] < 3:
+            raise BusinessError("llm_failed", "provider unavailable")
+        return {"analysis_id": "analysis-2"}
+
+    jobs.set_handler(flaky)
+    jobs.enqueue("work-2:1", {})
+    while jobs.process_next():
+        pass
+
+    job = jobs.get_job("work-2:1")
+    assert job["status"] == jobs.STATUS_DONE
+    assert job["attempts"] == 3
+    assert job["error"] is None
+
+
+def test_job_fails_after_max_attempts_or_permanent_error(backend) -> None:
+    def always_fail(payload):
+        raise BusinessError(payload["code"], "nope")
+
+    jobs.set_handler(always_fail)
+    jobs.enqueue("work-3:1", {"code": "llm_failed"})
+    jobs.enqueue("work-3:2", {"code": "validation_failed"})
+    while jobs.process_next():
+        pass
+
+    exhausted = jobs.get_job("work-3:1")
+    assert exhausted["status"] == jobs.STATUS_FAILED
+    assert exhausted["attempts"] == 3
+    assert exhausted["error"] == "nope"
+
+    permanent = jobs.get_job("work-3:2")
+    assert permanent["status"] == jobs.STATUS_FAILED
+    assert permanent["attempts"] == 1
+
+
+def test_workers_drain_queue(backend) -> None:
+    jobs.set_handler(lambda payload: {"analysis_id": payload["id"]})
+    for index in range(4):
+        jobs.enqueue(f"work-4:{index}", {"id": str(index)})
+
+    jobs.start_workers(concurrency=2)
+    try:
+        for _ in range(200):
+            if all(
+                jobs.get_job(f"work-4:{i}")["status"] == jobs.STATUS_DONE
+                for i in range(4)
+            ):
+                break
+            jobs._STOP.wait(0.01)
+    finally:
+        jobs.stop_workers()
+
+    assert all(
+        jobs.get_job(f"work-4:{i}")["result"] == {"analysis_id": str(i)}
+        for i in range(4)
+    )
+
+
+def test_expired_lease_requeues_job_of_dead_worker(backend) -> None:
+    jobs.set_handler(lambda payload: {"analysis_id": "analysis-5"})
+    jobs.enqueue("work-5:1", {})
+    # Simulate a worker that claimed the job, marked it running and died.
+    job_id = backend.pop(0)
+    assert backend.claim(job_id, jobs.time.time(), 0)
+    job = backend.load(job_id)
+    job["status"] = jobs.STATUS_RUNNING
+    job["attempts"] = 1
+    backend.save(job)
+
+    assert jobs.process_next() is True
+    done = jobs.get_job("work-5:1")
+    assert done["status"] == jobs.STATUS_DONE
+    assert done["attempts"] == 2
+    assert backend.lease_expires_at("work-5:1") is None
+
+
+def test_expired_lease_fails_job_out_of_attempts(backend) -> None:
+    jobs.set_handler(lambda payload: {})
+    jobs.enqueue("work-6:1", {})
+    job_id = backend.pop(0)
+    assert backend.claim(job_id, jobs.time.time(), 0)
+    job = backend.load(job_id)
+    job["status"] = jobs.STATUS_RUNNING
+    job["attempts"] = jobs.ANALYSIS_JOB_MAX_ATTEMPTS
+    backend.save(job)
+
+    assert jobs.process_next() is False
+    failed = jobs.get_job("work-6:1")
+    assert failed["status"] == jobs.STATUS_FAILED
+    assert failed["error"] == "worker lease expired"
+
+
+def test_enqueue_replaces_stale_running_job(backend) -> None:
+    jobs.enqueue("work-7:1", {"version": 1})
+    job_id = backend.pop(0)
+    # A live lease keeps the running record.
+    assert backend.claim(job_id, jobs.time.time(), jobs.time.time() + 60)
+    job = backend.load(job_id)
+    job["status"] = jobs.STATUS_RUNNING
+    backend.save(job)
+    assert jobs.enqueue("work-7:1", {"version": 2})["status"] == jobs.STATUS_RUNNING
+
+    backend.release("work-7:1")
+    replaced = jobs.enqueue("work-7:1", {"version": 2})
+    assert replaced["status"] == jobs.STATUS_QUEUED
+    assert replaced["payload"] == {"version": 2}
+
+
+def test_job_popped_twice_runs_once(backend) -> None:
+    calls = []
+    jobs.set_handler(lambda payload: calls.append(payload) or {})
+    jobs.enqueue("work-8:1", {})
+    backend.push("work-8:1")  # e.g. re-queued by a reaper and an enqueue
+
+    # Another worker holds the lease: the duplicate pop is skipped.
+    assert backend.claim("work-8:1", jobs.time.time(), jobs.time.time() + 60)
+    assert jobs.process_next() is True
+    assert calls == [] and jobs.get_job("work-8:1")["attempts"] == 0
+
+    backend.release("work-8:1")
+    assert jobs.process_next() is True
+    assert jobs.process_next() is False
+    assert len(calls) == 1 and jobs.get_job("work-8:1")["status"] == jobs.STATUS_DONE
+
+
+def test_concurrent_enqueues_queue_the_job_once(backend) -> None:
+    barrier = jobs.threading.Barrier(8)
+
+    def enqueue() -> None:
+        barrier.wait()
+        jobs.enqueue("work-9:1", {})
+
+    threads = [jobs.threading.Thread(target=enqueue) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backend.pop(0) == "work-9:1"
+    assert backend.pop(0) is None
+
+
+def test_replace_is_a_compare_and_set(backend) -> None:
+    job = jobs.enqueue("work-10:1", {"version": 1})
+    assert not backend.replace({**job, "payload": {"version": 2}}, job["updated_at"] - 1)
+    assert backend.replace({**job, "payload": {"version": 2}}, job["updated_at"])
+    assert backend.load("work-10:1")["payload"] == {"version": 2}
+
+
+def test_reaper_requeues_job_claimed_by_a_worker_that_never_started(backend) -> None:
+    jobs.set_handler(lambda payload: {})
+    jobs.enqueue("work-11:1", {})
+    assert backend.claim(backend.pop(0), jobs.time.time(), 0)
+
+    assert jobs.process_next() is True
+    assert jobs.get_job("work-11:1")["status"] == jobs.STATUS_DONE
@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from backend.errors import BusinessError, business_error_to_status
+from backend.modules.auth import hashing_pool
+
+
+def test_full_pool_rejects_fast_and_reports_queue_depth() -> None:
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def slow_hash(value):
+        started.release()
+        release.wait(5)
+        return value
+
+    pool = hashing_pool.HashingPool(
+        lambda: ThreadPoolExecutor(max_workers=1), workers=1, max_queue=1
+    )
+    callers = ThreadPoolExecutor(max_workers=2)
+    try:
+        running = callers.submit(pool.run, slow_hash, "a")
+        started.acquire(timeout=5)
+        queued = callers.submit(pool.run, slow_hash, "b")
+        deadline = time.monotonic() + 5
+        while pool.stats()["in_flight"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert pool.stats()["queue_depth"] == 1
+
+        with pytest.raises(BusinessError) as excinfo:
+            pool.run(slow_hash, "c")
+        assert excinfo.value.code == "rate_limited"
+        assert business_error_to_status("rate_limited") == 429
+
+        release.set()
+        assert (running.result(5), queued.result(5)) == ("a", "b")
+        stats = pool.stats()
+        assert stats["rejected"] == 1 and stats["completed"] == 2
+        assert stats["in_flight"] == 0 and stats["peak_queue_depth"] == 1
+    finally:
+        release.set()
+        callers.shutdown()
+        pool.shutdown()
+
+
+def _spawn_pool():
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+
+def test_hashes_round_trip_through_worker_processes() -> None:
+    hashing_pool.set_pool(hashing_pool.HashingPool(_spawn_pool, workers=1, max_queue=4))
+    try:
+        stored = hashing_pool.hash_password("correct horse")
+        assert hashing_pool.verify_password("correct horse", stored) is True
+        assert hashing_pool.verify_password("wrong", stored) is False
+    finally:
+        hashing_pool.shutdown()
+
+
+def test_pool_restarts_after_a_worker_dies() -> None:
+    pool = hashing_pool.HashingPool(_spawn_pool, workers=1, max_queue=4)
+    try:
+        assert pool.run(abs, -1) == 1
+        for pid in list(pool._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        assert pool.run(abs, -2) == 2
+        assert pool.run(abs, -3) == 3
+    finally:
+        pool.shutdown()
@@ -0,0 +1,82 @@
+import base64
+import hashlib
+
+from backend.modules.auth import login as login_module
+from backend.modules.auth import passwords
+
+
+def _legacy_hash(password: str) -> str:
+    salt = b"0123456789abcdef"
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, 120_000)
+    return f"{base64.b64encode(salt).decode()}${base64.b64encode(digest).decode()}"
+
+
+def test_hashes_describe_their_parameters() -> None:
+    stored = passwords.hash_password("secret")
+    algorithm, params, salt, digest = stored.split("$")
+    assert (algorithm, params) == ("pbkdf2_sha256", "i=120000")
+    assert passwords.verify_password("secret", stored) is True
+    assert passwords.verify_password("wrong", stored) is False
+    assert passwords.needs_rehash(stored) is False
+
+    legacy = _legacy_hash("secret")
+    assert passwords.verify_password("secret", legacy) is True
+    assert passwords.needs_rehash(legacy) is True
+    assert passwords.verify_password("secret", "garbage") is False
+
+
+def test_changing_kdf_keeps_old_hashes_valid(monkeypatch) -> None:
+    old = passwords.hash_password("secret")
+    monkeypatch.setattr(passwords, "PASSWORD_HASH_ALGORITHM", "scrypt")
+    monkeypatch.setattr(passwords, "PASSWORD_SCRYPT_N", 1024)
+
+    new = passwords.hash_password("secret")
+    assert new.startswith("scrypt$n=1024,r=8,p=1$")
+    assert passwords.verify_password("secret", new) is True
+    assert passwords.verify_password("secret", old) is True
+    assert passwords.needs_rehash(old) is True
+    assert passwords.needs_rehash(new) is False
+
+    monkeypatch.setattr(passwords, "PASSWORD_SCRYPT_N", 2048)
+    assert passwords.needs_rehash(new) is True
+
+
+def test_login_upgrades_outdated_hash() -> None:
+    user = {"id": "u1", "email": "a@example.com", "username": "a",
+            "password_hash": _legacy_hash("secret")}
+    updates = []
+
+    def executor(query):
+        if "UPDATE users SET password_hash" in query["sql"]:
+            updates.append(query["params"]["new_hash"])
+            return None
+        return dict(user)
+
+    login_module.set_query_executor(executor)
+    assert login_module.login("a@example.com", "secret")["email"] == "a@example.com"
+    assert len(updates) == 1 and updates[0].startswith("pbkdf2_sha256$i=120000$")
+    assert passwords.verify_password("secret", updates[0]) is True
+
+    user["password_hash"] = updates[0]
+    login_module.login("a@example.com", "secret")
+    assert len(updates) == 1
+
+
+def test_rehash_does_not_overwrite_concurrent_password_change() -> None:
+    legacy = _legacy_hash("secret")
+    row = {"id": "u1", "email": "a@example.com", "username": "a", "password_hash": legacy}
+
+    def executor(query):
+        params = query["params"]
+        if "UPDATE users SET password_hash" in query["sql"]:
+            if row["password_hash"] == params["old_hash"]:
+                row["password_hash"] = params["new_hash"]
+            return None
+        snapshot = dict(row)
+        # A change_password commits right after this login read the row.
+        row["password_hash"] = "changed-elsewhere"
+        return snapshot
+
+    login_module.set_query_executor(executor)
+    login_module.login("a@example.com", "secret")
+    assert row["password_hash"] == "changed-elsewhere"
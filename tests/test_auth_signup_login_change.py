@@ -10,6 +10,7 @@ from backend.modules.auth.change import (
     set_query_executor,
 )
 from backend.modules.auth.login import login, set_query_executor as set_login_executor
+from backend.modules.auth import signup as signup_module
 from backend.modules.auth.passwords import hash_password
 from backend.modules.auth.signup import (
     set_query_executor as set_signup_executor,
@@ -32,6 +33,18 @@ def _make_executor(
         sql = query.get("sql", "")
         params = query.get("params", {})
         executed_queries.append(query)
+        if "AS taken_field" in sql:
+            if params.get("email") in taken_emails:
+                return "email"
+            if params.get("username") in taken_usernames:
+                return "username"
+            return None
+        if "INSERT INTO users" in sql:
+            if params.get("email") in taken_emails:
+                return {"id": None, "conflict": "email"}
+            if params.get("username") in taken_usernames:
+                return {"id": None, "conflict": "username"}
+            return {"id": "user-1", "conflict": None}
         if "FROM users WHERE email" in sql:
             email = params.get("email")
             if email in taken_emails:
@@ -45,8 +58,6 @@ def _make_executor(
                 if user.get("username") == username:
                     return user
             return None
-        if "INSERT INTO users" in sql:
-            return {"id": "user-1"}
         if "UPDATE users SET password_hash" in sql:
             return {"updated": True}
         if "UPDATE users SET username" in sql:
@@ -67,6 +78,34 @@ def test_signup_success() -> None:
     assert result["id"] == "user-1"
 
 
+def test_signup_probes_before_hashing(monkeypatch) -> None:
+    executor, executed = _make_executor(taken_usernames={"taken"})
+    check.set_query_executor(executor)
+    set_signup_executor(executor)
+    hashed = []
+    monkeypatch.setattr(signup_module, "hash_password", lambda pw: hashed.append(pw) or "hash")
+
+    signup("new@example.com", "new_user", "pw123")
+    assert len(executed) == 2 and hashed == ["pw123"]
+
+    with pytest.raises(BusinessError) as excinfo:
+        signup("other@example.com", "taken", "pw123")
+    assert excinfo.value.code == "username_taken"
+    assert len(executed) == 3 and hashed == ["pw123"]
+
+
+def test_signup_insert_still_decides_races(monkeypatch) -> None:
+    # The probe finds the email free; a concurrent signup takes it first.
+    executor, _ = _make_executor(taken_emails={"race@example.com"})
+    check.set_query_executor(lambda query: None)
+    set_signup_executor(executor)
+    monkeypatch.setattr(signup_module, "hash_password", lambda pw: "hash")
+
+    with pytest.raises(BusinessError) as excinfo:
+        signup("race@example.com", "new_user", "pw123")
+    assert excinfo.value.code == "email_taken"
+
+
 def test_signup_conflicts() -> None:
     executor, _ = _make_executor(taken_emails={"used@example.com"})
     check.set_query_executor(executor)
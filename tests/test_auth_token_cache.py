@@ -0,0 +1,62 @@
+import pytest
+
+from backend.errors import BusinessError
+from backend.modules.auth import token_cache
+from backend.modules.auth.jwt import create_token
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    token_cache.clear()
+    calls = []
+    real_decode = token_cache.decode_token_with_expiry
+
+    def counting_decode(token):
+        calls.append(token)
+        return real_decode(token)
+
+    monkeypatch.setattr(token_cache, "decode_token_with_expiry", counting_decode)
+    yield calls
+    token_cache.clear()
+
+
+def test_repeat_tokens_skip_decoding(decodes) -> None:
+    token = create_token("a@example.com", "alice")
+
+    assert token_cache.verify_token(token) == {"email": "a@example.com", "username": "alice"}
+    claims = token_cache.verify_token(token)
+    claims["email"] = "tampered@example.com"
+    assert token_cache.verify_token(token)["email"] == "a@example.com"
+
+    assert len(decodes) == 1
+    stats = token_cache.get_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1 and stats["size"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_entries_never_outlive_token_expiry(decodes, monkeypatch) -> None:
+    now = [1_000_000.0]
+    monkeypatch.setattr(token_cache.time, "time", lambda: now[0])
+    monkeypatch.setattr(
+        token_cache,
+        "decode_token_with_expiry",
+        lambda token: (decodes.append(token) or {"email": "a@x", "username": "a"}, now[0] + 5),
+    )
+
+    token_cache.verify_token("token")
+    now[0] += 4
+    token_cache.verify_token("token")
+    now[0] += 2
+    token_cache.verify_token("token")
+
+    assert len(decodes) == 2
+    assert token_cache.get_stats()["expired"] == 1
+
+
+def test_invalid_tokens_are_not_cached(decodes) -> None:
+    for _ in range(2):
+        with pytest.raises(BusinessError) as excinfo:
+            token_cache.verify_token("not-a-token")
+        assert excinfo.value.code == "unauthorized"
+    assert len(decodes) == 2
+    assert token_cache.get_stats()["size"] == 0
@@ -24,11 +24,12 @@ def test_add_and_list_comments(monkeypatch) -> None:
 
     calls = []
 
-    def fake_get_work(work_id, user_email):
+    def fake_verify_work_owner(work_id, user_email):
         calls.append((work_id, user_email))
-        return {"id": work_id, "user_email": user_email}
 
-    monkeypatch.setattr(conversation_manager.work_manager, "get_work", fake_get_work)
+    monkeypatch.setattr(
+        conversation_manager.work_manager, "verify_work_owner", fake_verify_work_owner
+    )
 
     comment_id = conversation_manager.add_comment("work-1", "a@example.com", "hello")
     assert comment_id == "comment-1"
@@ -0,0 +1,187 @@
+import json
+
+from backend.modules.llm_gateway import analyzer
+from backend.modules.llm_gateway import cache as llm_cache
+
+
+def test_lru_cache_evicts_oldest_and_expires() -> None:
+    lru = llm_cache.InMemoryLRUCache(max_entries=2)
+    lru.set("a", "1", ttl_seconds=60)
+    lru.set("b", "2", ttl_seconds=60)
+    assert lru.get("a") == "1"  # a becomes most recently used
+    lru.set("c", "3", ttl_seconds=60)
+    assert lru.get("b") is None
+    assert lru.get("a") == "1"
+    assert lru.get("c") == "3"
+
+    lru.set("d", "4", ttl_seconds=0)
+    assert lru.get("d") is None
+
+
+def test_cache_key_covers_kind_model_and_prompt() -> None:
+    base = llm_cache.cache_key("analysis", "model-a", "prompt")
+    assert base == llm_cache.cache_key("analysis", "model-a", "prompt")
+    assert base != llm_cache.cache_key("analysis", "model-b", "prompt")
+    assert base != llm_cache.cache_key("rubric", "model-a", "prompt")
+    assert base != llm_cache.cache_key("analysis", "model-a", "prompt ")
+
+
+def _analysis_response() -> str:
+    return json.dumps(
+        {
+            "fao_comment": "Good start.",
+            "sentence_comments": [
+                {
+                    "id": "c1",
+                    "original_text": "Hello.",
+                    "start_index": 0,
+                    "end_index": 6,
+                    "issue_type": "style",
+                    "severity": "low",
+                    "title": "Opening",
+                    "description": "Plain opening.",
+                    "suggestion": "Be vivid.",
+                }
+            ],
+        }
+    )
+
+
+def test_generate_analysis_reuses_cached_responses(monkeypatch) -> None:
+    llm_cache.set_backend(llm_cache.InMemoryLRUCache())
+    calls = {"rubric": 0, "analysis": 0}
+
+    def fake_rubric(prompt):
+        calls["rubric"] += 1
+        return json.dumps({"dimensions": [{"name": "Voice", "weight": 1.0}]})
+
+    def fake_analysis(prompt):
+        calls["analysis"] += 1
+        return _analysis_response()
+
+    monkeypatch.setattr(analyzer.client, "generate_rubric", fake_rubric)
+    monkeypatch.setattr(analyzer.client, "generate_structured_response", fake_analysis)
+
+    try:
+        before = llm_cache.get_stats()
+        first = analyzer.generate_analysis("work-1", "Hello.", 1)
+        second = analyzer.generate_analysis("work-1", "Hello.", 2)
+        assert first == second
+        assert calls == {"rubric": 1, "analysis": 1}
+        after = llm_cache.get_stats()
+        assert after["hits"] - before["hits"] == 2
+        assert after["misses"] - before["misses"] == 2
+
+        analyzer.generate_analysis("work-1", "Hello.", 3, use_cache=False)
+        assert calls == {"rubric": 2, "analysis": 2}
+    finally:
+        llm_cache.set_backend(None)
+
+
+def test_incomplete_responses_fail_and_are_not_cached(monkeypatch) -> None:
+    llm_cache.set_backend(llm_cache.InMemoryLRUCache())
+    complete = _analysis_response()
+    invalid = json.loads(complete)
+    invalid["sentence_comments"][0]["severity"] = "extreme"
+    responses = iter([complete[:-20], json.dumps(invalid)])
+    monkeypatch.setattr(analyzer.client, "generate_structured_response", lambda prompt: next(responses))
+    previous = {"fao_comment": "Earlier.", "sentence_comments": []}
+
+    try:
+        sets_before = llm_cache.get_stats()["sets"]
+        for version in (2, 3):
+            try:
+                analyzer.generate_analysis(
+                    "work-2", "Hello.", version, previous_text="Hi.", previous_analysis=previous
+                )
+            except analyzer.BusinessError as exc:
+                assert exc.code == "llm_failed"
+            else:
+                raise AssertionError("partial analysis was accepted")
+        assert llm_cache.get_stats()["sets"] == sets_before
+    finally:
+        llm_cache.set_backend(None)
+
+
+class FakeRedis:
+    """Just enough of redis-py for RedisCache, on a controllable clock."""
+
+    def __init__(self, clock) -> None:
+        self.clock = clock
+        self.values = {}
+        self.zsets = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def set(self, key, value, ex):
+        self.values[key] = (value, self.clock() + ex)
+
+    def get(self, key):
+        entry = self.values.get(key)
+        return entry[0] if entry and entry[1] > self.clock() else None
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def zadd(self, name, mapping):
+        self.zsets.setdefault(name, {}).update(mapping)
+
+    def zrem(self, name, *members):
+        for member in members:
+            self.zsets.get(name, {}).pop(member, None)
+
+    def zcard(self, name):
+        return len(self.zsets.get(name, {}))
+
+    def zrangebyscore(self, name, low, high):
+        return [m for m, score in self.zsets.get(name, {}).items() if score <= high]
+
+    def zpopmin(self, name, count):
+        ordered = sorted(self.zsets.get(name, {}).items(), key=lambda item: item[1])[:count]
+        self.zrem(name, *(m for m, _ in ordered))
+        return ordered
+
+
+class FakePipeline:
+    def __init__(self, client) -> None:
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def test_redis_cache_prunes_expired_members_before_evicting(monkeypatch) -> None:
+    now = {"t": 1000.0}
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now["t"])
+    client = FakeRedis(lambda: now["t"])
+    cache = llm_cache.RedisCache(client, max_entries=2)
+
+    cache.set("a", "2", ttl_seconds=60)
+    now["t"] += 1
+    cache.set("old", "1", ttl_seconds=10)
+    now["t"] += 20
+    cache.set("b", "3", ttl_seconds=60)
+    # "old" expired by TTL; it must not count toward the bound or evict "a".
+    assert cache.get("a") == "2"
+    now["t"] += 1
+    assert cache.get("b") == "3"
+    assert set(client.zsets["llm_cache:index"]) == {"a", "b"}
+
+    now["t"] += 1
+    cache.set("c", "4", ttl_seconds=60)
+    assert cache.get("a") is None
+    assert set(client.zsets["llm_cache:expiry"]) == {"b", "c"}
+
+
+def test_only_explicit_bypass_is_counted(monkeypatch) -> None:
+    before = llm_cache.get_stats()["bypassed"]
+    llm_cache.get("analysis", "m", "p", bypass=True)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_BACKEND", "off")
+    assert llm_cache.get("analysis", "m", "p") is None
+    assert llm_cache.get_stats()["bypassed"] == before + 1
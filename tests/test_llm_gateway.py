@@ -5,6 +5,10 @@ import pytest
 
 
 class FakeResponse:
+    status_code = 200
+    headers = {}
+    text = ""
+
     def __init__(self, payload, raise_error=False) -> None:
         self.payload = payload
         self.raise_error = raise_error
@@ -19,6 +23,15 @@ class FakeResponse:
         return self.payload
 
 
+class FakeHttpClient:
+    def __init__(self, post) -> None:
+        self.post = post
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
 def _reload_client_module():
     for name in ("backend.config", "backend.modules.llm_gateway.client"):
         if name in sys.modules:
@@ -30,13 +43,13 @@ def test_generate_comment_success(monkeypatch) -> None:
     client = _reload_client_module()
     captured = {}
 
-    def fake_post(url, json, timeout):
+    def fake_post(url, json, timeout, headers=None):
         captured["url"] = url
         captured["json"] = json
         captured["timeout"] = timeout
         return FakeResponse({"comment": "ok"})
 
-    monkeypatch.setattr(client.httpx, "post", fake_post)
+    client.set_http_client(client.PROVIDER_OPENAI, FakeHttpClient(fake_post))
 
     result = client.generate_comment("sample text")
     assert result == "ok"
@@ -47,10 +60,10 @@ def test_generate_comment_success(monkeypatch) -> None:
 def test_generate_comment_invalid_response(monkeypatch) -> None:
     client = _reload_client_module()
 
-    def fake_post(url, json, timeout):
+    def fake_post(url, json, timeout, headers=None):
         return FakeResponse({"unexpected": "value"})
 
-    monkeypatch.setattr(client.httpx, "post", fake_post)
+    client.set_http_client(client.PROVIDER_OPENAI, FakeHttpClient(fake_post))
 
     with pytest.raises(client.BusinessError) as excinfo:
         client.generate_comment("sample text")
@@ -60,11 +73,24 @@ def test_generate_comment_invalid_response(monkeypatch) -> None:
 def test_generate_comment_http_error(monkeypatch) -> None:
     client = _reload_client_module()
 
-    def fake_post(url, json, timeout):
+    def fake_post(url, json, timeout, headers=None):
         return FakeResponse({"comment": "x"}, raise_error=True)
 
-    monkeypatch.setattr(client.httpx, "post", fake_post)
+    client.set_http_client(client.PROVIDER_OPENAI, FakeHttpClient(fake_post))
 
     with pytest.raises(client.BusinessError) as excinfo:
         client.generate_comment("sample text")
     assert excinfo.value.code == "llm_failed"
+
+
+def test_provider_client_is_shared_and_closed() -> None:
+    client = _reload_client_module()
+
+    first = client._http_client(client.PROVIDER_OPENAI)
+    assert client._http_client(client.PROVIDER_OPENAI) is first
+    assert client._http_client(client.PROVIDER_CLAUDE) is not first
+
+    client.close_http_clients()
+    assert first.is_closed
+    assert client._http_client(client.PROVIDER_OPENAI) is not first
+    client.close_http_clients()
@@ -0,0 +1,140 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from backend.modules.llm_gateway import client, resilience
+
+
+class FakeProvider:
+    """Local HTTP server replaying scripted (status, headers, body) replies."""
+
+    def __init__(self, replies) -> None:
+        self.replies = list(replies)
+        self.requests = 0
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                provider.requests += 1
+                index = min(provider.requests, len(provider.replies)) - 1
+                status, headers, body = provider.replies[index]
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *_args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1/chat/completions"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+OK_BODY = {"choices": [{"message": {"content": "{\"ok\": true}"}}]}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(resilience, "_sleep", recorded.append)
+    resilience.reset()
+    yield recorded
+    resilience.reset()
+    client.close_http_clients()
+
+
+def _use_provider(monkeypatch, provider: FakeProvider) -> None:
+    monkeypatch.setattr(client, "_llm_endpoint", lambda: provider.url)
+    client.set_http_client(client.PROVIDER_OPENAI, httpx.Client())
+
+
+def test_retries_honour_retry_after(monkeypatch, sleeps) -> None:
+    provider = FakeProvider([(503, {"Retry-After": "1"}, {}), (200, {}, OK_BODY)])
+    _use_provider(monkeypatch, provider)
+    try:
+        assert client.generate_structured_response("prompt") == "{\"ok\": true}"
+    finally:
+        provider.close()
+    assert provider.requests == 2
+    assert sleeps == [1.0]
+
+
+def test_persistent_errors_stop_after_max_attempts(monkeypatch, sleeps) -> None:
+    provider = FakeProvider([(500, {}, {})])
+    _use_provider(monkeypatch, provider)
+    try:
+        with pytest.raises(client.BusinessError) as excinfo:
+            client.generate_structured_response("prompt")
+    finally:
+        provider.close()
+    assert excinfo.value.code == "llm_failed"
+    assert provider.requests == resilience.LLM_RETRY_MAX_ATTEMPTS
+    assert all(0 <= delay <= resilience.LLM_RETRY_MAX_DELAY_SECONDS for delay in sleeps)
+
+
+def test_breaker_opens_and_fails_fast(sleeps) -> None:
+    provider = FakeProvider([(502, {}, {})])
+    http = httpx.Client()
+    try:
+        for _ in range(resilience.LLM_BREAKER_FAILURE_THRESHOLD):
+            try:
+                resilience.send("fake", lambda: http.post(provider.url, json={}))
+            except resilience.CircuitOpenError:
+                break
+        seen = provider.requests
+        assert resilience.get_breaker_states()["fake"] == resilience.CircuitBreaker.OPEN
+        with pytest.raises(resilience.CircuitOpenError):
+            resilience.send("fake", lambda: http.post(provider.url, json={}))
+        assert provider.requests == seen
+    finally:
+        http.close()
+        provider.close()
+
+
+def test_breaker_half_open_probe_closes_on_success() -> None:
+    breaker = resilience.CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert breaker.state == resilience.CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == resilience.CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_records_non_retryable_errors(sleeps) -> None:
+    breaker = resilience.CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    resilience._BREAKERS["fake"] = breaker
+    breaker.record_failure()
+
+    def broken_request():
+        raise httpx.WriteError("connection dropped")
+
+    with pytest.raises(httpx.WriteError):
+        resilience.send("fake", broken_request)
+    assert breaker.state == resilience.CircuitBreaker.OPEN
+
+    response = resilience.send("fake", lambda: httpx.Response(200))
+    assert response.status_code == 200
+    assert breaker.state == resilience.CircuitBreaker.CLOSED
+
+
+def test_retry_budget_limits_retries_to_ratio() -> None:
+    budget = resilience.RetryBudget(ratio=0.25, max_tokens=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    for _ in range(4):
+        budget.deposit()
+    assert budget.withdraw()
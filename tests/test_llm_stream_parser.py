@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from backend.modules.llm_gateway import analyzer
+from backend.modules.llm_gateway.stream_parser import AnalysisStreamParser
+
+
+def _comment(comment_id: str, **overrides):
+    comment = {
+        "id": comment_id,
+        "original_text": "x",
+        "start_index": 0,
+        "end_index": 1,
+        "issue_type": "grammar",
+        "severity": "low",
+        "title": "t",
+        "description": "d {with} [brackets] and \"quotes\"",
+        "suggestion": "s",
+    }
+    comment.update(overrides)
+    return comment
+
+
+def _parser() -> AnalysisStreamParser:
+    return AnalysisStreamParser(
+        lambda comment, index: analyzer._validate_sentence_comment(comment, index, True)
+    )
+
+
+def _feed_by_char(parser: AnalysisStreamParser, body: str):
+    events = []
+    for char in body:
+        events.extend(parser.feed(char))
+    return events
+
+
+def test_comments_are_emitted_as_each_object_closes() -> None:
+    first, second = _comment("c1"), _comment("c2")
+    body = json.dumps({
+        "fao_comment": "Strong \"voice\" é \U0001f600 \\ end",
+        "sentence_comments": [first, second],
+        "reflection_comment": None,
+    })
+    parser = _parser()
+    events = []
+    first_end = body.index(json.dumps(second)) - 2
+
+    events.extend(_feed_by_char(parser, body[:first_end]))
+    assert events[-1] == ("sentence_comment", first)
+    events.extend(_feed_by_char(parser, body[first_end:]))
+
+    fao = "".join(data["text"] for name, data in events if name == "fao_delta")
+    assert fao == "Strong \"voice\" é \U0001f600 \\ end"
+    assert [data for name, data in events if name == "sentence_comment"] == [first, second]
+    result = parser.close()
+    assert parser.complete
+    assert result["sentence_comments"] == [first, second]
+    assert result["reflection_comment"] is None
+
+
+def test_malformed_element_is_skipped_not_fatal() -> None:
+    body = json.dumps({
+        "fao_comment": "ok",
+        "sentence_comments": [_comment("c1"), _comment("c2", severity="extreme"), _comment("c3")],
+    })
+    parser = _parser()
+    parser.feed(body)
+    result = parser.close()
+    assert [c["id"] for c in result["sentence_comments"]] == ["c1", "c3"]
+    assert parser.rejected[0][0] == 1
+
+
+def test_truncated_stream_keeps_completed_comments() -> None:
+    body = json.dumps({"fao_comment": "ok", "sentence_comments": [_comment("c1"), _comment("c2")]})
+    parser = _parser()
+    parser.feed(body[: body.index("c2") + 10])
+    result = parser.close()
+    assert not parser.complete
+    assert [c["id"] for c in result["sentence_comments"]] == ["c1"]
+
+
+def test_missing_required_fields_raise() -> None:
+    parser = _parser()
+    parser.feed(json.dumps({"sentence_comments": []}))
+    with pytest.raises(ValueError, match="fao_comment"):
+        parser.close()
+
+    parser = _parser()
+    parser.feed(json.dumps({"fao_comment": "x", "sentence_comments": {}}))
+    with pytest.raises(ValueError, match="must be a list"):
+        parser.close()
+
+    parser = _parser()
+    parser.feed(json.dumps({"fao_comment": "x", "sentence_comments": [{"id": "c1"}]}))
+    with pytest.raises(ValueError, match="No valid sentence_comments"):
+        parser.close()
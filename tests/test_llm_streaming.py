@@ -0,0 +1,90 @@
+import json
+
+import httpx
+import pytest
+
+from backend.errors import BusinessError
+from backend.modules.llm_gateway import analyzer, client, resilience
+
+
+def _sse(*events) -> bytes:
+    return "".join(f"data: {event}\n\n" for event in events).encode()
+
+
+def _use_transport(provider: str, body: bytes, status: int = 200) -> list:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(status, content=body, headers={"Content-Type": "text/event-stream"})
+
+    client.set_http_client(provider, httpx.Client(transport=httpx.MockTransport(handler)))
+    return requests
+
+
+@pytest.fixture(autouse=True)
+def _reset_clients():
+    resilience.reset()
+    yield
+    client.close_http_clients()
+    resilience.reset()
+
+
+def test_stream_structured_response_yields_openai_deltas() -> None:
+    chunks = [
+        {"choices": [{"delta": {"role": "assistant"}}]},
+        {"choices": [{"delta": {"content": "{\"fao"}}]},
+        {"choices": [{"delta": {"content": "_comment\": 1}"}}]},
+    ]
+    requests = _use_transport(
+        client.PROVIDER_OPENAI, _sse(*(json.dumps(c) for c in chunks), "[DONE]")
+    )
+
+    assert list(client.stream_structured_response("p")) == ["{\"fao", "_comment\": 1}"]
+    assert requests[0]["stream"] is True
+    assert requests[0]["response_format"] == {"type": "json_object"}
+
+
+def test_stream_http_error_raises_business_error() -> None:
+    _use_transport(client.PROVIDER_OPENAI, b"{}", status=400)
+
+    with pytest.raises(BusinessError) as excinfo:
+        list(client.stream_structured_response("p"))
+    assert excinfo.value.code == "llm_failed"
+
+
+def test_stream_analysis_relays_fao_then_validated_comments(monkeypatch) -> None:
+    comment = {
+        "id": "c1",
+        "original_text": "x",
+        "start_index": 0,
+        "end_index": 1,
+        "issue_type": "grammar",
+        "severity": "low",
+        "title": "t",
+        "description": "d",
+        "suggestion": "s",
+    }
+    body = json.dumps({"fao_comment": "Clear thesis.", "sentence_comments": [comment]})
+    monkeypatch.setattr(analyzer.llm_cache, "get", lambda *_a, **_k: None)
+    monkeypatch.setattr(analyzer.llm_cache, "put", lambda *_a, **_k: None)
+    monkeypatch.setattr(
+        analyzer.client,
+        "stream_structured_response",
+        lambda prompt: iter([body[i:i + 7] for i in range(0, len(body), 7)]),
+    )
+
+    events = list(analyzer.stream_analysis(
+        work_id="w1",
+        current_text="text",
+        current_version=2,
+        previous_text="old",
+        previous_analysis={"fao_comment": "prev", "sentence_comments": []},
+    ))
+
+    names = [name for name, _ in events]
+    assert names[-2:] == ["sentence_comment", "analysis"]
+    assert set(names[:-2]) == {"fao_delta"}
+    assert "".join(data["text"] for name, data in events if name == "fao_delta") == "Clear thesis."
+    assert events[-2][1] == comment
+    assert events[-1][1]["fao_comment"] == "Clear thesis."
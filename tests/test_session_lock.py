@@ -1,11 +1,47 @@
+import asyncio
 import importlib
 import sys
 
 
+class FakeScript:
+    """Runs the Python equivalent of a lock script as one round-trip."""
+
+    def __init__(self, client, source) -> None:
+        self.registered_client = client
+        self.source = source
+
+    def __call__(self, keys, args):
+        client = self.registered_client
+        client.round_trips += 1
+        key, device_id = keys[0], args[0]
+        lock = client.lock_module
+        if self.source == lock._ACQUIRE_SCRIPT:
+            if client.set(key, device_id, nx=True, ex=args[1]):
+                client.published.append((args[2], device_id))
+                return 1
+            return int(client.get(key) == device_id and client.expire(key, args[1]))
+        if self.source == lock._REFRESH_SCRIPT:
+            return int(client.get(key) == device_id and client.expire(key, args[1]))
+        if self.source == lock._RELEASE_SCRIPT:
+            if client.get(key) != device_id:
+                return 0
+            client.published.append((args[1], ""))
+            return client.delete(key)
+        raise AssertionError("unknown script")
+
+
 class FakeRedis:
-    def __init__(self) -> None:
+    def __init__(self, lock_module=None) -> None:
         self.store = {}
         self.expire_calls = []
+        self.lock_module = lock_module
+        self.round_trips = 0
+        self.registered = []
+        self.published = []
+
+    def register_script(self, source):
+        self.registered.append(source)
+        return FakeScript(self, source)
 
     def set(self, key, value, nx=False, ex=None):
         if nx and key in self.store:
@@ -40,7 +76,7 @@ def _reload_lock_module():
 
 def test_lock_acquire_and_refresh() -> None:
     lock = _reload_lock_module()
-    client = FakeRedis()
+    client = FakeRedis(lock)
     lock.set_client(client)
 
     assert lock.acquire_lock("work-1", "device-1") is True
@@ -54,7 +90,7 @@ def test_lock_acquire_and_refresh() -> None:
 
 def test_lock_refresh_release_and_holder() -> None:
     lock = _reload_lock_module()
-    client = FakeRedis()
+    client = FakeRedis(lock)
     lock.set_client(client)
 
     assert lock.get_lock_holder("work-2") is None
@@ -65,3 +101,105 @@ def test_lock_refresh_release_and_holder() -> None:
     assert lock.release_lock("work-2", "other-device") is False
     assert lock.release_lock("work-2", "device-9") is True
     assert lock.get_lock_holder("work-2") is None
+
+
+def test_lock_operations_take_one_round_trip_each() -> None:
+    lock = _reload_lock_module()
+    client = FakeRedis(lock)
+    lock.set_client(client)
+
+    assert lock.acquire_lock("work-3", "device-1") is True
+    assert lock.acquire_lock("work-3", "device-1") is True
+    assert lock.refresh_lock("work-3", "device-1") is True
+    assert lock.release_lock("work-3", "device-2") is False
+    assert lock.release_lock("work-3", "device-1") is True
+    assert client.round_trips == 5
+    # Scripts are registered once per client and reused.
+    assert len(client.registered) == 3
+
+
+def test_hold_lock_rides_on_lease_and_changes_are_published() -> None:
+    lock = _reload_lock_module()
+    client = FakeRedis(lock)
+    lock.set_client(client)
+    lock.set_lease_guard(True)
+
+    assert lock.hold_lock("work-4", "device-1") is True
+    assert lock.hold_lock("work-4", "device-1") is True
+    assert client.round_trips == 1
+    # Another device never rides on this device's lease.
+    assert lock.hold_lock("work-4", "device-2") is False
+    assert client.round_trips == 2
+
+    assert lock.release_lock("work-4", "device-1") is True
+    assert client.published == [
+        ("work_lock_events:work-4", "device-1"),
+        ("work_lock_events:work-4", ""),
+    ]
+    # Releasing drops the lease, so the next save checks Redis again.
+    assert lock.hold_lock("work-4", "device-1") is True
+    assert client.round_trips == 4
+
+
+def test_lease_ends_when_another_process_changes_the_holder() -> None:
+    lock = _reload_lock_module()
+    client = FakeRedis(lock)
+    lock.set_client(client)
+
+    # Without a lock-events subscriber every save asks Redis.
+    assert lock.hold_lock("work-6", "device-1") is True
+    assert lock.hold_lock("work-6", "device-1") is True
+    assert client.round_trips == 2
+
+    lock.set_lease_guard(True)
+    assert lock.hold_lock("work-6", "device-1") is True
+    assert client.round_trips == 2
+    # Our own acquire echoing back keeps the lease.
+    lock.holder_changed("work-6", "device-1")
+    assert lock.hold_lock("work-6", "device-1") is True
+    assert client.round_trips == 2
+
+    # Another process released the lock and device-2 took it.
+    client.delete("work_lock:work-6")
+    lock.holder_changed("work-6", None)
+    client.set("work_lock:work-6", "device-2")
+    assert lock.hold_lock("work-6", "device-1") is False
+    assert client.round_trips == 3
+
+    # Losing the subscription drops every lease.
+    assert lock.hold_lock("work-7", "device-1") is True
+    lock.set_lease_guard(False)
+    lock.set_lease_guard(True)
+    assert lock.hold_lock("work-7", "device-1") is True
+    assert client.round_trips == 5
+
+
+def test_lock_watchers_see_holder_changes() -> None:
+    lock = _reload_lock_module()
+    client = FakeRedis(lock)
+    lock.set_client(client)
+    events = importlib.import_module("backend.modules.session_lock.events")
+    # events keeps the lock module it imported; point it at the reloaded one.
+    original_lock, events.session_lock = events.session_lock, lock
+    hub = events.LockEventHub()
+    events.set_hub(hub)
+
+    async def scenario():
+        lock.acquire_lock("work-5", "device-1")
+        stream = events.watch_lock("work-5", idle_seconds=0.01, max_seconds=5)
+        assert await stream.__anext__() == "device-1"
+
+        # Messages arrive on the subscriber thread, not the event loop.
+        await asyncio.to_thread(hub.dispatch, "work_lock_events:work-5", "")
+        assert await stream.__anext__() is None
+        hub.dispatch("work_lock_events:other", "device-3")
+        hub.dispatch("work_lock_events:work-5", "device-2")
+        assert await stream.__anext__() == "device-2"
+        await stream.aclose()
+        assert hub._watchers == {}
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        events.set_hub(None)
+        events.session_lock = original_lock
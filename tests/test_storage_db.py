@@ -0,0 +1,89 @@
+import pytest
+
+from backend.storage import db
+
+
+class FakeCursor:
+    def __init__(self, rows, description=True) -> None:
+        self.rows = rows
+        self.description = ("col",) if description else None
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.executed.append((sql, params))
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+class FakeConnection:
+    def __init__(self, cursor) -> None:
+        self._cursor = cursor
+
+    def cursor(self, *args, **kwargs):
+        return self._cursor
+
+
+def _run(rows, fetch, description=True):
+    conn = FakeConnection(FakeCursor(rows, description))
+    query = {"sql": "SELECT 1", "params": {}, "fetch": fetch}
+    return db._execute(conn, query)
+
+
+def test_execute_honours_declared_fetch_mode() -> None:
+    rows = [{"version_number": 3}, {"version_number": 2}]
+    assert _run(rows, "one") == {"version_number": 3}
+    assert _run(rows, "all") == rows
+    assert _run(rows, "scalar") == 3
+    assert _run([], "scalar") is None
+    assert _run(rows, "none") is None
+    assert _run([], "one", description=False) is None
+
+
+def test_execute_rejects_unknown_modes() -> None:
+    with pytest.raises(ValueError):
+        _run([], None)
+    with pytest.raises(ValueError):
+        _run([], "many")
+    with pytest.raises(ValueError):
+        _run([], "stream")
+
+
+def test_sync_pool_is_a_psycopg_pool_opened_up_front(monkeypatch) -> None:
+    created = []
+
+    class FakePool:
+        check_connection = staticmethod(lambda conn: None)
+
+        def __init__(self, conninfo, **kwargs) -> None:
+            self.kwargs = kwargs
+            self.opened = False
+            self.closed = False
+            created.append(self)
+
+        def open(self) -> None:
+            self.opened = True
+
+        def close(self) -> None:
+            self.closed = True
+
+    monkeypatch.setattr(db, "ConnectionPool", FakePool)
+    monkeypatch.setattr(db, "_POOL", None)
+    try:
+        pool = db._get_pool()
+        assert db._get_pool() is pool and len(created) == 1
+        assert pool.opened and pool.kwargs["open"] is False
+        assert pool.kwargs["min_size"] == db.DB_POOL_MIN_SIZE
+        assert pool.kwargs["max_idle"] == db.DB_POOL_MAX_IDLE_SECONDS
+    finally:
+        db.close_pool()
+    assert pool.closed
@@ -3,11 +3,14 @@ from backend.storage.user import repo as user_repo
 from backend.storage.user_retrieve import repo as user_retrieve_repo
 from backend.storage.work import repo as work_repo
 from backend.storage.work_retrieve import repo as work_retrieve_repo
+from backend.storage.work_version import repo as version_repo
 
 
 def test_user_repo_queries() -> None:
     created = user_repo.create_user("a@example.com", "alice", "hash")
     assert "INSERT INTO users" in created["sql"]
+    assert "ON CONFLICT DO NOTHING" in created["sql"]
+    assert created["sql"].endswith("AS conflict") and created["fetch"] == "one"
     assert created["params"]["email"] == "a@example.com"
     assert created["params"]["username"] == "alice"
 
@@ -15,6 +18,10 @@ def test_user_repo_queries() -> None:
     assert "FROM users WHERE email" in by_email["sql"]
     assert by_email["params"]["email"] == "b@example.com"
 
+    probe = user_repo.email_exists("b@example.com")
+    assert probe["sql"].startswith("SELECT EXISTS") and probe["fetch"] == "scalar"
+    assert "password_hash" not in user_repo.username_exists("bob")["sql"]
+
     by_username = user_repo.get_user_by_username("bob")
     assert "FROM users WHERE username" in by_username["sql"]
     assert by_username["params"]["username"] == "bob"
@@ -24,6 +31,11 @@ def test_user_repo_queries() -> None:
     assert updated_pw["params"]["email"] == "c@example.com"
     assert updated_pw["params"]["password_hash"] == "new-hash"
 
+    rehashed = user_repo.update_password_if_unchanged("c@example.com", "old-hash", "new-hash")
+    assert "AND password_hash = %(old_hash)s" in rehashed["sql"]
+    assert rehashed["params"]["old_hash"] == "old-hash"
+    assert rehashed["params"]["new_hash"] == "new-hash"
+
     updated_name = user_repo.update_username("d@example.com", "newname")
     assert "UPDATE users SET username" in updated_name["sql"]
     assert updated_name["params"]["email"] == "d@example.com"
@@ -69,3 +81,54 @@ def test_conversation_repo_contracts() -> None:
     assert "ORDER BY created_at ASC" in listed["sql"]
     assert listed["params"]["work_id"] == "work-2"
     assert listed["params"]["user_email"] == "user@example.com"
+
+
+def test_repo_contracts_declare_fetch_mode() -> None:
+    assert work_repo.create_work("a@example.com")["fetch"] == "one"
+    assert work_repo.delete_work("work-1", "a@example.com")["fetch"] == "none"
+    assert work_retrieve_repo.get_work("work-1", "a@example.com")["fetch"] == "one"
+    assert work_retrieve_repo.list_works("a@example.com")["fetch"] == "all"
+    assert work_retrieve_repo.get_total_word_count("a@example.com")["fetch"] == "scalar"
+    assert version_repo.get_latest_submitted_version("work-1")["fetch"] == "one"
+    assert version_repo.get_current_version_number("work-1")["fetch"] == "scalar"
+    assert conversation_repo.list_comments("work-1", "a@example.com")["fetch"] == "all"
+    assert user_retrieve_repo.list_users_basic()["fetch"] == "all"
+
+
+def test_version_insert_allocates_number_atomically() -> None:
+    created = version_repo.create_version(
+        work_id="work-1",
+        user_email="a@example.com",
+        content="text",
+        is_submitted=False,
+        parent_submission_version=None,
+        user_reflection=None,
+        change_type="draft_edit",
+    )
+    sql = created["sql"]
+    assert sql.startswith("WITH allocated AS (UPDATE works SET current_version = current_version + 1")
+    assert "RETURNING current_version" in sql
+    assert "allocated.current_version" in sql
+    assert "version_number" not in created["params"]
+    assert created["fetch"] == "one"
+
+
+def test_work_writes_maintain_user_stats() -> None:
+    created = work_repo.create_work("a@example.com")["sql"]
+    assert "INSERT INTO user_stats" in created and "ON CONFLICT (user_email)" in created
+    assert created.endswith("SELECT id FROM created")
+
+    for query in (
+        work_repo.update_work_content("work-1", "a@example.com", "hi there", 2),
+        work_repo.update_work_content_at_version("work-1", "a@example.com", "hi", 1, 3),
+    ):
+        assert "FOR UPDATE" in query["sql"]
+        assert "total_word_count = user_stats.total_word_count + updated.delta" in query["sql"]
+        assert query["fetch"] == "none"
+
+    deleted = work_repo.delete_work("work-1", "a@example.com")["sql"]
+    assert "project_count = user_stats.project_count - 1" in deleted
+
+    stats = work_retrieve_repo.get_user_stats("a@example.com")
+    assert "FROM user_stats WHERE user_email" in stats["sql"]
+    assert "FROM works" not in stats["sql"] and stats["fetch"] == "one"
@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from backend.modules.work import version_manager
+from backend.modules.work.version_delta import apply_delta, make_delta, plan_storage
+
+
+def test_delta_round_trips_random_edits() -> None:
+    rng = random.Random(3)
+    vocabulary = "the essay makes a clear claim. Evidence follows!\nA new paragraph? yes".split(" ")
+    words = [f"{rng.choice(vocabulary)}{index}" for index in range(200)]
+    base = " ".join(words)
+    for _ in range(50):
+        target_words = base.split(" ")
+        for _ in range(rng.randint(1, 5)):
+            position = rng.randrange(len(target_words))
+            target_words.insert(position, rng.choice(words + ["新的", "rewrite."]))
+            if rng.random() < 0.5:
+                del target_words[rng.randrange(len(target_words))]
+        target = " ".join(target_words)
+        delta = make_delta(base, target)
+        assert apply_delta(base, delta) == target
+        assert len(delta) < len(target) / 2
+
+
+def test_delta_handles_empty_and_disjoint_texts() -> None:
+    for base, target in [("", "new text."), ("old text.", ""), ("abc.", "xyz!")]:
+        assert apply_delta(base, make_delta(base, target)) == target
+
+
+def test_apply_delta_rejects_wrong_base() -> None:
+    delta = make_delta("a long original sentence.", "a long original sentence. More.")
+    with pytest.raises(ValueError):
+        apply_delta("short", delta)
+
+
+def test_plan_storage_snapshots_submissions_and_full_chains() -> None:
+    base = "One sentence here. " * 30
+    edited = base + "Another one."
+    snapshot = {"version_number": 4, "content": base, "delta_count": 0}
+
+    assert plan_storage(edited, None, False)["storage_kind"] == "full"
+    assert plan_storage(edited, snapshot, True)["storage_kind"] == "full"
+    assert plan_storage(edited, {**snapshot, "delta_count": 99}, False, snapshot_interval=20)["storage_kind"] == "full"
+    assert plan_storage("Entirely different.", snapshot, False)["storage_kind"] == "full"
+
+    fields = plan_storage(edited, snapshot, False)
+    assert fields["storage_kind"] == "delta"
+    assert fields["content"] is None
+    assert fields["base_version"] == 4
+    assert fields["content_preview"] == edited[:100]
+    assert apply_delta(base, fields["content_delta"]) == edited
+
+
+def test_version_detail_rebuilds_delta_rows() -> None:
+    base = "First draft sentence. " * 10
+    target = base + "Added."
+    row = {
+        "work_id": "w1",
+        "version_number": 6,
+        "content": None,
+        "storage_kind": "delta",
+        "content_delta": make_delta(base, target),
+        "base_content": base,
+    }
+    version_manager.set_query_executor(lambda query: dict(row))
+
+    detail = version_manager.get_version_detail("w1", 6)
+
+    assert detail["content"] == target
+    assert "content_delta" not in detail and "base_content" not in detail
+
+
+def test_backfill_fills_preview_and_word_count_in_batches() -> None:
+    base = "Alpha beta gamma. " * 20
+    pending = [
+        {"id": "00000001", "content": "One two three", "storage_kind": "full",
+         "content_delta": None, "base_content": None},
+        {"id": "00000002", "content": None, "storage_kind": "delta",
+         "content_delta": make_delta(base, base + "Delta."), "base_content": base},
+        {"id": "00000003", "content": "你好 world", "storage_kind": "full",
+         "content_delta": None, "base_content": None},
+    ]
+    written = {}
+
+    def executor(query):
+        params = query["params"]
+        if "word_counts" in params:
+            written.update(zip(params["ids"], zip(params["previews"], params["word_counts"])))
+            return None
+        after = params.get("after_id", "")
+        rows = [row for row in pending if row["id"] > after and row["id"] not in written]
+        return [dict(row) for row in rows[:params["limit"]]]
+
+    version_manager.set_query_executor(executor)
+
+    assert version_manager.backfill_version_summaries(batch_size=2) == 3
+    assert written["00000001"] == ("One two three", 3)
+    assert written["00000002"] == ((base + "Delta.")[:100], 61)
+    assert written["00000003"] == ("你好 world", 3)
+
+
+def test_draft_saves_reuse_the_cached_snapshot_content() -> None:
+    base = "Opening sentence of the essay. " * 20
+    rows = []
+    content_reads = []
+
+    def executor(query):
+        sql, params = query["sql"], query["params"]
+        if "INSERT INTO work_versions" in sql:
+            rows.append({**params, "id": f"row-{len(rows) + 1}", "version_number": len(rows) + 1})
+            return {"id": rows[-1]["id"], "version_number": rows[-1]["version_number"]}
+        if "AS delta_count" in sql:
+            full = [row for row in rows if row["storage_kind"] == "full"]
+            if not full:
+                return None
+            deltas = sum(1 for row in rows if row.get("base_version") == full[-1]["version_number"])
+            return {"id": full[-1]["id"], "version_number": full[-1]["version_number"], "delta_count": deltas}
+        if "SELECT content FROM work_versions" in sql:
+            content_reads.append(params["version_id"])
+            return next(row["content"] for row in rows if row["id"] == params["version_id"])
+        raise AssertionError(sql)
+
+    version_manager.set_query_executor(executor)
+    version_manager.clear_snapshot_cache()
+
+    version_manager.create_draft_version("w1", "a@example.com", base, None)
+    for number in range(5):
+        version_manager.create_draft_version("w1", "a@example.com", base + f"Edit {number}.", None)
+
+    assert [row["storage_kind"] for row in rows] == ["full"] + ["delta"] * 5
+    assert content_reads == []
+
+    # Another process wrote the snapshot: its content is read once, then cached.
+    version_manager.clear_snapshot_cache()
+    version_manager.create_draft_version("w1", "a@example.com", base + "Later.", None)
+    version_manager.create_draft_version("w1", "a@example.com", base + "Later still.", None)
+
+    assert content_reads == ["row-1"]
+    assert rows[-1]["base_version"] == 1
@@ -0,0 +1,78 @@
+import pytest
+
+from backend.errors import BusinessError
+from backend.modules.work import version_manager
+from backend.storage.work_version import repo as version_repo
+
+
+def _serve(rows):
+    """Executor that answers version list queries from in-memory rows."""
+    seen = []
+
+    def executor(query):
+        seen.append(query)
+        params = query["params"]
+        matching = [
+            row for row in sorted(rows, key=lambda row: -row["version_number"])
+            if row["version_number"] < params.get("before_version", float("inf"))
+            and ("is_submitted" not in params or row["is_submitted"] == params["is_submitted"])
+        ]
+        return matching[:params["limit"]]
+
+    return executor, seen
+
+
+def test_version_list_query_uses_keyset() -> None:
+    query = version_repo.get_versions_by_work("work-1", before_version=40, limit=21)
+    assert "version_number < %(before_version)s" in query["sql"]
+    assert query["sql"].endswith("ORDER BY version_number DESC LIMIT %(limit)s")
+    assert "OFFSET" not in query["sql"]
+    assert query["params"] == {"work_id": "work-1", "before_version": 40, "limit": 21}
+
+    unbounded = version_repo.get_versions_by_work("work-1")
+    assert "LIMIT" not in unbounded["sql"]
+
+
+def test_version_pages_walk_all_versions_once() -> None:
+    rows = [{"version_number": n, "is_submitted": n % 5 == 0} for n in range(1, 13)]
+    executor, seen = _serve(rows)
+    version_manager.set_query_executor(executor)
+
+    collected, cursor, pages = [], None, 0
+    while True:
+        page, cursor = version_manager.get_version_page("w1", cursor=cursor, limit=5)
+        collected.extend(row["version_number"] for row in page)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert collected == list(range(12, 0, -1))
+    assert pages == 3
+    assert all(query["params"]["limit"] == 6 for query in seen)
+
+    submitted, cursor = version_manager.get_version_page("w1", "submitted", limit=5)
+    assert [row["version_number"] for row in submitted] == [10, 5]
+    assert cursor is None
+
+
+def test_version_page_rejects_bad_cursor_and_caps_limit() -> None:
+    executor, seen = _serve([])
+    version_manager.set_query_executor(executor)
+
+    with pytest.raises(BusinessError) as excinfo:
+        version_manager.get_version_page("w1", cursor="not-a-cursor")
+    assert excinfo.value.code == "validation_failed"
+    with pytest.raises(BusinessError):
+        version_manager.get_version_page("w1", limit=0)
+
+    version_manager.get_version_page("w1", limit=10_000)
+    assert seen[-1]["params"]["limit"] == version_manager.VERSION_LIST_MAX_PAGE_SIZE + 1
+    cursor = version_manager.encode_version_cursor(7)
+    assert version_manager.decode_version_cursor(cursor) == 7
+
+
+def test_version_list_reads_only_narrow_columns() -> None:
+    sql = version_repo.get_versions_by_work("work-1", limit=51)["sql"]
+    select_list = sql.split(" FROM ")[0]
+    assert "content_preview" in select_list and "word_count" in select_list
+    assert "content," not in select_list and "LEFT(content" not in select_list
@@ -0,0 +1,87 @@
+from typing import Any, Dict
+
+import pytest
+
+from backend.modules.work import autosave
+from backend.modules.work import manager as work_manager
+
+
+def _make_store(work: Dict[str, Any]):
+    writes = []
+
+    def executor(query: Dict[str, Any]):
+        sql = query["sql"]
+        params = query["params"]
+        if "FROM works WHERE id" in sql:
+            return dict(work)
+        if "INSERT INTO work_versions" in sql:
+            work["current_version"] += 1
+            return {"id": f"v{work['current_version']}", "version_number": work["current_version"]}
+        if "UPDATE works SET content" in sql:
+            writes.append(params)
+            if params.get("base_version", work["current_version"]) == work["current_version"]:
+                work["content"] = params["content"]
+            return None
+        return None
+
+    return executor, writes
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    store = autosave.InMemoryAutosaveBuffer(debounce_seconds=2, max_delay_seconds=10)
+    autosave.set_backend(store)
+    monkeypatch.setattr(work_manager.session_lock, "acquire_lock", lambda *_: True)
+    monkeypatch.setattr(work_manager.session_lock, "refresh_lock", lambda *_: True)
+    monkeypatch.setattr(work_manager.session_lock, "release_lock", lambda *_: True)
+    yield store
+    autosave.set_backend(None)
+
+
+def test_auto_saves_coalesce_into_one_write(buffer) -> None:
+    work = {"id": "w1", "user_email": "a@example.com", "content": "", "current_version": 3}
+    executor, writes = _make_store(work)
+    work_manager.set_query_executor(executor)
+
+    for text in ("H", "He", "Hello there"):
+        assert work_manager.update_work("w1", "a@example.com", text, "d1") == {"ok": True}
+    assert writes == []
+    # Reads see the buffered content before it is written.
+    detail = autosave.apply_pending(work_manager.get_work("w1", "a@example.com"))
+    assert detail["content"] == "Hello there" and detail["word_count"] == 2
+
+    first_at = buffer.get("w1")["first_at"]
+    assert autosave.flush_due(now=first_at + 1) == 0
+    assert autosave.flush_due(now=first_at + 60) == 1
+    assert len(writes) == 1
+    assert writes[0]["content"] == "Hello there" and writes[0]["base_version"] == 3
+    assert work["content"] == "Hello there"
+
+
+def test_explicit_draft_supersedes_buffered_content(buffer) -> None:
+    work = {"id": "w2", "user_email": "a@example.com", "content": "", "current_version": 1}
+    executor, writes = _make_store(work)
+    work_manager.set_query_executor(executor)
+
+    work_manager.update_work("w2", "a@example.com", "typing", "d1")
+    result = work_manager.update_work("w2", "a@example.com", "final", "d1", auto_save=False)
+    assert result["version"] == 2
+    assert work["content"] == "final"
+    assert autosave.pending("w2") is None
+
+    # A buffered entry from before the draft can no longer overwrite it.
+    autosave.buffer("w2", "a@example.com", "stale", base_version=1)
+    assert autosave.flush("w2") is True
+    assert work["content"] == "final"
+
+
+def test_release_flushes_buffered_content(buffer) -> None:
+    work = {"id": "w3", "user_email": "a@example.com", "content": "", "current_version": 0}
+    executor, writes = _make_store(work)
+    work_manager.set_query_executor(executor)
+
+    work_manager.update_work("w3", "a@example.com", "draft text", "d1", essay_prompt="Prompt")
+    assert work_manager.release_work("w3", "a@example.com", "d1") is True
+    assert work["content"] == "draft text"
+    assert writes[0]["essay_prompt"] == "Prompt"
+    assert autosave.flush("w3") is False
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import contextmanager
 from typing import Any, Dict, Optional
 
 import pytest
@@ -14,6 +16,10 @@ def _make_executor(work_row: Optional[Dict[str, Any]] = None):
         sql = query.get("sql", "")
         if "INSERT INTO works" in sql:
             return {"id": "work-1"}
+        if "INSERT INTO work_versions" in sql:
+            return {"id": "version-1", "version_number": 1}
+        if "SELECT current_version" in sql:
+            return 0
         if "FROM works WHERE id" in sql:
             return work_row
         if "FROM works WHERE user_email" in sql:
@@ -81,3 +87,237 @@ def test_update_work_locking_and_refresh(monkeypatch) -> None:
         q for q in executed if "UPDATE works SET content" in q.get("sql", "")
     ]
     assert len(update_queries) == 1
+
+
+def _make_transaction_factory(executor):
+    log = []
+
+    @contextmanager
+    def factory():
+        pending = []
+        log.append(pending)
+
+        def run(query):
+            pending.append(query)
+            return executor(query)
+
+        yield run
+        pending.append("COMMIT")
+
+    return factory, log
+
+
+def test_update_work_draft_runs_in_one_transaction(monkeypatch) -> None:
+    work_row = {"id": "work-3", "user_email": "c@example.com", "content": ""}
+    executor, _ = _make_executor(work_row=work_row)
+    factory, transactions = _make_transaction_factory(executor)
+    work_manager.set_query_executor(executor)
+    work_manager.set_transaction_factory(factory)
+    monkeypatch.setattr(work_manager.session_lock, "acquire_lock", lambda *_: True)
+    monkeypatch.setattr(work_manager.session_lock, "refresh_lock", lambda *_: True)
+
+    try:
+        work_manager.update_work(
+            "work-3", "c@example.com", "body", "device-1", auto_save=False
+        )
+    finally:
+        work_manager.set_transaction_factory(None)
+
+    assert len(transactions) == 1
+    statements = [q if q == "COMMIT" else q["sql"] for q in transactions[0]]
+    assert statements[-1] == "COMMIT"
+    assert any("UPDATE works SET content" in sql for sql in statements)
+    assert any("INSERT INTO work_versions" in sql for sql in statements)
+    assert any("UPDATE works SET current_version" in sql for sql in statements)
+
+
+def test_unit_of_work_rolls_back_on_failure(monkeypatch) -> None:
+    executor, _ = _make_executor(work_row=None)
+    factory, transactions = _make_transaction_factory(executor)
+    work_manager.set_query_executor(executor)
+    work_manager.set_transaction_factory(factory)
+
+    try:
+        with pytest.raises(RuntimeError):
+            with work_manager.work_uow.unit_of_work():
+                work_manager._run({"sql": "UPDATE works SET content = 'x'", "params": {}})
+                with work_manager.work_uow.unit_of_work():
+                    work_manager._run({"sql": "DELETE FROM work_versions", "params": {}})
+                raise RuntimeError("later step failed")
+    finally:
+        work_manager.set_transaction_factory(None)
+
+    assert len(transactions) == 1
+    assert "COMMIT" not in transactions[0]
+    assert len(transactions[0]) == 2
+
+
+def test_async_variants_use_async_executor() -> None:
+    work_row = {"id": "work-4", "user_email": "d@example.com", "content": ""}
+    executor, executed = _make_executor(work_row=work_row)
+
+    async def async_executor(query):
+        return executor(query)
+
+    work_manager.set_async_query_executor(async_executor)
+
+    async def scenario():
+        assert await work_manager.create_work_async("d@example.com") == "work-1"
+        assert await work_manager.list_works_async("d@example.com") == [work_row]
+        assert await work_manager.get_work_async("work-4", "d@example.com") == work_row
+        assert await work_manager.delete_work_async("work-4", "d@example.com") is True
+
+    asyncio.run(scenario())
+    assert any("DELETE FROM works" in q["sql"] for q in executed)
+
+    executor, _ = _make_executor(work_row=None)
+    work_manager.set_async_query_executor(async_executor)
+
+    with pytest.raises(BusinessError) as excinfo:
+        asyncio.run(work_manager.get_work_async("missing", "d@example.com"))
+    assert excinfo.value.code == "not_found"
+
+
+def test_submit_work_queues_analysis(monkeypatch) -> None:
+    work_row = {"id": "work-5", "user_email": "e@example.com", "content": ""}
+    executor, _ = _make_executor(work_row=work_row)
+    work_manager.set_query_executor(executor)
+    monkeypatch.setattr(work_manager.session_lock, "acquire_lock", lambda *_: True)
+    monkeypatch.setattr(work_manager.session_lock, "refresh_lock", lambda *_: True)
+    work_manager.analysis_jobs.set_backend(work_manager.analysis_jobs.InMemoryJobBackend())
+
+    generated = []
+
+    def fake_generate(**kwargs):
+        generated.append(kwargs)
+        return "analysis-9"
+
+    monkeypatch.setattr(work_manager, "_generate_and_save_analysis", fake_generate)
+    work_manager.analysis_jobs.set_handler(work_manager.run_analysis_job)
+
+    try:
+        result = work_manager.submit_work("work-5", "e@example.com", "essay", "device-1")
+        assert result["version"] == 1
+        assert result["analysis_id"] is None
+        assert result["analysis_status"] == "queued"
+        assert generated == []
+
+        assert work_manager.analysis_jobs.process_next() is True
+        status = work_manager.get_analysis_status("work-5", "e@example.com", 1)
+        assert status["status"] == "done"
+        assert status["analysis_id"] == "analysis-9"
+        assert generated[0]["current_content"] == "essay"
+    finally:
+        work_manager.analysis_jobs.set_backend(None)
+        work_manager.analysis_jobs.set_handler(None)
+
+
+def test_submit_work_stream_queues_job_when_generation_fails(monkeypatch) -> None:
+    work_row = {"id": "work-6", "user_email": "e@example.com", "content": ""}
+    executor, _ = _make_executor(work_row=work_row)
+    work_manager.set_query_executor(executor)
+    monkeypatch.setattr(work_manager.session_lock, "acquire_lock", lambda *_: True)
+    monkeypatch.setattr(work_manager.session_lock, "refresh_lock", lambda *_: True)
+    work_manager.analysis_jobs.set_backend(work_manager.analysis_jobs.InMemoryJobBackend())
+
+    def failing_stream(**kwargs):
+        yield "fao_delta", {"text": "Good"}
+        raise BusinessError("llm_failed", "stream broke")
+
+    monkeypatch.setattr(work_manager.analyzer, "stream_analysis", failing_stream)
+
+    try:
+        result, events = work_manager.submit_work_stream(
+            "work-6", "e@example.com", "essay", "device-1"
+        )
+        assert result == {"ok": True, "version": 1}
+        assert list(events) == [
+            ("fao_delta", {"text": "Good"}),
+            ("error", {"code": "llm_failed", "message": "stream broke", "analysis_status": "queued"}),
+        ]
+        job = work_manager.analysis_jobs.get_job("work-6:1")
+        assert job["payload"]["current_content"] == "essay"
+    finally:
+        work_manager.analysis_jobs.set_backend(None)
+
+
+def test_ownership_check_probes_once_and_is_cached() -> None:
+    work_manager.ownership.clear()
+    work_row = {"id": "work-7", "current_version": 2}
+    executor, executed = _make_executor(work_row=work_row)
+    work_manager.set_query_executor(executor)
+
+    work_manager.verify_work_owner("work-7", "a@example.com")
+    work_manager.verify_work_owner("work-7", "a@example.com")
+    probes = [q for q in executed if "FROM works WHERE id" in q["sql"]]
+    assert len(probes) == 1
+    assert probes[0]["sql"].startswith("SELECT id, current_version FROM")
+    assert "content" not in probes[0]["sql"]
+
+    work_manager.delete_work("work-7", "a@example.com")
+    missing, _ = _make_executor(work_row=None)
+    work_manager.set_query_executor(missing)
+    with pytest.raises(BusinessError) as excinfo:
+        work_manager.verify_work_owner("work-7", "a@example.com")
+    assert excinfo.value.code == "not_found"
+
+
+def test_ownership_forget_drops_only_that_work(monkeypatch) -> None:
+    ownership = work_manager.ownership
+    ownership.clear()
+    monkeypatch.setattr(ownership, "WORK_OWNERSHIP_CACHE_MAX_ENTRIES", 3)
+    ownership.remember("work-1", "a@example.com")
+    ownership.remember("work-1", "b@example.com")
+    ownership.remember("work-2", "a@example.com")
+
+    ownership.forget("work-1")
+    assert not ownership.is_cached("work-1", "a@example.com")
+    assert not ownership.is_cached("work-1", "b@example.com")
+    assert ownership.is_cached("work-2", "a@example.com")
+    assert set(ownership._BY_WORK) == {"work-2"}
+
+    # LRU eviction keeps the per-work index in step.
+    for n in range(3, 6):
+        ownership.remember(f"work-{n}", "a@example.com")
+    assert set(ownership._BY_WORK) == {"work-3", "work-4", "work-5"}
+    ownership.clear()
+
+
+def test_list_works_pages_by_updated_at_keyset() -> None:
+    from datetime import datetime, timedelta
+
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    rows = [
+        {"id": f"work-{n}", "updated_at": start - timedelta(minutes=n // 2), "title": ""}
+        for n in range(7)
+    ]
+    queries = []
+
+    async def async_executor(query):
+        queries.append(query)
+        params = query["params"]
+        ordered = sorted(rows, key=lambda row: (row["updated_at"], row["id"]), reverse=True)
+        if "before_id" in params:
+            before = (params["before_updated_at"], params["before_id"])
+            ordered = [row for row in ordered if (row["updated_at"], row["id"]) < before]
+        return ordered[:params["limit"]]
+
+    work_manager.set_async_query_executor(async_executor)
+
+    async def scenario():
+        seen, cursor = [], None
+        while True:
+            page, cursor = await work_manager.list_works_page_async("a@example.com", cursor, 3)
+            seen.extend(row["id"] for row in page)
+            if cursor is None:
+                return seen
+
+    seen = asyncio.run(scenario())
+    assert sorted(seen) == sorted(row["id"] for row in rows)
+    assert len(seen) == len(set(seen)) == 7
+    assert "content" not in queries[0]["sql"]
+    assert queries[0]["sql"].endswith("ORDER BY updated_at DESC, id DESC LIMIT %(limit)s")
+
+    with pytest.raises(BusinessError) as excinfo:
+        asyncio.run(work_manager.list_works_page_async("a@example.com", "bogus"))
+    assert excinfo.value.code == "validation_failed"
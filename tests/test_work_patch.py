@@ -0,0 +1,100 @@
+import asyncio
+import random
+
+import pytest
+
+from backend.errors import BusinessError
+from backend.modules.work import autosave
+from backend.modules.work import manager as work_manager
+from backend.modules.work.text_patch import apply_patch, content_hash
+from backend.modules.work.utils import count_words
+
+_PIECES = ["word", " ", "  ", "\n", "中文", "字", ",", "a", "b. ", "　", "x字y"]
+
+
+def test_incremental_word_count_matches_full_count() -> None:
+    rng = random.Random(11)
+    content = "".join(rng.choice(_PIECES) for _ in range(200))
+    words = count_words(content)
+    for _ in range(300):
+        start = rng.randint(0, len(content))
+        end = rng.randint(start, min(len(content), start + 8))
+        text = "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 3)))
+        expected = content[:start] + text + content[end:]
+        content, words = apply_patch(content, [{"start": start, "end": end, "text": text}], words)
+        assert content == expected
+        assert words == count_words(content)
+
+
+def test_apply_patch_rejects_bad_ranges() -> None:
+    with pytest.raises(BusinessError) as excinfo:
+        apply_patch("abc", [{"start": 2, "end": 5, "text": ""}], 1)
+    assert excinfo.value.code == "validation_failed"
+    with pytest.raises(BusinessError):
+        apply_patch("abc", [], 1)
+
+
+def test_patch_work_applies_to_buffered_content(monkeypatch) -> None:
+    work = {"id": "w1", "user_email": "a@example.com", "content": "Hello world",
+            "word_count": 2, "current_version": 4}
+    work_manager.set_query_executor(
+        lambda query: dict(work) if "FROM works WHERE id" in query["sql"] else None
+    )
+    monkeypatch.setattr(work_manager.session_lock, "acquire_lock", lambda *_: True)
+    autosave.set_backend(autosave.InMemoryAutosaveBuffer())
+    try:
+        first = work_manager.patch_work(
+            "w1", "a@example.com", "d1", content_hash("Hello world"),
+            [{"start": 11, "end": 11, "text": " again"}],
+        )
+        assert first["word_count"] == 3
+        assert first["content_hash"] == content_hash("Hello world again")
+
+        # The next patch builds on the buffered text, not the stored row.
+        second = work_manager.patch_work(
+            "w1", "a@example.com", "d1", first["content_hash"],
+            [{"start": 0, "end": 5, "text": "Goodbye"}],
+        )
+        assert second["word_count"] == 3
+        assert autosave.pending("w1")["content"] == "Goodbye world again"
+
+        with pytest.raises(BusinessError) as excinfo:
+            work_manager.patch_work(
+                "w1", "a@example.com", "d1", content_hash("Hello world"),
+                [{"start": 0, "end": 0, "text": "x"}],
+            )
+        assert excinfo.value.code == "conflict"
+    finally:
+        autosave.set_backend(None)
+
+
+def test_async_autosave_routes_buffer_without_sync_executor(monkeypatch) -> None:
+    work = {"id": "w2", "user_email": "a@example.com", "content": "Hello world",
+            "word_count": 2, "current_version": 1}
+
+    async def async_executor(query):
+        return dict(work) if "FROM works WHERE id" in query["sql"] else None
+
+    def sync_executor(query):
+        raise AssertionError(f"sync executor used: {query['sql']}")
+
+    work_manager.set_query_executor(sync_executor)
+    work_manager.set_async_query_executor(async_executor)
+    monkeypatch.setattr(work_manager.session_lock, "hold_lock", lambda *_: True)
+    autosave.set_backend(autosave.InMemoryAutosaveBuffer())
+    work_manager.ownership.clear()
+
+    async def scenario():
+        updated = await work_manager.update_work_async("w2", "a@example.com", "Hello there", "d1")
+        assert updated == {"ok": True}
+        return await work_manager.patch_work_async(
+            "w2", "a@example.com", "d1", content_hash("Hello there"),
+            [{"start": 11, "end": 11, "text": " again"}],
+        )
+
+    try:
+        patched = asyncio.run(scenario())
+        assert patched["word_count"] == 3
+        assert autosave.pending("w2")["content"] == "Hello there again"
+    finally:
+        autosave.set_backend(None)